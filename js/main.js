@@ -1,11 +1,43 @@
 // グローバル変数
 let allProfiles = [];
 let filteredProfiles = [];
+let profileEngine = null;   // 検索エンジン（Web Worker またはメインスレッドの ProfileEngine）
+let latestQueryId = 0;      // 最後に送った検索の番号（古い結果を捨てるため）
+
+// ファセット名 → チェックボックスのID（ファセットの条件は js/profile-engine.js で定義）
+const FACET_CHECKBOXES = {
+    official: 'filterOfficial',
+    unofficial: 'filterUnofficial',
+    forward: 'filterForward',
+    reverse: 'filterReverse',
+    bidirectional: 'filterBidirectional',
+    free: 'filterFree',
+    paid: 'filterPaid',
+    bundled: 'filterBundled'
+};
+
+// 仮想スクロール（表示範囲付近のカードのみDOMを生成する）
+const VIRTUAL_OVERSCAN_PX = 800;   // 画面の上下に余分に描画する高さ
+const CARD_CACHE_LIMIT = 300;      // 再利用のために保持するカード要素の上限
+const virtualState = {
+    columns: 1,
+    rowGap: 0,
+    rowHeights: [],                // 計測済みの行の高さ（行番号ごと）
+    estimatedRowHeight: 520,       // 未計測の行に使う推定値
+    startRow: -1,
+    endRow: -1,
+    frameRequested: false
+};
+const cardCache = new Map();       // プロファイル → カード要素
+
+// ライブリロード（scripts/server.py --live-reload）に接続するホスト
+const LIVE_RELOAD_HOSTS = ['localhost', '127.0.0.1', '[::1]'];
 
 // DOMContentLoaded時の初期化
 document.addEventListener('DOMContentLoaded', () => {
     loadProfiles();
     setupEventListeners();
+    setupLiveReload();
 });
 
 // 最終更新日時の表示
@@ -20,13 +52,8 @@ function updateLastUpdatedDisplay(lastUpdated) {
 // プロファイルデータの読み込み
 async function loadProfiles() {
     try {
-        const response = await fetch('data/profiles.json');
-        if (!response.ok) {
-            throw new Error('データの読み込みに失敗しました');
-        }
-        const data = await response.json();
+        const data = await loadProfileEngine();
         allProfiles = data.profiles;
-        filteredProfiles = [...allProfiles];
 
         // 最終更新日時を表示
         if (data.lastUpdated) {
@@ -34,15 +61,122 @@ async function loadProfiles() {
         }
 
         // 初期表示（デフォルトはID順の逆順）
-        sortProfiles();
-        renderProfiles();
-        updateCount();
+        await applyFilters();
     } catch (error) {
         console.error('Error loading profiles:', error);
         showError('プロファイルデータの読み込みに失敗しました');
     }
 }
 
+// 検索エンジンを起動してデータを読み込む
+// 検索・絞り込み・並び替えは Web Worker で行い、使用できない場合はメインスレッドで行う
+async function loadProfileEngine() {
+    if (typeof Worker !== 'undefined') {
+        const engine = createWorkerEngine();
+        try {
+            const data = await engine.load();
+            profileEngine = engine;
+            return data;
+        } catch (error) {
+            console.warn('Web Workerを使用できないため、メインスレッドで検索します:', error);
+            engine.terminate();
+        }
+    }
+    const engine = createLocalEngine();
+    const data = await engine.load();
+    profileEngine = engine;
+    return data;
+}
+
+// Web Worker（js/profile-worker.js）で動作する検索エンジン
+function createWorkerEngine() {
+    const worker = new Worker('js/profile-worker.js');
+    const pending = new Map();   // 要求番号 → { resolve, reject }
+    let nextId = 0;
+
+    worker.addEventListener('message', event => {
+        const { id, result, error } = event.data;
+        const request = pending.get(id);
+        if (!request) return;
+        pending.delete(id);
+        if (error) {
+            request.reject(new Error(error));
+        } else {
+            request.resolve(result);
+        }
+    });
+    worker.addEventListener('error', event => {
+        event.preventDefault();
+        pending.forEach(request => request.reject(new Error(event.message || 'Web Workerでエラーが発生しました')));
+        pending.clear();
+    });
+
+    const send = (type, payload) => new Promise((resolve, reject) => {
+        const id = ++nextId;
+        pending.set(id, { resolve, reject });
+        worker.postMessage({ id, type, payload });
+    });
+
+    return {
+        load: () => send('load', { baseUrl: document.baseURI }),
+        query: options => send('query', options),
+        terminate: () => worker.terminate()
+    };
+}
+
+// メインスレッドで動作する検索エンジン（Web Worker を使用できない場合）
+function createLocalEngine() {
+    return {
+        load: () => ProfileEngine.load(document.baseURI),
+        query: async options => ProfileEngine.query(options),
+        terminate: () => {}
+    };
+}
+
+// ローカルサーバーのファイル変更通知（/api/events）を受けて表示を更新
+// データの変更は差分フィードで読み直し、CSSは差し替え、JSの変更時のみページ全体を再読み込みする
+function setupLiveReload() {
+    if (typeof EventSource === 'undefined' || !LIVE_RELOAD_HOSTS.includes(location.hostname)) {
+        return;
+    }
+    // --live-reload なしで起動したサーバーは404を返し、EventSourceは再接続せずに終了する
+    const source = new EventSource('api/events');
+    source.addEventListener('change', event => {
+        const { paths } = JSON.parse(event.data);
+        if (paths.some(path => path.startsWith('js/'))) {
+            location.reload();
+            return;
+        }
+        paths.filter(path => path.endsWith('.css')).forEach(reloadStylesheet);
+        if (paths.some(path => path.startsWith('data/'))) {
+            reloadProfiles();
+        }
+    });
+}
+
+// スタイルシートを読み直す（キャッシュを避けるためクエリを付ける）
+function reloadStylesheet(path) {
+    document.querySelectorAll('link[rel="stylesheet"]').forEach(link => {
+        if (new URL(link.href).pathname.endsWith(`/${path}`)) {
+            link.href = `${path}?v=${Date.now()}`;
+        }
+    });
+}
+
+// プロファイルデータを読み直して、現在の検索条件のまま再表示
+async function reloadProfiles() {
+    if (!profileEngine) return;
+    try {
+        const data = await profileEngine.load();
+        allProfiles = data.profiles;
+        cardCache.clear();
+        updateLastUpdatedDisplay(data.lastUpdated);
+        await applyFilters();
+    } catch (error) {
+        console.warn('プロファイルデータの再読み込みに失敗しました:', error);
+    }
+}
+
 // イベントリスナーの設定
 function setupEventListeners() {
     // 検索入力
@@ -52,16 +186,7 @@ function setupEventListeners() {
     }
 
     // フィルターチェックボックス
-    const filterCheckboxes = [
-        'filterOfficial',
-        'filterUnofficial',
-        'filterForward',
-        'filterReverse',
-        'filterBidirectional',
-        'filterFree',
-        'filterPaid',
-        'filterBundled'
-    ];
+    const filterCheckboxes = Object.values(FACET_CHECKBOXES);
 
     // 「全て」チェックボックス
     const filterAll = document.getElementById('filterAll');
@@ -101,13 +226,23 @@ function setupEventListeners() {
         });
     }
 
+    // 仮想スクロール: スクロール・リサイズ時に表示範囲のカードを差し替える
+    window.addEventListener('scroll', scheduleVisibleCardsUpdate, { passive: true });
+    window.addEventListener('resize', () => {
+        const container = document.getElementById('profilesContainer');
+        if (container && filteredProfiles.length > 0) {
+            // 列数・カード幅が変わるため計測値を破棄して再描画
+            virtualState.rowHeights = [];
+            updateVirtualLayout(container);
+            renderVisibleCards(container, true);
+        }
+    });
+
     // 並び替えセレクトボックス
     const sortSelect = document.getElementById('sortSelect');
     if (sortSelect) {
         sortSelect.addEventListener('change', () => {
-            sortProfiles();
-            renderProfiles();
-            updateCount();
+            applyFilters();
         });
     }
 }
@@ -143,129 +278,42 @@ function hideNotesTooltip() {
     }
 }
 
-// BoothのURLから最後の数字を抽出する関数
-function extractBoothItemId(url) {
-    if (!url || typeof url !== 'string') {
-        return null;
-    }
-    
-    // BoothのURLかチェック
-    if (!url.includes('booth.pm')) {
-        return null;
-    }
-    
-    // /items/の後の数字を抽出
-    const match = url.match(/\/items\/(\d+)/);
-    if (match && match[1]) {
-        return parseInt(match[1], 10);
-    }
-    
-    return null;
-}
-
-// 並び替え処理
-function sortProfiles() {
-    const sortSelect = document.getElementById('sortSelect');
-    if (!sortSelect || filteredProfiles.length === 0) return;
-
-    const sortValue = sortSelect.value;
-    const [field, direction] = sortValue.split('-');
-
-    filteredProfiles.sort((a, b) => {
-        let aVal = a[field];
-        let bVal = b[field];
-
-        // アバターID順：数値として比較
-        if (field === 'id') {
-            aVal = parseInt(aVal) || 0;
-            bVal = parseInt(bVal) || 0;
-        }
-        // アバター公開順（Booth ID順）：avatarNameUrlから抽出
-        else if (field === 'avatarBoothId') {
-            const aBoothId = extractBoothItemId(a.avatarNameUrl);
-            const bBoothId = extractBoothItemId(b.avatarNameUrl);
-            
-            // BoothのURLでない場合は最後に配置（非常に大きな値）
-            aVal = aBoothId !== null ? aBoothId : Number.MAX_SAFE_INTEGER;
-            bVal = bBoothId !== null ? bBoothId : Number.MAX_SAFE_INTEGER;
-        }
-        // プロファイル公開順（Booth ID順）：downloadLocationから抽出
-        else if (field === 'profileBoothId') {
-            const aBoothId = extractBoothItemId(a.downloadLocation);
-            const bBoothId = extractBoothItemId(b.downloadLocation);
-            
-            // BoothのURLでない場合は最後に配置（非常に大きな値）
-            aVal = aBoothId !== null ? aBoothId : Number.MAX_SAFE_INTEGER;
-            bVal = bBoothId !== null ? bBoothId : Number.MAX_SAFE_INTEGER;
-        }
-        // 最終更新日順：日付として比較
-        else if (field === 'updatedDate') {
-            aVal = new Date(aVal || 0);
-            bVal = new Date(bVal || 0);
+// ファセットごとの件数を表示
+function updateFacetCounts(facetCounts) {
+    Object.entries(FACET_CHECKBOXES).forEach(([name, checkboxId]) => {
+        const checkbox = document.getElementById(checkboxId);
+        const countElement = checkbox && checkbox.parentElement.querySelector('.facet-count');
+        if (countElement && name in facetCounts) {
+            countElement.textContent = `(${facetCounts[name]})`;
         }
-        // 文字列フィールド：文字列として比較（日本語対応）
-        else {
-            aVal = (aVal || '').toString();
-            bVal = (bVal || '').toString();
-        }
-
-        // 比較
-        if (aVal < bVal) return direction === 'asc' ? -1 : 1;
-        if (aVal > bVal) return direction === 'asc' ? 1 : -1;
-        return 0;
     });
 }
 
-// フィルタリング処理
-function applyFilters() {
-    const searchTerm = document.getElementById('searchInput').value.toLowerCase();
-    const showAll = document.getElementById('filterAll').checked;
-    const showOfficial = document.getElementById('filterOfficial').checked;
-    const showUnofficial = document.getElementById('filterUnofficial').checked;
-    const showForward = document.getElementById('filterForward').checked;
-    const showReverse = document.getElementById('filterReverse').checked;
-    const showBidirectional = document.getElementById('filterBidirectional').checked;
-    const showFree = document.getElementById('filterFree').checked;
-    const showPaid = document.getElementById('filterPaid').checked;
-    const showBundled = document.getElementById('filterBundled').checked;
-
-    filteredProfiles = allProfiles.filter(profile => {
-        // テキスト検索
-        const matchesSearch = !searchTerm ||
-            profile.avatarName.toLowerCase().includes(searchTerm) ||
-            profile.avatarAuthor.toLowerCase().includes(searchTerm) ||
-            profile.profileAuthor.toLowerCase().includes(searchTerm);
-
-        // 「全て」がONの場合は全て表示
-        if (showAll) {
-            return matchesSearch;
-        }
+// フィルタリング・並び替え処理
+// 検索エンジンから表示順のインデックス配列を受け取り、allProfilesから表示対象を取り出す
+async function applyFilters() {
+    if (!profileEngine) return;
 
-        // グループ1: 公式/非公式（OR）
-        const officialGroupSelected = showOfficial || showUnofficial;
-        const matchesOfficialGroup = !officialGroupSelected ||
-            (showOfficial && profile.official) ||
-            (showUnofficial && !profile.official);
-
-        // グループ2: 方向対応（OR）
-        const directionGroupSelected = showForward || showReverse || showBidirectional;
-        const matchesDirectionGroup = !directionGroupSelected ||
-            (showForward && profile.forwardSupport) ||
-            (showReverse && profile.reverseSupport) ||
-            (showBidirectional && profile.forwardSupport && profile.reverseSupport);
-
-        // グループ3: 価格（OR）
-        const priceGroupSelected = showFree || showPaid || showBundled;
-        const matchesPriceGroup = !priceGroupSelected ||
-            (showFree && profile.pricing === '無料') ||
-            (showPaid && profile.pricing === '有料') ||
-            (showBundled && profile.pricing === 'アバター同梱');
-
-        // グループ間はAND
-        return matchesSearch && matchesOfficialGroup && matchesDirectionGroup && matchesPriceGroup;
+    const sortSelect = document.getElementById('sortSelect');
+    const selected = Object.entries(FACET_CHECKBOXES)
+        .filter(([, checkboxId]) => {
+            const checkbox = document.getElementById(checkboxId);
+            return checkbox && checkbox.checked;
+        })
+        .map(([name]) => name);
+
+    const queryId = ++latestQueryId;
+    const result = await profileEngine.query({
+        searchTerm: document.getElementById('searchInput').value,
+        showAll: document.getElementById('filterAll').checked,
+        selected,
+        sort: sortSelect ? sortSelect.value : 'id-desc'
     });
+    // 入力が続いて新しい検索を送った場合は古い結果を捨てる
+    if (queryId !== latestQueryId) return;
 
-    sortProfiles();
+    filteredProfiles = Array.from(result.indices, index => allProfiles[index]);
+    updateFacetCounts(result.facetCounts);
     renderProfiles();
     updateCount();
 }
@@ -278,6 +326,10 @@ function renderProfiles() {
 
     // 空状態の確認
     if (filteredProfiles.length === 0) {
+        container.style.paddingTop = '';
+        container.style.paddingBottom = '';
+        virtualState.startRow = -1;
+        virtualState.endRow = -1;
         container.innerHTML = `
             <div class="empty-state">
                 <h3>該当するプロファイルが見つかりませんでした</h3>
@@ -287,8 +339,138 @@ function renderProfiles() {
         return;
     }
 
-    // プロファイルカードの生成
-    container.innerHTML = filteredProfiles.map(profile => createProfileCard(profile)).join('');
+    // 一覧が変わると行の構成も変わるため、行の高さは計測し直す
+    virtualState.rowHeights = [];
+    updateVirtualLayout(container);
+    renderVisibleCards(container, true);
+}
+
+// グリッドの列数と行間を取得
+function updateVirtualLayout(container) {
+    const style = getComputedStyle(container);
+    const columns = style.gridTemplateColumns.split(' ').filter(track => track && track !== 'none').length;
+    virtualState.columns = Math.max(columns, 1);
+    virtualState.rowGap = parseFloat(style.rowGap) || 0;
+}
+
+// 行の高さ（未計測なら推定値）
+function getRowHeight(row) {
+    return virtualState.rowHeights[row] || virtualState.estimatedRowHeight;
+}
+
+// 現在のスクロール位置から描画する行の範囲と上下の余白を計算
+function computeVisibleRange(container) {
+    const rowCount = Math.ceil(filteredProfiles.length / virtualState.columns);
+    const gap = virtualState.rowGap;
+    const containerTop = container.getBoundingClientRect().top + window.scrollY;
+    const viewTop = window.scrollY - containerTop - VIRTUAL_OVERSCAN_PX;
+    const viewBottom = window.scrollY + window.innerHeight - containerTop + VIRTUAL_OVERSCAN_PX;
+
+    let row = 0;
+    let offset = 0;
+    while (row < rowCount && offset + getRowHeight(row) < viewTop) {
+        offset += getRowHeight(row) + gap;
+        row++;
+    }
+    const startRow = row;
+    const topSpace = offset;
+
+    while (row < rowCount && offset < viewBottom) {
+        offset += getRowHeight(row) + gap;
+        row++;
+    }
+    const endRow = row;
+
+    let bottomSpace = 0;
+    while (row < rowCount) {
+        bottomSpace += getRowHeight(row) + gap;
+        row++;
+    }
+
+    return { startRow, endRow, topSpace, bottomSpace };
+}
+
+// カード要素を取得（生成済みのものは再利用）
+function getCardElement(profile) {
+    let card = cardCache.get(profile);
+    if (card) {
+        // 最近使った順に並べ替え（古いものから破棄するため）
+        cardCache.delete(profile);
+    } else {
+        const template = document.createElement('template');
+        template.innerHTML = createProfileCard(profile).trim();
+        card = template.content.firstElementChild;
+    }
+    cardCache.set(profile, card);
+    return card;
+}
+
+// 表示範囲付近のカードだけをDOMに配置し、範囲外は上下の余白で高さを確保する
+function renderVisibleCards(container, force = false) {
+    const range = computeVisibleRange(container);
+    if (!force && range.startRow === virtualState.startRow && range.endRow === virtualState.endRow) {
+        return;
+    }
+
+    const columns = virtualState.columns;
+    const visibleProfiles = filteredProfiles.slice(range.startRow * columns, range.endRow * columns);
+    container.replaceChildren(...visibleProfiles.map(getCardElement));
+    container.style.paddingTop = `${range.topSpace}px`;
+    container.style.paddingBottom = `${range.bottomSpace}px`;
+    virtualState.startRow = range.startRow;
+    virtualState.endRow = range.endRow;
+
+    // 描画した行の高さを計測して推定値を更新
+    const cards = container.children;
+    let measuredChanged = false;
+    for (let row = range.startRow; row < range.endRow; row++) {
+        const card = cards[(row - range.startRow) * columns];
+        if (!card) break;
+        const height = card.offsetHeight;
+        if (height && virtualState.rowHeights[row] !== height) {
+            virtualState.rowHeights[row] = height;
+            measuredChanged = true;
+        }
+    }
+    if (measuredChanged) {
+        const measured = virtualState.rowHeights.filter(Boolean);
+        virtualState.estimatedRowHeight = measured.reduce((sum, height) => sum + height, 0) / measured.length;
+        // 下側の余白を計測結果で補正（上側はスクロール位置がずれないよう次回の描画で反映）
+        const rowCount = Math.ceil(filteredProfiles.length / columns);
+        let bottomSpace = 0;
+        for (let row = range.endRow; row < rowCount; row++) {
+            bottomSpace += getRowHeight(row) + virtualState.rowGap;
+        }
+        container.style.paddingBottom = `${bottomSpace}px`;
+    }
+
+    trimCardCache(visibleProfiles);
+}
+
+// 再利用キャッシュの上限を超えた古いカード要素を破棄
+function trimCardCache(visibleProfiles) {
+    if (cardCache.size <= CARD_CACHE_LIMIT) return;
+
+    const visible = new Set(visibleProfiles);
+    for (const profile of cardCache.keys()) {
+        if (cardCache.size <= CARD_CACHE_LIMIT) break;
+        if (!visible.has(profile)) {
+            cardCache.delete(profile);
+        }
+    }
+}
+
+// スクロールイベントを1フレームに1回へ間引いて描画範囲を更新
+function scheduleVisibleCardsUpdate() {
+    if (virtualState.frameRequested || filteredProfiles.length === 0) return;
+    virtualState.frameRequested = true;
+    requestAnimationFrame(() => {
+        virtualState.frameRequested = false;
+        const container = document.getElementById('profilesContainer');
+        if (container) {
+            renderVisibleCards(container);
+        }
+    });
 }
 
 // 価格バッジのクラスを取得
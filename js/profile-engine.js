@@ -0,0 +1,384 @@
+// プロファイルの検索・絞り込み・並び替えエンジン
+// データの保持・検索・ファセット・並び替えはここで行い、結果はインデックスの配列として返す。
+// 通常は Web Worker（js/profile-worker.js）内で動作し、Worker が使えない環境ではメインスレッドで動作する。
+const ProfileEngine = (() => {
+    // 絞り込み条件（ファセット）の定義
+    // 同じグループ内はOR、グループ間はANDで結合する
+    const FACETS = {
+        official: { group: 'official', test: profile => !!profile.official },
+        unofficial: { group: 'official', test: profile => !profile.official },
+        forward: { group: 'direction', test: profile => !!profile.forwardSupport },
+        reverse: { group: 'direction', test: profile => !!profile.reverseSupport },
+        bidirectional: { group: 'direction', test: profile => !!(profile.forwardSupport && profile.reverseSupport) },
+        free: { group: 'price', test: profile => profile.pricing === '無料' },
+        paid: { group: 'price', test: profile => profile.pricing === '有料' },
+        bundled: { group: 'price', test: profile => profile.pricing === 'アバター同梱' }
+    };
+
+    // 差分フィード（scripts/delta_feed.py が生成）のキャッシュ設定
+    const PROFILE_CACHE_DB = 'mochifitter_list';
+    const PROFILE_CACHE_STORE = 'profiles';
+    const PROFILE_CACHE_KEY = 'latest';
+
+    let profiles = [];
+    let sortKeys = null;     // 数値ソートキー（profilesと同じ順序）
+    let sortOrders = {};     // 並び替え選択肢ごとのインデックス順列
+    let facetBits = {};      // ファセット名 → 該当プロファイルのビットセット
+    let haystacks = [];      // 検索用に小文字化したアバター名・作者名（profilesと同じ順序）
+
+    // JSONを取得（失敗時はnull）
+    async function fetchJsonOrNull(url, options) {
+        try {
+            const response = await fetch(url, options);
+            return response.ok ? await response.json() : null;
+        } catch (error) {
+            return null;
+        }
+    }
+
+    // キャッシュ用IndexedDBを開く（使用できない環境ではnull）
+    function openProfileCache() {
+        return new Promise(resolve => {
+            if (typeof indexedDB === 'undefined') {
+                resolve(null);
+                return;
+            }
+            try {
+                const request = indexedDB.open(PROFILE_CACHE_DB, 1);
+                request.onupgradeneeded = () => request.result.createObjectStore(PROFILE_CACHE_STORE);
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => resolve(null);
+            } catch (error) {
+                resolve(null);
+            }
+        });
+    }
+
+    // キャッシュ済みのデータを読み込み（{ data, digest } またはnull）
+    async function readCachedProfiles() {
+        const db = await openProfileCache();
+        if (!db) return null;
+        return new Promise(resolve => {
+            const request = db.transaction(PROFILE_CACHE_STORE, 'readonly')
+                .objectStore(PROFILE_CACHE_STORE)
+                .get(PROFILE_CACHE_KEY);
+            request.onsuccess = () => resolve(request.result || null);
+            request.onerror = () => resolve(null);
+        });
+    }
+
+    // データをキャッシュに保存（失敗しても表示には影響しない）
+    async function writeCachedProfiles(data, digest) {
+        const db = await openProfileCache();
+        if (!db) return;
+        try {
+            db.transaction(PROFILE_CACHE_STORE, 'readwrite')
+                .objectStore(PROFILE_CACHE_STORE)
+                .put({ data, digest }, PROFILE_CACHE_KEY);
+        } catch (error) {
+            console.warn('プロファイルデータのキャッシュに失敗しました:', error);
+        }
+    }
+
+    // 版versionから最新版までに適用する差分の一覧（追いつけない場合はnull）
+    function planDeltaChain(manifest, version) {
+        if (version === manifest.version) {
+            return [];
+        }
+        const deltas = manifest.deltas || [];
+        const start = deltas.findIndex(entry => entry.from === version);
+        return start >= 0 ? deltas.slice(start) : null;
+    }
+
+    // 差分を適用した新しいデータを返す（scripts/delta_feed.py の apply_delta と同じ処理）
+    function applyDelta(data, delta) {
+        if (data.lastUpdated !== delta.from) {
+            throw new Error('差分の適用元が一致しません');
+        }
+        const removed = new Set(delta.removed);
+        const byId = new Map();
+        data.profiles.forEach(profile => {
+            if (!removed.has(profile.id)) {
+                byId.set(profile.id, profile);
+            }
+        });
+        [...delta.added, ...delta.changed].forEach(profile => byId.set(profile.id, profile));
+
+        const nextProfiles = delta.order.map(id => {
+            if (!byId.has(id)) {
+                throw new Error(`差分の並び順に存在しないIDがあります: ${id}`);
+            }
+            return byId.get(id);
+        });
+        return { ...data, lastUpdated: delta.to, profiles: nextProfiles };
+    }
+
+    // 最新のプロファイルデータを取得（キャッシュ＋差分、追いつけない場合は全件）
+    // 前回取得した版をIndexedDBに保持し、更新があった場合は差分だけを取得して適用する
+    async function fetchLatestProfiles(baseUrl) {
+        const resolve = path => new URL(path, baseUrl).href;
+        const manifest = await fetchJsonOrNull(resolve('data/profiles_version.json'), { cache: 'no-cache' });
+        const cached = manifest ? await readCachedProfiles() : null;
+
+        if (cached && cached.data) {
+            const chain = planDeltaChain(manifest, cached.data.lastUpdated);
+            if (chain && (chain.length > 0 || cached.digest === manifest.digest)) {
+                try {
+                    const deltas = await Promise.all(chain.map(async entry => {
+                        const delta = await fetchJsonOrNull(resolve(`data/${entry.file}`));
+                        if (!delta) throw new Error(`差分の取得に失敗しました: ${entry.file}`);
+                        return delta;
+                    }));
+                    const data = deltas.reduce(applyDelta, cached.data);
+                    if (data.profiles.length === manifest.count) {
+                        if (deltas.length > 0) {
+                            writeCachedProfiles(data, manifest.digest);
+                        }
+                        return data;
+                    }
+                } catch (error) {
+                    console.warn('差分の適用に失敗したため全件を取得します:', error);
+                }
+            }
+        }
+
+        const response = await fetch(resolve('data/profiles.json'));
+        if (!response.ok) {
+            throw new Error('データの読み込みに失敗しました');
+        }
+        const data = await response.json();
+        if (manifest && data.lastUpdated === manifest.version) {
+            writeCachedProfiles(data, manifest.digest);
+        }
+        return data;
+    }
+
+    // BoothのURLから最後の数字を抽出する関数
+    function extractBoothItemId(url) {
+        if (!url || typeof url !== 'string') {
+            return null;
+        }
+
+        // BoothのURLかチェック
+        if (!url.includes('booth.pm')) {
+            return null;
+        }
+
+        // /items/の後の数字を抽出
+        const match = url.match(/\/items\/(\d+)/);
+        if (match && match[1]) {
+            return parseInt(match[1], 10);
+        }
+
+        return null;
+    }
+
+    // 日付文字列をYYYYMMDDhhmmss形式の数値に変換（scripts/build_index.py の date_sort_key と同じ）
+    function dateSortKey(dateString) {
+        const match = /^(\d{4})-(\d{1,2})-(\d{1,2})(?:[ T](\d{1,2}):(\d{2})(?::(\d{2}))?)?/.exec(String(dateString || '').trim());
+        if (!match) {
+            return 0;
+        }
+        return match.slice(1).reduce((key, part) => key * 100 + (parseInt(part, 10) || 0), 0);
+    }
+
+    // ソートキーと順列の準備
+    function prepareSortIndex(data, sortIndex) {
+        // profiles.jsonと同じ版のインデックス（scripts/build_index.py が生成）であればそのまま利用
+        if (sortIndex && sortIndex.keys &&
+            sortIndex.lastUpdated === data.lastUpdated &&
+            sortIndex.count === profiles.length) {
+            sortKeys = sortIndex.keys;
+            sortOrders = sortIndex.sorts || {};
+            return;
+        }
+
+        // インデックスがない・古い場合は読み込み時に一度だけキーを計算
+        sortKeys = {
+            avatarBoothId: profiles.map(profile => extractBoothItemId(profile.avatarNameUrl)),
+            profileBoothId: profiles.map(profile => extractBoothItemId(profile.downloadLocation)),
+            updatedDate: profiles.map(profile => dateSortKey(profile.updatedDate))
+        };
+        sortOrders = {};
+    }
+
+    // 並び替え選択肢に対応する比較用の値を取得
+    function getSortValues(field) {
+        // アバターID順：数値として比較
+        if (field === 'id') {
+            return profiles.map(profile => parseInt(profile.id) || 0);
+        }
+        // Booth ID順：BoothのURLでない場合は最後に配置（非常に大きな値）
+        if (field === 'avatarBoothId' || field === 'profileBoothId') {
+            return sortKeys[field].map(id => id !== null ? id : Number.MAX_SAFE_INTEGER);
+        }
+        // 最終更新日順：数値化済みの日付で比較
+        if (field === 'updatedDate') {
+            return sortKeys.updatedDate;
+        }
+        // 文字列フィールド：文字列として比較（日本語対応）
+        return profiles.map(profile => (profile[field] || '').toString());
+    }
+
+    // 並び替え選択肢に対応するインデックス順列を取得（未生成なら作成してキャッシュ）
+    function getSortOrder(sortValue) {
+        if (sortOrders[sortValue]) {
+            return sortOrders[sortValue];
+        }
+
+        const [field, direction] = sortValue.split('-');
+        const values = getSortValues(field);
+        const sign = direction === 'asc' ? 1 : -1;
+        const order = profiles.map((_, index) => index);
+
+        order.sort((a, b) => {
+            if (values[a] < values[b]) return -sign;
+            if (values[a] > values[b]) return sign;
+            return 0;
+        });
+
+        sortOrders[sortValue] = order;
+        return order;
+    }
+
+    // ビットセットの生成（fill=trueなら全件を1にする）
+    function createBitset(size, fill = false) {
+        const bits = new Uint32Array((size + 31) >>> 5);
+        if (fill) {
+            for (let index = 0; index < size; index++) {
+                bits[index >>> 5] |= 1 << (index & 31);
+            }
+        }
+        return bits;
+    }
+
+    // ビットが立っているか
+    function hasBit(bits, index) {
+        return (bits[index >>> 5] >>> (index & 31)) & 1;
+    }
+
+    // 32ビット値の立っているビットの数
+    function popcount32(value) {
+        value = value - ((value >>> 1) & 0x55555555);
+        value = (value & 0x33333333) + ((value >>> 2) & 0x33333333);
+        return (Math.imul((value + (value >>> 4)) & 0x0F0F0F0F, 0x01010101)) >>> 24;
+    }
+
+    // 読み込み時に一度だけファセットごとのビットセットと検索用文字列を作成
+    function buildIndexes() {
+        facetBits = {};
+        Object.entries(FACETS).forEach(([name, facet]) => {
+            const bits = createBitset(profiles.length);
+            profiles.forEach((profile, index) => {
+                if (facet.test(profile)) {
+                    bits[index >>> 5] |= 1 << (index & 31);
+                }
+            });
+            facetBits[name] = bits;
+        });
+
+        // フィールドをまたいで一致しないよう区切り文字で連結
+        haystacks = profiles.map(profile => [
+            profile.avatarName,
+            profile.avatarAuthor,
+            profile.profileAuthor
+        ].map(value => (value || '').toLowerCase()).join('\u0000'));
+    }
+
+    // テキスト検索の結果をビットセットで取得
+    function buildSearchBits(searchTerm) {
+        if (!searchTerm) {
+            return createBitset(profiles.length, true);
+        }
+        const bits = createBitset(profiles.length);
+        haystacks.forEach((haystack, index) => {
+            if (haystack.includes(searchTerm)) {
+                bits[index >>> 5] |= 1 << (index & 31);
+            }
+        });
+        return bits;
+    }
+
+    // ファセットごとの件数
+    // 件数は「検索結果」と「他のグループの選択条件」を満たすもののうち、そのファセットに該当する数
+    function countFacets(searchBits, groupBits) {
+        const counts = {};
+        Object.entries(FACETS).forEach(([name, facet]) => {
+            const bits = facetBits[name];
+            const otherGroups = Object.entries(groupBits)
+                .filter(([group]) => group !== facet.group)
+                .map(([, selected]) => selected);
+            let count = 0;
+            for (let word = 0; word < bits.length; word++) {
+                let value = bits[word] & searchBits[word];
+                for (const selected of otherGroups) {
+                    value &= selected[word];
+                }
+                count += popcount32(value);
+            }
+            counts[name] = count;
+        });
+        return counts;
+    }
+
+    // データを設定してインデックスを作成
+    function setData(data, sortIndex) {
+        profiles = data.profiles || [];
+        prepareSortIndex(data, sortIndex);
+        buildIndexes();
+    }
+
+    // データを読み込み（baseUrlはサイトのルートURL）
+    async function load(baseUrl) {
+        const [data, sortIndex] = await Promise.all([
+            fetchLatestProfiles(baseUrl),
+            fetchJsonOrNull(new URL('data/profiles_index.json', baseUrl).href)
+        ]);
+        setData(data, sortIndex);
+        return data;
+    }
+
+    // 検索・絞り込み・並び替えを行い、表示順のインデックス配列とファセットごとの件数を返す
+    // options: { searchTerm, showAll, selected: 選択されたファセット名の配列, sort: 並び替え選択肢 }
+    function query({ searchTerm = '', showAll = true, selected = [], sort = 'id-desc' }) {
+        // グループごとに選択されたファセットのビットセットをORで結合
+        // （「全て」がONの場合やグループ内で何も選択されていない場合は絞り込まない）
+        const groupBits = {};
+        if (!showAll) {
+            selected.filter(name => FACETS[name]).forEach(name => {
+                const group = FACETS[name].group;
+                const merged = groupBits[group] || (groupBits[group] = createBitset(profiles.length));
+                const bits = facetBits[name];
+                for (let word = 0; word < bits.length; word++) {
+                    merged[word] |= bits[word];
+                }
+            });
+        }
+
+        // テキスト検索の結果とグループ間をANDで結合
+        const searchBits = buildSearchBits(searchTerm.toLowerCase());
+        const filterMask = searchBits.slice();
+        Object.values(groupBits).forEach(merged => {
+            for (let word = 0; word < filterMask.length; word++) {
+                filterMask[word] &= merged[word];
+            }
+        });
+
+        // 並び替え順列からフィルター結果に含まれるものだけを取り出す
+        const order = getSortOrder(sort);
+        const indices = new Uint32Array(order.length);
+        let length = 0;
+        for (const index of order) {
+            if (hasBit(filterMask, index)) {
+                indices[length++] = index;
+            }
+        }
+
+        return {
+            indices: indices.slice(0, length),
+            facetCounts: countFacets(searchBits, groupBits)
+        };
+    }
+
+    return { FACETS, load, setData, query, applyDelta, planDeltaChain };
+})();
@@ -0,0 +1,22 @@
+// プロファイルの検索・絞り込み・並び替えを行うWeb Worker
+// 処理本体は js/profile-engine.js（Web Worker を使用できない場合はメインスレッドで同じ処理を行う）
+importScripts('profile-engine.js');
+
+self.addEventListener('message', async event => {
+    const { id, type, payload } = event.data;
+    try {
+        if (type === 'load') {
+            // プロファイルデータは最初に一度だけメインスレッドへ渡す
+            const data = await ProfileEngine.load(payload.baseUrl);
+            self.postMessage({ id, result: data });
+        } else if (type === 'query') {
+            // 以降は表示順のインデックス配列だけを（コピーせずに）渡す
+            const result = ProfileEngine.query(payload);
+            self.postMessage({ id, result }, [result.indices.buffer]);
+        } else {
+            throw new Error(`不明な要求です: ${type}`);
+        }
+    } catch (error) {
+        self.postMessage({ id, error: error.message });
+    }
+});
@@ -4,12 +4,13 @@
 何度実行しても安全（既にフィールドがある場合はスキップ）
 """
 
-import json
 import os
 import requests
 from bs4 import BeautifulSoup
 import time
 
+from profile_io import dump_json, load_json
+
 
 # URLごとの取得結果をキャッシュ（同じURLへの複数アクセスを避ける）
 _shopname_cache = {}
@@ -64,6 +65,37 @@ def fetch_shopname_from_url(url):
     return ""
 
 
+def add_profile_shopname_fields(profile):
+    """
+    プロファイルに avatarshopname と profileshopname フィールドを追加（存在しない場合のみ）
+
+    Args:
+        profile: プロファイル
+
+    Returns:
+        list: 追加内容のメッセージ（追加なしなら空）
+    """
+    profile_id = profile.get("id", "unknown")
+    avatar_name = profile.get("avatarName", "")
+    messages = []
+
+    # avatarshopname を追加（存在しない場合のみ）
+    if "avatarshopname" not in profile:
+        avatar_author_url = profile.get("avatarAuthorUrl", "")
+        avatarshopname = fetch_shopname_from_url(avatar_author_url)
+        profile["avatarshopname"] = avatarshopname
+        messages.append(f"[{profile_id}] {avatar_name}: added avatarshopname = '{avatarshopname}'")
+
+    # profileshopname を追加（存在しない場合のみ）
+    if "profileshopname" not in profile:
+        profile_author_url = profile.get("profileAuthorUrl", "")
+        profileshopname = fetch_shopname_from_url(profile_author_url)
+        profile["profileshopname"] = profileshopname
+        messages.append(f"[{profile_id}] {avatar_name}: added profileshopname = '{profileshopname}'")
+
+    return messages
+
+
 def add_shopname_fields(json_path):
     """
     profiles.jsonに avatarshopname と profileshopname フィールドを追加
@@ -76,8 +108,7 @@ def add_shopname_fields(json_path):
     print("=" * 80)
 
     # JSONファイルを読み込み
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(json_path)
 
     profiles = data.get("profiles", [])
     updated_count = 0
@@ -88,34 +119,16 @@ def add_shopname_fields(json_path):
     print("-" * 80)
 
     for profile in profiles:
-        profile_id = profile.get("id", "unknown")
-        avatar_name = profile.get("avatarName", "")
-
         # 既に両方のフィールドが存在する場合はスキップ
         if "avatarshopname" in profile and "profileshopname" in profile:
             skipped_count += 1
-            print(f"[{profile_id}] {avatar_name}: avatarshopname/profileshopname already exist, skipped")
+            print(f"[{profile.get('id', 'unknown')}] {profile.get('avatarName', '')}: avatarshopname/profileshopname already exist, skipped")
             continue
 
-        needs_update = False
-
-        # avatarshopname を追加（存在しない場合のみ）
-        if "avatarshopname" not in profile:
-            avatar_author_url = profile.get("avatarAuthorUrl", "")
-            avatarshopname = fetch_shopname_from_url(avatar_author_url)
-            profile["avatarshopname"] = avatarshopname
-            needs_update = True
-            print(f"[{profile_id}] {avatar_name}: added avatarshopname = '{avatarshopname}'")
-
-        # profileshopname を追加（存在しない場合のみ）
-        if "profileshopname" not in profile:
-            profile_author_url = profile.get("profileAuthorUrl", "")
-            profileshopname = fetch_shopname_from_url(profile_author_url)
-            profile["profileshopname"] = profileshopname
-            needs_update = True
-            print(f"[{profile_id}] {avatar_name}: added profileshopname = '{profileshopname}'")
-
-        if needs_update:
+        messages = add_profile_shopname_fields(profile)
+        for message in messages:
+            print(message)
+        if messages:
             updated_count += 1
 
     print("-" * 80)
@@ -124,8 +137,7 @@ def add_shopname_fields(json_path):
 
     # 更新がある場合のみ書き戻し
     if updated_count > 0:
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        dump_json(json_path, data)
         print(f"\n✅ {json_path} を更新しました")
         return True
     else:
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+profile_io.py の JSON ライブラリ（orjson / msgspec / json）ごとの読み込み・書き出しの比較。
+
+data/profiles.json のプロファイルを 1倍・10倍・100倍 に増やしたJSONで、
+インストールされているライブラリごとに読み込み・書き出しの時間とピークメモリを計る。
+書き出した内容が json.dump(data, f, ensure_ascii=False, indent=2) と同じかも確認する。
+
+使い方:
+    python scripts/bench_json_backend.py [倍率 ...]   # 省略時は 1 10 100
+"""
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from profile_io import available_backends, dumps, loads
+
+DEFAULT_SCALES = (1, 10, 100)
+REPEAT = 3
+
+
+def scaled_data(data, scale):
+    """プロファイルを scale 倍に増やしたデータ（IDは連番に振り直す）"""
+    profiles = []
+    for index in range(len(data["profiles"]) * scale):
+        profile = dict(data["profiles"][index % len(data["profiles"])])
+        profile["id"] = str(index + 1).zfill(3)
+        profiles.append(profile)
+    return {**data, "profiles": profiles}
+
+
+def measure(func):
+    """func() の最短時間（秒）とピークメモリ（バイト）と結果を返す"""
+    best = None
+    for _ in range(REPEAT):
+        gc.collect()
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+        del result
+
+    # メモリは tracemalloc の影響を受けない時間とは別に計る
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    scales = [int(arg) for arg in argv] or DEFAULT_SCALES
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    json_path = os.path.join(os.path.dirname(script_dir), "data", "profiles.json")
+    with open(json_path, "r", encoding="utf-8") as f:
+        base = json.load(f)
+
+    backends = available_backends()
+    print(f"使用可能なライブラリ: {', '.join(backends)}")
+    identical = True
+
+    for scale in scales:
+        data = scaled_data(base, scale)
+        expected = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+        print()
+        print(f"{scale}倍（{len(data['profiles']):,}件、{len(expected) / 2**20:.1f} MiB）")
+        print(f"  {'ライブラリ':10} {'読み込み':>10} {'ピーク':>10} {'書き出し':>10} {'ピーク':>10}  出力")
+
+        for backend in backends:
+            load_time, load_peak, loaded = measure(lambda: loads(expected, backend))
+            dump_time, dump_peak, output = measure(lambda: dumps(loaded, backend))
+            same = output == expected
+            identical = identical and same
+            print(f"  {backend:10} {load_time * 1000:8.1f}ms {load_peak / 2**20:7.1f}MiB"
+                  f" {dump_time * 1000:8.1f}ms {dump_peak / 2**20:7.1f}MiB  {'一致' if same else '不一致'}")
+            del loaded, output
+
+    if not identical:
+        print()
+        print("json.dump と異なる出力がありました")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
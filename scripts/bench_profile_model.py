@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Profile（profile_model.py）と dict のメモリ使用量・項目の読み取り速度の比較。
+
+data/profiles.json のプロファイルを繰り返して、IDと商品IDを変えた合成プロファイル
+（既定 100,000件）を作り、JSONから読み込んだ dict のリストと Profile のリストを比べる。
+
+使い方:
+    python scripts/bench_profile_model.py [件数]
+"""
+
+import gc
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+from profile_model import from_dicts
+
+DEFAULT_COUNT = 100_000
+ACCESS_FIELDS = ("pricing", "price", "downloadMethod", "official", "avatarName")
+
+
+def synthetic_json(base_profiles, count):
+    """base_profiles を繰り返し、IDと商品IDを変えた count 件のプロファイルのJSON"""
+    profiles = []
+    for index in range(count):
+        profile = dict(base_profiles[index % len(base_profiles)])
+        profile["id"] = str(index + 1).zfill(3)
+        for field in ("avatarNameUrl", "downloadLocation"):
+            if isinstance(profile.get(field), str):
+                profile[field] = re.sub(r"/items/\d+", f"/items/{10_000_000 + index}", profile[field])
+        profiles.append(profile)
+    return json.dumps({"profiles": profiles}, ensure_ascii=False)
+
+
+def measure(build):
+    """build() の結果が保持しているメモリ（バイト）と結果を返す"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def time_access(profiles, read):
+    started = time.perf_counter()
+    for profile in profiles:
+        for field in ACCESS_FIELDS:
+            read(profile, field)
+    return time.perf_counter() - started
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else DEFAULT_COUNT
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    json_path = os.path.join(os.path.dirname(script_dir), "data", "profiles.json")
+    with open(json_path, "r", encoding="utf-8") as f:
+        base_profiles = json.load(f)["profiles"]
+    text = synthetic_json(base_profiles, count)
+
+    dict_bytes, dicts = measure(lambda: json.loads(text)["profiles"])
+    model_bytes, models = measure(lambda: from_dicts(json.loads(text)["profiles"]))
+
+    # 時間は tracemalloc なしで計る
+    started = time.perf_counter()
+    from_dicts(dicts)
+    convert_time = time.perf_counter() - started
+
+    dict_get = time_access(dicts, lambda p, field: p.get(field))
+    model_get = time_access(models, lambda p, field: p.get(field))
+    model_attr = time_access(models, getattr)
+
+    print(f"{count:,}件の合成プロファイル")
+    print(f"  メモリ   dict: {dict_bytes / 2**20:8.1f} MiB   Profile: {model_bytes / 2**20:8.1f} MiB"
+          f"  ({model_bytes / dict_bytes:.0%})")
+    print(f"  変換     dict → Profile: {convert_time * 1000:.0f} ms")
+    reads = count * len(ACCESS_FIELDS)
+    print(f"  読み取り（{reads:,}回）")
+    print(f"    dict.get        {dict_get * 1000:8.1f} ms")
+    print(f"    Profile.get     {model_get * 1000:8.1f} ms")
+    print(f"    Profile の属性  {model_attr * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
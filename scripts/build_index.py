@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+profiles.json からWebページ用のソートインデックスを生成するスクリプト。
+
+js/main.js の並び替えで毎回行っていた Booth ID の正規表現抽出や日付の解析を
+公開時に一度だけ行い、以下を data/profiles_index.json に出力する。
+- keys: avatarBoothId / profileBoothId / updatedDate の数値ソートキー（profiles と同じ順序）
+- sorts: index.html の sortSelect の各選択肢に対応するインデックスの並び（順列）
+
+ProfileEditor の保存時と GitHub Actions（profiles.json 更新時）から実行される。
+"""
+
+import json
+import os
+import re
+import sys
+
+from profile_io import load_json
+
+INDEX_FILENAME = "profiles_index.json"
+
+# index.html の sortSelect と同じ並び
+SORT_OPTIONS = [
+    "id-desc",
+    "avatarBoothId-desc",
+    "profileBoothId-desc",
+    "updatedDate-desc",
+    "updatedDate-asc",
+    "avatarName-asc",
+    "avatarAuthor-asc",
+    "profileAuthor-asc",
+]
+
+_BOOTH_ITEM_RE = re.compile(r"/items/(\d+)")
+_INT_PREFIX_RE = re.compile(r"\s*([+-]?\d+)")
+_DATE_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})(?:[ T](\d{1,2}):(\d{2})(?::(\d{2}))?)?")
+
+
+def extract_booth_item_id(url):
+    """BoothのURLから商品IDを数値で取得（main.js の extractBoothItemId と同じ判定）"""
+    if not url or not isinstance(url, str) or "booth.pm" not in url:
+        return None
+    match = _BOOTH_ITEM_RE.search(url)
+    if match:
+        return int(match.group(1))
+    return None
+
+
+def parse_id(value):
+    """IDを数値に変換（JavaScript の parseInt(value) || 0 相当）"""
+    match = _INT_PREFIX_RE.match(str(value or ""))
+    return int(match.group(1)) if match else 0
+
+
+def date_sort_key(value):
+    """日付文字列を YYYYMMDDhhmmss 形式の数値に変換（解析できない場合は0）"""
+    match = _DATE_RE.match(str(value or "").strip())
+    if not match:
+        return 0
+    year, month, day, hour, minute, second = (int(v) if v else 0 for v in match.groups())
+    return ((((year * 100 + month) * 100 + day) * 100 + hour) * 100 + minute) * 100 + second
+
+
+def _string_sort_key(value):
+    # JavaScript の文字列比較（UTF-16コード単位順）に合わせる
+    return str(value or "").encode("utf-16-be")
+
+
+def build_sort_keys(profiles):
+    """数値ソートキーを profiles と同じ順序のリストで返す"""
+    return {
+        "avatarBoothId": [extract_booth_item_id(p.get("avatarNameUrl")) for p in profiles],
+        "profileBoothId": [extract_booth_item_id(p.get("downloadLocation")) for p in profiles],
+        "updatedDate": [date_sort_key(p.get("updatedDate")) for p in profiles],
+    }
+
+
+def build_sort_orders(profiles, keys=None):
+    """sortSelect の選択肢ごとに、並び替え後のインデックス列を返す
+
+    同値の場合は profiles の並び（ファイル順）を維持する（Array.prototype.sort と同じ安定ソート）。
+    Booth URL でないものは昇順・降順に関わらず main.js と同様に最大値として扱う。
+    """
+    if keys is None:
+        keys = build_sort_keys(profiles)
+
+    orders = {}
+    indices = range(len(profiles))
+    for option in SORT_OPTIONS:
+        field, direction = option.split("-")
+        if field == "id":
+            values = [parse_id(p.get("id")) for p in profiles]
+        elif field in ("avatarBoothId", "profileBoothId"):
+            values = [v if v is not None else sys.maxsize for v in keys[field]]
+        elif field == "updatedDate":
+            values = keys[field]
+        else:
+            values = [_string_sort_key(p.get(field)) for p in profiles]
+        orders[option] = sorted(indices, key=values.__getitem__, reverse=(direction == "desc"))
+    return orders
+
+
+def build_index(data):
+    """profiles.json のデータからインデックスを生成"""
+    profiles = data.get("profiles", [])
+    keys = build_sort_keys(profiles)
+    return {
+        "lastUpdated": data.get("lastUpdated", ""),
+        "count": len(profiles),
+        "keys": keys,
+        "sorts": build_sort_orders(profiles, keys),
+    }
+
+
+def write_index(data, data_dir):
+    """インデックスを data_dir/profiles_index.json に書き出し、パスを返す"""
+    index_path = os.path.join(data_dir, INDEX_FILENAME)
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(build_index(data), f, ensure_ascii=False, separators=(",", ":"))
+        f.write("\n")
+    return index_path
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    data_dir = os.path.join(os.path.dirname(script_dir), "data")
+    json_path = os.path.join(data_dir, "profiles.json")
+    if not os.path.exists(json_path):
+        print(f"profiles.json が見つかりません: {json_path}")
+        return 1
+
+    data = load_json(json_path)
+
+    index_path = write_index(data, data_dir)
+    print(f"{len(data.get('profiles', []))}件のソートインデックスを生成しました: {index_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
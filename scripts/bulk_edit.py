@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+プロファイルエディタの一括編集。
+
+選択した複数のプロファイルに、項目への値の設定と文字列の置換をまとめて適用する。
+適用は1つの操作として扱い、途中で失敗した場合は適用前の状態に戻す。
+変更前の値は BulkEdit に保持するため、undo() で一括編集をまとめて元に戻せる。
+"""
+
+from datetime import datetime
+
+# 一括編集できる文字列の項目（表示名, 項目名）。IDと登録日は対象外
+BULK_TEXT_FIELDS = (
+    ("アバター名", "avatarName"),
+    ("アバターURL", "avatarNameUrl"),
+    ("プロファイルバージョン", "profileVersion"),
+    ("アバター作者", "avatarAuthor"),
+    ("アバターショップ名", "avatarshopname"),
+    ("アバター作者URL", "avatarAuthorUrl"),
+    ("共通素体", "bodyBase"),
+    ("プロファイル作者", "profileAuthor"),
+    ("プロファイルショップ名", "profileshopname"),
+    ("プロファイル作者URL", "profileAuthorUrl"),
+    ("配布方法", "downloadMethod"),
+    ("配布場所URL", "downloadLocation"),
+    ("画像URL", "imageUrl"),
+    ("価格区分", "pricing"),
+    ("プロファイル価格", "price"),
+    ("アバター価格", "avatarPrice"),
+    ("セール開始日", "saleStartDate"),
+    ("セール終了日", "saleEndDate"),
+    ("セール価格", "salePrice"),
+    ("備考", "notes"),
+)
+
+# 一括編集できるチェックボックスの項目（表示名, 項目名）
+BULK_BOOL_FIELDS = (
+    ("公式", "official"),
+    ("順方向対応", "forwardSupport"),
+    ("逆方向対応", "reverseSupport"),
+    ("セール中", "onSale"),
+)
+
+TRUE_LABEL = "はい"
+FALSE_LABEL = "いいえ"
+
+_TEXT_FIELD_NAMES = tuple(name for _, name in BULK_TEXT_FIELDS)
+_BOOL_FIELD_NAMES = tuple(name for _, name in BULK_BOOL_FIELDS)
+
+# 変更前に項目が存在しなかったことを表す（元に戻すときは項目ごと削除する）
+_MISSING = object()
+
+
+def parse_bool(value):
+    """チェックボックスの項目に設定する値を bool に変換
+
+    Raises:
+        ValueError: はい・いいえとして解釈できない場合
+    """
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().casefold()
+    if text in (TRUE_LABEL, "true", "yes", "on", "1"):
+        return True
+    if text in (FALSE_LABEL, "false", "no", "off", "0"):
+        return False
+    raise ValueError(f"「{TRUE_LABEL}」か「{FALSE_LABEL}」を指定してください: {value}")
+
+
+class BulkEdit:
+    """一括編集の内容と、適用したプロファイルの変更前の値
+
+    Args:
+        assignments: 設定する値 {項目名: 値}（チェックボックスの項目は parse_bool で変換）
+        replacements: 置換 [(項目名, 検索文字列, 置換文字列), ...]（項目名が None ならすべての文字列の項目）
+
+    Raises:
+        ValueError: 一括編集できない項目・不正な値・空の検索文字列が指定された場合
+    """
+
+    def __init__(self, assignments=None, replacements=None):
+        self.assignments = {}
+        for field, value in (assignments or {}).items():
+            if field in _BOOL_FIELD_NAMES:
+                self.assignments[field] = parse_bool(value)
+            elif field in _TEXT_FIELD_NAMES:
+                self.assignments[field] = str(value)
+            else:
+                raise ValueError(f"一括編集できない項目です: {field}")
+
+        self.replacements = []
+        for field, find, replace in (replacements or []):
+            if field is not None and field not in _TEXT_FIELD_NAMES:
+                raise ValueError(f"置換できない項目です: {field}")
+            if not find:
+                raise ValueError("置換する文字列を入力してください")
+            self.replacements.append((field, find, replace))
+
+        self.changes = []  # [(プロファイル, {項目名: 変更前の値}), ...]（変更されたプロファイルのみ）
+
+    def is_empty(self):
+        """設定・置換のどちらも指定されていないか"""
+        return not self.assignments and not self.replacements
+
+    def _new_values(self, profile):
+        """プロファイルに適用した後の値 {項目名: 値}（値が変わらない項目も含む）"""
+        values = dict(self.assignments)
+        for field, find, replace in self.replacements:
+            for name in ((field,) if field else _TEXT_FIELD_NAMES):
+                current = values.get(name, profile.get(name, ""))
+                if isinstance(current, str) and find in current:
+                    values[name] = current.replace(find, replace)
+        return values
+
+    def apply(self, profiles, updated_date=None):
+        """プロファイルに一括編集を適用し、変更されたプロファイルのリストを返す
+
+        値が変わったプロファイルだけ更新日（updatedDate）を updated_date（省略時は現在時刻）にする。
+        """
+        if updated_date is None:
+            updated_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        changes = []
+        try:
+            for profile in profiles:
+                changed = {
+                    field: value for field, value in self._new_values(profile).items()
+                    if profile.get(field, _MISSING) != value
+                }
+                if not changed:
+                    continue
+                previous = {field: profile.get(field, _MISSING) for field in (*changed, "updatedDate")}
+                changes.append((profile, previous))
+                profile.update(changed)
+                profile["updatedDate"] = updated_date
+        except Exception:
+            # 途中で失敗した場合は適用前の状態に戻す
+            self._restore(changes)
+            raise
+
+        self.changes.extend(changes)
+        return [profile for profile, _ in changes]
+
+    def undo(self):
+        """適用した一括編集を元に戻し、元に戻したプロファイルのリストを返す"""
+        changes, self.changes = self.changes, []
+        self._restore(changes)
+        return [profile for profile, _ in changes]
+
+    @staticmethod
+    def _restore(changes):
+        for profile, previous in reversed(changes):
+            for field, value in previous.items():
+                if value is _MISSING:
+                    profile.pop(field, None)
+                else:
+                    profile[field] = value
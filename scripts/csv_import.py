@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+プロファイルエディタのCSVインポート。
+
+CSVを1行ずつ読みながら、既存のプロファイルのIDの索引（一度だけ作成）で更新か追加かを判定し、
+インポート計画（追加・更新・エラー）を作成する。IDが空の行には、既存のIDとCSVで
+指定されたIDをすべて除いた空き番号を若い順に割り当てる。
+計画は適用前に確認でき（ドライラン）、apply() でまとめて適用する。
+"""
+
+import csv
+from itertools import islice
+
+from profile_validation import DATE_RE
+
+# CSVから読み込む文字列の項目
+CSV_TEXT_FIELDS = (
+    "avatarName", "avatarNameUrl", "profileVersion",
+    "avatarAuthor", "avatarAuthorUrl", "bodyBase", "profileAuthor",
+    "profileAuthorUrl", "downloadMethod", "downloadLocation",
+    "imageUrl", "pricing", "price", "notes",
+)
+
+# CSVから読み込むチェックボックスの項目
+CSV_BOOL_FIELDS = ("official", "forwardSupport", "reverseSupport")
+
+# 更新の場合のみCSVの値を使う日付の項目（新規追加の場合はインポートした日時）
+CSV_DATE_FIELDS = ("registeredDate", "updatedDate")
+
+_TRUE_VALUES = ("true", "1", "yes")
+_FALSE_VALUES = ("false", "0", "no", "")
+
+
+class IdAllocator:
+    """空いているIDを若い順に割り当てる（使用中のIDは最初に一度だけ集める）"""
+
+    def __init__(self, used_ids):
+        self._used = set()
+        for value in used_ids:
+            self.reserve(value)
+        self._next = 1
+
+    def reserve(self, value):
+        """IDを使用中にする（数値でないIDは無視）"""
+        try:
+            self._used.add(int(value))
+        except (TypeError, ValueError):
+            pass
+
+    def allocate(self):
+        while self._next in self._used:
+            self._next += 1
+        self._used.add(self._next)
+        return str(self._next).zfill(3)
+
+
+def _parse_bool(value):
+    text = value.strip().lower()
+    if text in _TRUE_VALUES:
+        return True
+    if text in _FALSE_VALUES:
+        return False
+    raise ValueError(f"true/false で指定してください: {value}")
+
+
+class ImportPlan:
+    """CSVインポートの計画"""
+
+    def __init__(self):
+        self.added = []      # [(行番号, 追加するプロファイル), ...]
+        self.updated = []    # [(行番号, 既存のプロファイル, {項目名: 新しい値}), ...]
+        self.unchanged = 0   # 既存のプロファイルと内容が同じ行の数
+        self.errors = []     # [(行番号, メッセージ), ...]（エラーの行はインポートしない）
+
+    def has_changes(self):
+        return bool(self.added or self.updated)
+
+    def summary_lines(self, limit=200):
+        """ドライランの表示用に、エラー・追加・更新の内容を1行ずつ返す（最大 limit 行）"""
+        lines = list(islice(self._iter_summary_lines(), limit + 1))
+        if len(lines) > limit:
+            lines = lines[:limit] + ["..."]
+        return lines
+
+    def _iter_summary_lines(self):
+        for row_num, message in self.errors:
+            yield f"! 行{row_num}: {message}"
+        for row_num, profile in self.added:
+            yield f"+ 行{row_num}: 追加 ID {profile['id']} {profile.get('avatarName', '')}"
+        for row_num, profile, changes in self.updated:
+            yield f"~ 行{row_num}: 更新 ID {profile.get('id', '')} {profile.get('avatarName', '')}"
+            for field, value in changes.items():
+                yield f"    {field}: {profile.get(field, '')!r} → {value!r}"
+
+    def apply(self, profiles):
+        """計画をプロファイルのリストに適用し、追加・更新したプロファイルのリストを返す
+
+        途中で失敗した場合は適用前の状態に戻す。
+        """
+        previous = []
+        added_count = 0
+        try:
+            for _, profile, changes in self.updated:
+                previous.append((profile, {field: profile.get(field) for field in changes},
+                                 [field for field in changes if field not in profile]))
+                profile.update(changes)
+            for _, profile in self.added:
+                profiles.append(profile)
+                added_count += 1
+        except Exception:
+            del profiles[len(profiles) - added_count:]
+            for profile, values, missing in previous:
+                profile.update(values)
+                for field in missing:
+                    profile.pop(field, None)
+            raise
+        return [profile for _, profile, _ in self.updated] + [profile for _, profile in self.added]
+
+
+def plan_csv_import(profiles, csv_file, now):
+    """CSVを読み込んでインポート計画を作成（プロファイルは変更しない）
+
+    Args:
+        profiles: 既存のプロファイルのリスト
+        csv_file: CSVファイル（テキストモードで開いたもの）
+        now: 登録日・更新日に使う日時の文字列
+
+    Returns:
+        ImportPlan
+    """
+    plan = ImportPlan()
+    by_id = {}
+    for profile in profiles:
+        by_id.setdefault(profile.get("id"), profile)
+    allocator = IdAllocator(by_id)
+
+    seen_ids = {}   # CSVで指定されたID → 行番号
+    pending = []    # IDが空の行（CSVで指定されたIDをすべて確保してから採番する）
+
+    for row_num, row in enumerate(csv.DictReader(csv_file), start=2):  # ヘッダーが1行目なので2から
+        # 列の多すぎる行は DictReader が None をキーにして残りを入れる
+        if None in row:
+            plan.errors.append((row_num, "列の数がヘッダーより多くなっています"))
+            continue
+
+        values = {field: (row[field] or "").strip() for field in CSV_TEXT_FIELDS if field in row}
+        try:
+            for field in CSV_BOOL_FIELDS:
+                if field in row:
+                    values[field] = _parse_bool(row[field] or "")
+            dates = {field: (row.get(field) or "").strip() for field in CSV_DATE_FIELDS}
+            for field, value in dates.items():
+                if value and not DATE_RE.fullmatch(value):
+                    raise ValueError(f"{field} は YYYY-MM-DD または YYYY-MM-DD HH:MM:SS で指定してください: {value}")
+        except ValueError as e:
+            plan.errors.append((row_num, str(e)))
+            continue
+
+        csv_id = (row.get("id") or "").strip()
+        if not csv_id:
+            pending.append((row_num, values))
+            continue
+        if csv_id in seen_ids:
+            plan.errors.append((row_num, f"ID {csv_id} は行{seen_ids[csv_id]}と重複しています"))
+            continue
+        seen_ids[csv_id] = row_num
+
+        existing = by_id.get(csv_id)
+        if existing is None:
+            # 指定されたIDで新規追加
+            allocator.reserve(csv_id)
+            plan.added.append((row_num, {"id": csv_id, "registeredDate": now, "updatedDate": now, **values}))
+            continue
+
+        # 既存レコードを更新（CSVに日付があればそれを使用、なければ更新日をインポートした日時に）
+        changes = {field: value for field, value in values.items() if existing.get(field) != value}
+        if dates["registeredDate"] and existing.get("registeredDate") != dates["registeredDate"]:
+            changes["registeredDate"] = dates["registeredDate"]
+        if not changes and not dates["updatedDate"]:
+            plan.unchanged += 1
+            continue
+        changes["updatedDate"] = dates["updatedDate"] or now
+        if len(changes) == 1 and existing.get("updatedDate") == changes["updatedDate"]:
+            plan.unchanged += 1
+            continue
+        plan.updated.append((row_num, existing, changes))
+
+    # IDが空の行は、既存のIDとCSVで指定されたIDを除いた空き番号で新規追加
+    for row_num, values in pending:
+        plan.added.append((row_num, {"id": allocator.allocate(), "registeredDate": now, "updatedDate": now, **values}))
+    plan.added.sort(key=lambda item: item[0])
+    return plan
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+profiles.json の差分フィード（delta）を生成・適用するモジュール。
+
+公開（保存）のたびに、直前の版からの差分を data/deltas/ に書き出し、
+最新版を指すバージョンポインタ data/profiles_version.json を更新する。
+
+profiles_version.json:
+    {
+      "version": "<最新の lastUpdated>",
+      "count": <プロファイル数>,
+      "digest": "<最新のプロファイルのダイジェスト>",
+      "deltas": [{"from": "<版>", "to": "<版>", "file": "deltas/<版>.json"}, ...]  # 古い順
+    }
+
+deltas/<版>.json:
+    {"from", "to", "baseDigest", "added": [...], "changed": [...], "removed": [id, ...], "order": [id, ...]}
+
+版 N を持つクライアントは deltas の中から from == N の位置以降を順に適用すれば最新版になる。
+保持期間（DEFAULT_RETENTION 件）を過ぎた版や、差分の連鎖が途切れた版は全件を取得し直す。
+
+コマンドラインから実行した場合は、profiles.json がエディタ以外（メンテナンススクリプト等）で
+更新されていればポインタを現在の内容に合わせ、差分の連鎖をリセットする（GitHub Actions用）。
+"""
+
+import hashlib
+import json
+import os
+import re
+
+FEED_DIRNAME = "deltas"
+MANIFEST_FILENAME = "profiles_version.json"
+DEFAULT_RETENTION = 30
+
+
+def version_slug(version):
+    """lastUpdated をファイル名用の文字列に変換（例: "2026-03-01 15:58:01 JST" -> "20260301155801"）"""
+    return re.sub(r"\D", "", version or "") or "0"
+
+
+def profiles_digest(profiles):
+    """プロファイル一覧の内容を表すダイジェスト（並び順を含む）"""
+    payload = json.dumps(profiles, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def compute_delta(prev_data, new_data):
+    """2つの版の差分（ID単位の追加・変更・削除と新しい並び順）を計算"""
+    prev_profiles = prev_data.get("profiles", [])
+    new_profiles = new_data.get("profiles", [])
+    prev_by_id = {p.get("id"): p for p in prev_profiles}
+    new_ids = set()
+
+    added = []
+    changed = []
+    for profile in new_profiles:
+        profile_id = profile.get("id")
+        new_ids.add(profile_id)
+        previous = prev_by_id.get(profile_id)
+        if previous is None:
+            added.append(profile)
+        elif previous != profile:
+            changed.append(profile)
+
+    removed = [p.get("id") for p in prev_profiles if p.get("id") not in new_ids]
+
+    return {
+        "from": prev_data.get("lastUpdated", ""),
+        "to": new_data.get("lastUpdated", ""),
+        "baseDigest": profiles_digest(prev_profiles),
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+        "order": [p.get("id") for p in new_profiles],
+    }
+
+
+def apply_delta(data, delta):
+    """差分を適用した新しいデータを返す（元のデータは変更しない）
+
+    Raises:
+        ValueError: 差分の適用元の版が一致しない場合
+    """
+    if data.get("lastUpdated", "") != delta.get("from"):
+        raise ValueError(f"差分の適用元が一致しません: {data.get('lastUpdated')} != {delta.get('from')}")
+
+    removed = set(delta.get("removed", []))
+    by_id = {p.get("id"): p for p in data.get("profiles", []) if p.get("id") not in removed}
+    for profile in delta.get("added", []) + delta.get("changed", []):
+        by_id[profile.get("id")] = profile
+
+    try:
+        profiles = [by_id[profile_id] for profile_id in delta.get("order", [])]
+    except KeyError as e:
+        raise ValueError(f"差分の並び順に存在しないIDがあります: {e}") from None
+
+    return {**data, "lastUpdated": delta.get("to", ""), "profiles": profiles}
+
+
+def plan_delta_chain(manifest, version):
+    """版 version から最新版までに適用する差分エントリの一覧を返す
+
+    Returns:
+        list | None: 最新なら空リスト、差分で追いつけない場合は None（全件取得が必要）
+    """
+    if not manifest:
+        return None
+    if version == manifest.get("version"):
+        return []
+    deltas = manifest.get("deltas", [])
+    for index, entry in enumerate(deltas):
+        if entry.get("from") == version:
+            return deltas[index:]
+    return None
+
+
+def feed_files(manifest):
+    """バージョンポインタが参照している差分ファイルのパス（data からの相対パス、古い順）"""
+    return [entry["file"] for entry in (manifest or {}).get("deltas", []) if entry.get("file")]
+
+
+def load_manifest(data_dir):
+    """バージョンポインタを読み込み（存在しない・壊れている場合は None）"""
+    manifest_path = os.path.join(data_dir, MANIFEST_FILENAME)
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_json(path, value):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False, separators=(",", ":"))
+        f.write("\n")
+
+
+def write_manifest(data_dir, data, deltas):
+    """バージョンポインタを書き出し、参照されなくなった差分ファイルを削除"""
+    profiles = data.get("profiles", [])
+    manifest = {
+        "version": data.get("lastUpdated", ""),
+        "count": len(profiles),
+        "digest": profiles_digest(profiles),
+        "deltas": deltas,
+    }
+    _write_json(os.path.join(data_dir, MANIFEST_FILENAME), manifest)
+
+    # 保持期間を過ぎた差分ファイルを削除
+    prune_feed_files(data_dir, manifest)
+
+    return manifest
+
+
+def prune_feed_files(data_dir, manifest):
+    """バージョンポインタが参照していない差分ファイルを削除"""
+    feed_dir = os.path.join(data_dir, FEED_DIRNAME)
+    if not os.path.isdir(feed_dir):
+        return
+    referenced = {os.path.basename(rel_path) for rel_path in feed_files(manifest)}
+    for filename in os.listdir(feed_dir):
+        if filename.endswith(".json") and filename not in referenced:
+            os.remove(os.path.join(feed_dir, filename))
+
+
+def publish_delta(prev_data, new_data, data_dir, retention=DEFAULT_RETENTION):
+    """直前の版からの差分を書き出し、バージョンポインタを更新
+
+    Args:
+        prev_data: 直前に公開された版（None の場合は差分の連鎖をリセット）
+        new_data: 新しく公開する版
+        data_dir: data ディレクトリのパス
+        retention: 保持する差分の件数
+
+    Returns:
+        dict: 更新後のバージョンポインタ
+    """
+    manifest = load_manifest(data_dir) or {}
+    deltas = list(manifest.get("deltas", []))
+    new_version = new_data.get("lastUpdated", "")
+
+    # 直前の版がポインタの最新版と一致しない場合や、同じ版のまま内容が変わった場合は
+    # 差分を繋げられないため、連鎖をリセットする（古い版のクライアントは全件取得）
+    if (prev_data is None
+            or prev_data.get("lastUpdated", "") != manifest.get("version")
+            or prev_data.get("lastUpdated", "") == new_version):
+        deltas = []
+    else:
+        feed_dir = os.path.join(data_dir, FEED_DIRNAME)
+        os.makedirs(feed_dir, exist_ok=True)
+        rel_path = f"{FEED_DIRNAME}/{version_slug(new_version)}.json"
+        _write_json(os.path.join(data_dir, rel_path.replace("/", os.sep)), compute_delta(prev_data, new_data))
+        deltas = [entry for entry in deltas if entry.get("file") != rel_path]
+        deltas.append({"from": prev_data.get("lastUpdated", ""), "to": new_version, "file": rel_path})
+        deltas = deltas[-retention:] if retention > 0 else []
+
+    return write_manifest(data_dir, new_data, deltas)
+
+
+def sync_manifest(data, data_dir):
+    """バージョンポインタが現在の profiles.json を指しているか確認し、ずれていれば合わせる
+
+    Returns:
+        bool: ポインタを更新した場合 True
+    """
+    manifest = load_manifest(data_dir)
+    if (manifest
+            and manifest.get("version") == data.get("lastUpdated", "")
+            and manifest.get("digest") == profiles_digest(data.get("profiles", []))):
+        return False
+    write_manifest(data_dir, data, [])
+    return True
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    data_dir = os.path.join(os.path.dirname(script_dir), "data")
+    json_path = os.path.join(data_dir, "profiles.json")
+    if not os.path.exists(json_path):
+        print(f"profiles.json が見つかりません: {json_path}")
+        return 1
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if sync_manifest(data, data_dir):
+        print("バージョンポインタを現在の profiles.json に合わせました（差分の連鎖をリセット）")
+    else:
+        print("バージョンポインタは最新です")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
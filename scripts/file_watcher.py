@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+ディレクトリ内のファイルの変更を監視するモジュール（scripts/server.py のライブリロード用）。
+
+Linuxでは inotify（標準ライブラリの ctypes 経由）を使い、使えない環境では
+ファイルの更新日時・サイズを定期的に確認するポーリングで監視する。
+短時間に続けて起きた変更（エディタの保存で profiles.json・インデックス・差分が
+続けて書き込まれる場合など）はまとめて1回のコールバックで通知する。
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from threading import Thread
+
+# inotify のイベント（<sys/inotify.h>）
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+# 監視対象外のファイル（エディタの一時ファイルなど）
+IGNORED_SUFFIXES = ("~", ".swp", ".tmp", ".pyc")
+
+
+def _is_ignored(name):
+    return name.startswith(".") or name.endswith(IGNORED_SUFFIXES)
+
+
+def _load_libc():
+    """inotify を使える libc を返す（使えない環境では None）"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class FileWatcher:
+    """ディレクトリ内のファイルの変更を監視し、変更されたファイルの一覧をコールバックに渡す
+
+    Args:
+        root: 基準ディレクトリ（コールバックに渡すパスはここからの相対パス、区切りは "/"）
+        directories: 監視するディレクトリ（root からの相対パス、サブディレクトリも監視）
+        callback: 変更時に呼ばれる関数（引数は変更されたファイルの相対パスのソート済みリスト）
+        interval: ポーリング時の確認間隔（秒）
+        debounce: 変更をまとめる待ち時間（秒）
+        use_inotify: False の場合は常にポーリングで監視
+    """
+
+    def __init__(self, root, directories, callback, interval=0.5, debounce=0.3, use_inotify=True):
+        self.root = os.path.abspath(root)
+        self.directories = [os.path.join(self.root, d) for d in directories]
+        self.callback = callback
+        self.interval = interval
+        self.debounce = debounce
+        self._libc = _load_libc() if use_inotify else None
+        self._thread = None
+
+    @property
+    def method(self):
+        """監視方法（"inotify" または "polling"）"""
+        return "inotify" if self._libc else "polling"
+
+    def start(self):
+        """監視スレッドを開始"""
+        target = self._run_inotify if self._libc else self._run_polling
+        self._thread = Thread(target=target, name="FileWatcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def _relpath(self, path):
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def _notify(self, changed):
+        if changed:
+            try:
+                self.callback(sorted(changed))
+            except Exception as e:
+                print(f"ファイル変更の通知でエラーが発生しました: {e}")
+
+    # --- ポーリング ---
+
+    def _snapshot(self):
+        """監視対象のファイルの {相対パス: (更新日時, サイズ)}"""
+        snapshot = {}
+        for directory in self.directories:
+            for dirpath, dirnames, filenames in os.walk(directory):
+                dirnames[:] = [d for d in dirnames if not _is_ignored(d)]
+                for filename in filenames:
+                    if _is_ignored(filename):
+                        continue
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    snapshot[self._relpath(path)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _run_polling(self):
+        previous = self._snapshot()
+        while True:
+            time.sleep(self.interval)
+            current = self._snapshot()
+            if current == previous:
+                continue
+            # 書き込みが続いている間は待ってからまとめて通知
+            time.sleep(self.debounce)
+            current = self._snapshot()
+            changed = {path for path in previous.keys() | current.keys()
+                       if previous.get(path) != current.get(path)}
+            previous = current
+            self._notify(changed)
+
+    # --- inotify ---
+
+    def _run_inotify(self):
+        fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        if fd < 0:
+            print("inotify を初期化できないため、ポーリングで監視します")
+            self._libc = None
+            self._run_polling()
+            return
+
+        watches = {}   # 監視ID → ディレクトリのパス
+
+        def add_watch(directory):
+            for dirpath, dirnames, _ in os.walk(directory):
+                dirnames[:] = [d for d in dirnames if not _is_ignored(d)]
+                wd = self._libc.inotify_add_watch(fd, os.fsencode(dirpath), WATCH_MASK)
+                if wd >= 0:
+                    watches[wd] = dirpath
+
+        for directory in self.directories:
+            if os.path.isdir(directory):
+                add_watch(directory)
+
+        try:
+            while True:
+                changed = set()
+                timeout = None
+                # 最初のイベントを待ち、その後は debounce 秒間イベントが途切れるまでまとめる
+                while select.select([fd], [], [], timeout)[0]:
+                    self._read_events(fd, watches, add_watch, changed)
+                    timeout = self.debounce
+                self._notify(changed)
+        finally:
+            os.close(fd)
+
+    def _read_events(self, fd, watches, add_watch, changed):
+        buffer = os.read(fd, 64 * 1024)
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buffer):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(buffer[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            directory = watches.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_DELETE_SELF:
+                watches.pop(wd, None)
+                continue
+            if not name or _is_ignored(name):
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                # 新しく作られたサブディレクトリ（data/deltas など）も監視
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    add_watch(path)
+                continue
+            changed.add(self._relpath(path))
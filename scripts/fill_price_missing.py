@@ -7,7 +7,6 @@ profiles.json の空欄 avatarPrice を埋めるユーティリティ。
 - 404 はスキップして最後に一覧表示
 """
 
-import json
 import os
 import time
 from urllib.parse import urlparse
@@ -15,6 +14,8 @@ from urllib.parse import urlparse
 import requests
 from bs4 import BeautifulSoup
 
+from profile_io import dump_json, load_json
+
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 SLEEP_SEC = 0.1
 
@@ -79,41 +80,51 @@ def fetch_price_from_item(url: str) -> tuple[str, int | None]:
         return "", None
 
 
+def fill_profile_price(profile) -> list[str]:
+    """空欄の avatarPrice を埋め、変更内容のメッセージのリストを返す（変更なしなら空）"""
+    if profile.get("avatarPrice"):
+        return []  # 既に価格があるものはスキップ
+
+    url = profile.get("avatarNameUrl", "")
+    if not url:
+        return []
+
+    price, status = fetch_price_from_item(url)
+    if price:
+        profile["avatarPrice"] = price
+        return [f"[{profile.get('id')}] {profile.get('avatarName')} price -> {price}"]
+    if status == 404:
+        print(f"[{profile.get('id')}] {profile.get('avatarName')} price: 404 {url}")
+    return []
+
+
+def print_not_found() -> None:
+    """404だったURLを表示"""
+    if _not_found:
+        print("\n404だったURL:")
+        for url in sorted(_not_found):
+            print(url)
+    else:
+        print("\n404 はありませんでした。")
+
+
 def fill_prices(json_path: str) -> None:
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(json_path)
 
     profiles = data.get("profiles", [])
     print(f"総プロファイル数: {len(profiles)}")
     updated = 0
 
     for p in profiles:
-        if p.get("avatarPrice"):
-            continue  # 既に価格があるものはスキップ
-
-        url = p.get("avatarNameUrl", "")
-        if not url:
-            continue
-
-        price, status = fetch_price_from_item(url)
-        if price:
-            p["avatarPrice"] = price
+        for message in fill_profile_price(p):
             updated += 1
-            print(f"[{p.get('id')}] {p.get('avatarName')} price -> {price}")
-        elif status == 404:
-            print(f"[{p.get('id')}] {p.get('avatarName')} price: 404 {url}")
+            print(message)
 
     if updated > 0:
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        dump_json(json_path, data)
 
     print(f"\n更新件数: {updated}")
-    if _not_found:
-        print("\n404だったURL:")
-        for url in sorted(_not_found):
-            print(url)
-    else:
-        print("\n404 はありませんでした。")
+    print_not_found()
 
 
 def main():
@@ -7,13 +7,14 @@ Booth の各アイテムページを開き、ショップ名をページ内の
 ・404 の URL はスキップし、最後に一覧表示
 """
 
-import json
 import os
 import time
 
 import requests
 from bs4 import BeautifulSoup
 
+from profile_io import dump_json, load_json
+
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 SLEEP_SEC = 0.1  # レートリミット・Bot判定回避のため
 
@@ -72,54 +73,54 @@ def fetch_shopname_from_item(item_url: str) -> tuple[str, int | None]:
         return "", None
 
 
+def fill_profile_shopnames(p) -> list[str]:
+    """空欄の avatarshopname / profileshopname を埋め、変更内容のメッセージのリストを返す（変更なしなら空）"""
+    pid = p.get("id", "")
+    avatar_name = p.get("avatarName", "")
+    messages = []
+
+    # avatarshopname は アバターURL、profileshopname は配布場所URLのページから取得
+    for field, url_field in (("avatarshopname", "avatarNameUrl"), ("profileshopname", "downloadLocation")):
+        if p.get(field, ""):
+            continue
+        item_url = p.get(url_field, "")
+        shopname, status = fetch_shopname_from_item(item_url)
+        if shopname:
+            p[field] = shopname
+            messages.append(f"[{pid}] {avatar_name} {field} -> {shopname}")
+        elif status == 404:
+            print(f"[{pid}] {avatar_name} {field}: 404 {item_url}")
+    return messages
+
+
+def print_not_found() -> None:
+    """404だったURLを表示"""
+    if _not_found:
+        print("\n404だったURL:")
+        for url in sorted(_not_found):
+            print(url)
+    else:
+        print("\n404 はありませんでした。")
+
+
 def fill_shopnames(json_path: str) -> None:
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(json_path)
 
     profiles = data.get("profiles", [])
     print(f"総プロファイル数: {len(profiles)}")
     updated = 0
 
     for p in profiles:
-        pid = p.get("id", "")
-        avatar_name = p.get("avatarName", "")
-        avatar_shop = p.get("avatarshopname", "")
-        profile_shop = p.get("profileshopname", "")
-
-        # avatarshopname
-        if not avatar_shop:
-            item_url = p.get("avatarNameUrl", "")
-            shopname, status = fetch_shopname_from_item(item_url)
-            if shopname:
-                p["avatarshopname"] = shopname
-                updated += 1
-                print(f"[{pid}] {avatar_name} avatarshopname -> {shopname}")
-            elif status == 404:
-                print(f"[{pid}] {avatar_name} avatarshopname: 404 {item_url}")
-
-        # profileshopname
-        if not profile_shop:
-            item_url = p.get("downloadLocation", "")
-            shopname, status = fetch_shopname_from_item(item_url)
-            if shopname:
-                p["profileshopname"] = shopname
-                updated += 1
-                print(f"[{pid}] {avatar_name} profileshopname -> {shopname}")
-            elif status == 404:
-                print(f"[{pid}] {avatar_name} profileshopname: 404 {item_url}")
+        for message in fill_profile_shopnames(p):
+            updated += 1
+            print(message)
 
     if updated > 0:
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        dump_json(json_path, data)
 
     # サマリ表示
     print(f"更新件数: {updated}")
-    if _not_found:
-        print("\n404だったURL:")
-        for url in sorted(_not_found):
-            print(url)
-    else:
-        print("\n404 はありませんでした。")
+    print_not_found()
 
 
 def main():
@@ -1,7 +1,9 @@
-import json
+import os
 import re
 from datetime import datetime
 
+from profile_io import dump_json, load_json
+
 
 def convert_date_format(date_str):
     """
@@ -25,6 +27,28 @@ def convert_date_format(date_str):
         return date_str
 
 
+def fix_profile_dates(profile):
+    """
+    プロファイルの登録日・更新日を yyyy-mm-dd に変換
+
+    Args:
+        profile: プロファイル
+
+    Returns:
+        list: 変換内容のメッセージ（変換なしなら空）
+    """
+    messages = []
+    for field in ('registeredDate', 'updatedDate'):
+        if field not in profile:
+            continue
+        old_date = profile[field]
+        new_date = convert_date_format(old_date)
+        if old_date != new_date:
+            profile[field] = new_date
+            messages.append(f"変換: [{profile.get('id', '')}] {old_date} -> {new_date}")
+    return messages
+
+
 def fix_dates_in_profiles(input_file, output_file=None):
     """
     profiles.jsonの日付フォーマットを修正
@@ -37,37 +61,24 @@ def fix_dates_in_profiles(input_file, output_file=None):
         output_file = input_file
 
     # JSONファイルを読み込み
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(input_file)
 
     fixed_count = 0
 
     # 各プロファイルの日付を変換
     for profile in data.get('profiles', []):
-        # registeredDateを変換
-        if 'registeredDate' in profile:
-            old_date = profile['registeredDate']
-            new_date = convert_date_format(old_date)
-            if old_date != new_date:
-                profile['registeredDate'] = new_date
-                fixed_count += 1
-                print(f"変換: {old_date} -> {new_date}")
-
-        # updatedDateを変換
-        if 'updatedDate' in profile:
-            old_date = profile['updatedDate']
-            new_date = convert_date_format(old_date)
-            if old_date != new_date:
-                profile['updatedDate'] = new_date
-                fixed_count += 1
-                print(f"変換: {old_date} -> {new_date}")
-
-    # JSONファイルに書き込み
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        for message in fix_profile_dates(profile):
+            fixed_count += 1
+            print(message)
 
     print(f"\n修正完了: {fixed_count}件の日付を変換しました")
-    print(f"保存先: {output_file}")
+
+    # 変換があった場合（または別のファイルに出力する場合）のみ書き込み
+    if fixed_count or os.path.abspath(output_file) != os.path.abspath(input_file):
+        dump_json(output_file, data)
+        print(f"保存先: {output_file}")
+    else:
+        print("変換がないため書き出していません")
 
 
 if __name__ == "__main__":
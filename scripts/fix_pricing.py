@@ -1,27 +1,25 @@
-import json
+"""
+profiles.json の価格を価格区分に合わせて修正するスクリプト。
+- pricing が "無料" のもの → price を "0" に設定
+- pricing が "アバター同梱" で price が 1以上の数値のもの → price を avatarPrice に移動し、price を "-" に設定
+"""
+
 import os
 
-# プロジェクトのルートディレクトリ
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-json_path = os.path.join(project_root, 'data', 'profiles.json')
+from profile_io import dump_json, load_json
 
-# JSONファイルを読み込み
-with open(json_path, 'r', encoding='utf-8') as f:
-    data = json.load(f)
+FREE_TAG = "[無料]"
+BUNDLED_TAG = "[アバター同梱]"
 
-# 処理カウンター
-free_count = 0
-bundled_count = 0
 
-# 各プロファイルを処理
-for profile in data['profiles']:
+def fix_profile_pricing(profile):
+    """プロファイルの価格を修正し、変更内容のメッセージのリストを返す（変更なしなら空）"""
     # 1. pricing が "無料" のもの → price を "0" に設定
     if profile.get('pricing') == '無料':
         old_price = profile.get('price', '')
         if old_price != '0':
             profile['price'] = '0'
-            free_count += 1
-            print(f"[無料] {profile['id']}: {profile['avatarName']} - price: {old_price} → 0")
+            return [f"{FREE_TAG} {profile['id']}: {profile['avatarName']} - price: {old_price} → 0"]
 
     # 2. pricing が "アバター同梱" で price が 1以上の数値
     elif profile.get('pricing') == 'アバター同梱':
@@ -30,22 +28,51 @@ for profile in data['profiles']:
         if price_str and price_str != '-':
             try:
                 price_num = int(price_str)
-                if price_num >= 1:
-                    # avatarPriceが空または未設定の場合のみ移動
-                    avatar_price = str(profile.get('avatarPrice', '')).strip()
-                    if not avatar_price:
-                        profile['avatarPrice'] = price_str
-                        profile['price'] = '-'
-                        bundled_count += 1
-                        print(f"[アバター同梱] {profile['id']}: {profile['avatarName']} - price: {price_str} → avatarPrice, price → -")
             except ValueError:
                 # 数値に変換できない場合はスキップ
-                pass
+                return []
+            if price_num >= 1:
+                # avatarPriceが空または未設定の場合のみ移動
+                avatar_price = str(profile.get('avatarPrice', '')).strip()
+                if not avatar_price:
+                    profile['avatarPrice'] = price_str
+                    profile['price'] = '-'
+                    return [f"{BUNDLED_TAG} {profile['id']}: {profile['avatarName']} - price: {price_str} → avatarPrice, price → -"]
+    return []
+
+
+def main():
+    # プロジェクトのルートディレクトリ
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    json_path = os.path.join(project_root, 'data', 'profiles.json')
+
+    # JSONファイルを読み込み
+    data = load_json(json_path)
+
+    # 処理カウンター
+    free_count = 0
+    bundled_count = 0
+
+    # 各プロファイルを処理
+    for profile in data['profiles']:
+        for message in fix_profile_pricing(profile):
+            print(message)
+            if message.startswith(FREE_TAG):
+                free_count += 1
+            else:
+                bundled_count += 1
+
+    # 変更がある場合のみ保存
+    if free_count or bundled_count:
+        dump_json(json_path, data)
+
+    print(f"\n処理完了:")
+    print(f"- 無料プロファイルのprice修正: {free_count}件")
+    print(f"- アバター同梱のprice→avatarPrice移動: {bundled_count}件")
+    if not (free_count or bundled_count):
+        print("変更がないため profiles.json は書き出していません")
+    return 0
 
-# 結果を保存
-with open(json_path, 'w', encoding='utf-8') as f:
-    json.dump(data, f, ensure_ascii=False, indent=2)
 
-print(f"\n処理完了:")
-print(f"- 無料プロファイルのprice修正: {free_count}件")
-print(f"- アバター同梱のprice→avatarPrice移動: {bundled_count}件")
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+GitHub の Git Data API で data ディレクトリを同期するモジュール。
+
+ローカルのファイルから git の blob SHA を計算してリモートのツリーと比較し、
+内容が変わったファイルだけをアップロード・ダウンロードする。
+- プッシュ: ツリー・コミットを1つずつ作成してブランチの参照を更新する（保存1回につき1コミット）
+- プル: blob を raw 形式で一時ファイルにストリーミングし、SHAを確認してから置き換える
+  （contents API と違い 1MB を超えるファイルも取得できる）
+参照・ツリーの取得には ETag を使った条件付きリクエストを使い、変わっていなければ前回の結果を使う。
+
+API呼び出しは GitHubDataClient にまとめており、api_url にローカルのスタブサーバーを
+指定すれば GitHub に接続せずに動作を確認できる。
+"""
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+
+from delta_feed import MANIFEST_FILENAME, feed_files
+
+DEFAULT_API_URL = "https://api.github.com"
+
+# 参照の更新が競合した（他のプッシュが先に反映された）場合に作り直す回数
+MAX_PUSH_ATTEMPTS = 3
+
+# ローカルに存在しない場合はリモートからも削除するディレクトリ（古い差分は保存時に削除されるため）
+# ただし、プッシュするバージョンポインタが参照しているファイルは削除しない（_referenced_files）
+PRUNED_DIRECTORIES = ("data/deltas/",)
+
+FILE_MODE = "100644"
+
+# blob を加工せずに取得するためのメディアタイプ
+RAW_MEDIA_TYPE = "application/vnd.github.raw"
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class GitHubAPIError(Exception):
+    """GitHub APIがエラーを返した場合の例外"""
+
+    def __init__(self, method, path, status_code, text=""):
+        super().__init__(f"{method} {path}: {status_code} {text[:100]}".rstrip())
+        self.status_code = status_code
+
+
+def git_blob_sha(content):
+    """git の blob SHA（"blob <サイズ>\\0" + 内容 の SHA-1）"""
+    header = f"blob {len(content)}\0".encode("ascii")
+    return hashlib.sha1(header + content).hexdigest()
+
+
+def _read_text_bytes(file_path):
+    # テキストとして読み込んで改行を LF にそろえる
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read().encode("utf-8")
+
+
+def local_blob_sha(file_path):
+    """ローカルのファイルの blob SHA（改行は LF にそろえる。ファイルがなければ None）"""
+    try:
+        return git_blob_sha(_read_text_bytes(file_path))
+    except FileNotFoundError:
+        return None
+
+
+def _file_blob_sha(file_path):
+    """ファイルの内容をそのまま（改行を変換せず）少しずつ読んで blob SHA を計算"""
+    digest = hashlib.sha1(f"blob {os.path.getsize(file_path)}\0".encode("ascii"))
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_local_files(base_dir, directory="data"):
+    """base_dir/directory 以下のファイルを {リポジトリ内のパス: 内容(bytes)} で返す
+
+    テキストとして読み込んで改行を LF にそろえる（Windowsで保存したファイルも
+    リモートと同じ内容として比較するため）。
+    """
+    files = {}
+    for root, dirs, filenames in os.walk(os.path.join(base_dir, directory)):
+        dirs.sort()
+        for filename in sorted(filenames):
+            file_path = os.path.join(root, filename)
+            rel_path = os.path.relpath(file_path, base_dir).replace(os.sep, "/")
+            files[rel_path] = _read_text_bytes(file_path)
+    return files
+
+
+def _referenced_files(files, directory):
+    """プッシュするバージョンポインタが参照している差分ファイルのリポジトリ内のパス
+
+    全件取得した直後などはローカルに差分ファイルがないことがあるが、ポインタが参照している限り
+    リモートから削除すると、クライアントが差分で追いつけなくなる。
+    """
+    content = files.get(f"{directory}/{MANIFEST_FILENAME}")
+    if content is None:
+        return set()
+    try:
+        manifest = json.loads(content)
+    except ValueError:
+        return set()
+    return {f"{directory}/{rel_path}" for rel_path in feed_files(manifest)}
+
+
+class GitHubDataClient:
+    """GitHub の Git Data API のクライアント
+
+    Args:
+        repo_path: "owner/repo"
+        token: アクセストークン
+        api_url: APIのURL（テスト時はスタブサーバーのURL）
+        session: requests.Session 互換のオブジェクト（省略時は requests.Session を作成）
+        etags: 条件付きリクエスト用のキャッシュ {URL: (ETag, JSON)}（同じ dict を渡せば次回も使える）
+    """
+
+    def __init__(self, repo_path, token, api_url=DEFAULT_API_URL, session=None, etags=None):
+        if session is None:
+            import requests  # 使うときに読み込む（エディタの起動を速くするため）
+            session = requests.Session()
+        self.repo_path = repo_path
+        self.api_url = api_url.rstrip("/")
+        self.session = session
+        self.headers = {
+            "Authorization": f"token {token}",
+            "Accept": "application/vnd.github.v3+json",
+        }
+        self.etags = {} if etags is None else etags
+
+    def _url(self, path):
+        return f"{self.api_url}/repos/{self.repo_path}" + (f"/{path}" if path else "")
+
+    def request(self, method, path, expected=(200,), **kwargs):
+        """APIを呼び出してJSONを返す（expected 以外のステータスは GitHubAPIError）
+
+        GET は ETag で条件付きリクエストにし、304 の場合は前回のJSONを返す。
+        """
+        url = self._url(path)
+        headers = self.headers
+        cache_key = None
+        if method == "GET":
+            cache_key = url + "?" + "&".join(f"{k}={v}" for k, v in sorted(kwargs.get("params", {}).items()))
+            cached = self.etags.get(cache_key)
+            if cached is not None:
+                headers = {**headers, "If-None-Match": cached[0]}
+
+        response = self.session.request(method, url, headers=headers, **kwargs)
+        if response.status_code == 304 and cache_key in self.etags:
+            return self.etags[cache_key][1]
+        if response.status_code not in expected:
+            raise GitHubAPIError(method, path, response.status_code, response.text)
+        result = response.json()
+        etag = response.headers.get("ETag")
+        if cache_key is not None and etag:
+            self.etags[cache_key] = (etag, result)
+        return result
+
+    def default_branch(self):
+        """リポジトリの既定のブランチ名"""
+        return self.request("GET", "")["default_branch"]
+
+    def head_commit(self, branch):
+        """ブランチの先頭のコミットの (SHA, ツリーのSHA)"""
+        ref = self.request("GET", f"git/ref/heads/{branch}")
+        commit_sha = ref["object"]["sha"]
+        commit = self.request("GET", f"git/commits/{commit_sha}")
+        return commit_sha, commit["tree"]["sha"]
+
+    def tree_blobs(self, tree_sha, directory):
+        """ツリー内の directory 以下のファイルを {パス: blob SHA} で返す"""
+        # リポジトリ全体を再帰的に取得すると大きくなるため、directory のサブツリーだけを取得
+        subtree_sha = tree_sha
+        for name in directory.strip("/").split("/"):
+            tree = self.request("GET", f"git/trees/{subtree_sha}")
+            entry = next((e for e in tree["tree"] if e["path"] == name and e["type"] == "tree"), None)
+            if entry is None:
+                return {}
+            subtree_sha = entry["sha"]
+
+        tree = self.request("GET", f"git/trees/{subtree_sha}", params={"recursive": "1"})
+        if tree.get("truncated"):
+            raise GitHubAPIError("GET", f"git/trees/{subtree_sha}", 200, "ツリーが大きすぎて取得できません")
+        prefix = directory.strip("/") + "/"
+        return {prefix + e["path"]: e["sha"] for e in tree["tree"] if e["type"] == "blob"}
+
+    def _get_raw_blob(self, sha, stream):
+        response = self.session.request("GET", self._url(f"git/blobs/{sha}"), stream=stream,
+                                        headers={**self.headers, "Accept": RAW_MEDIA_TYPE})
+        if response.status_code != 200:
+            text = response.text
+            response.close()
+            raise GitHubAPIError("GET", f"git/blobs/{sha}", response.status_code, text)
+        return response
+
+    def read_blob(self, sha):
+        """blob の内容（bytes）を取得（小さなファイル用）"""
+        response = self._get_raw_blob(sha, stream=False)
+        content = response.content
+        if git_blob_sha(content) != sha:
+            raise GitHubAPIError("GET", f"git/blobs/{sha}", 200, "blob SHA が一致しません")
+        return content
+
+    def download_blob(self, sha, dest_path):
+        """blob を dest_path に保存（一時ファイルに少しずつ書き込み、SHAを確認してから置き換える）"""
+        directory = os.path.dirname(dest_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".download-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                response = self._get_raw_blob(sha, stream=True)
+                try:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                finally:
+                    response.close()
+            if _file_blob_sha(temp_path) != sha:
+                raise GitHubAPIError("GET", f"git/blobs/{sha}", 200, f"{os.path.basename(dest_path)} の blob SHA が一致しません")
+            # 一時ファイルは所有者のみ読み書きできる権限で作られるため、通常のファイルの権限に合わせる
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp_path, os.stat(dest_path).st_mode & 0o777 if os.path.exists(dest_path) else 0o666 & ~umask)
+            os.replace(temp_path, dest_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def create_blob(self, content):
+        blob = self.request("POST", "git/blobs", expected=(201,), json={
+            "content": base64.b64encode(content).decode("ascii"),
+            "encoding": "base64",
+        })
+        return blob["sha"]
+
+    def create_tree(self, base_tree, entries):
+        return self.request("POST", "git/trees", expected=(201,), json={
+            "base_tree": base_tree,
+            "tree": entries,
+        })["sha"]
+
+    def create_commit(self, message, tree_sha, parent_sha):
+        return self.request("POST", "git/commits", expected=(201,), json={
+            "message": message,
+            "tree": tree_sha,
+            "parents": [parent_sha],
+        })["sha"]
+
+    def update_ref(self, branch, commit_sha):
+        """ブランチの参照を更新（早送りでない場合は GitHubAPIError、status_code は 422）"""
+        self.request("PATCH", f"git/refs/heads/{branch}", json={"sha": commit_sha, "force": False})
+
+
+class PushResult:
+    """プッシュの結果"""
+
+    def __init__(self, commit_sha, uploaded, deleted, unchanged):
+        self.commit_sha = commit_sha  # 作成したコミット（変更がなければ None）
+        self.uploaded = uploaded      # 追加・更新したファイルのパス
+        self.deleted = deleted        # 削除したファイルのパス
+        self.unchanged = unchanged    # 変更がなかったファイルの数
+
+
+def push_files(client, files, message, branch=None, directory="data", progress=None):
+    """files をリモートの directory に1つのコミットとしてプッシュ
+
+    Args:
+        client: GitHubDataClient
+        files: {リポジトリ内のパス: 内容(bytes)}（read_local_files の結果）
+        message: コミットメッセージ
+        branch: ブランチ名（省略時はリポジトリの既定のブランチ）
+        directory: 比較するリモートのディレクトリ
+        progress: 進捗を表示する関数（引数はメッセージ）
+
+    Returns:
+        PushResult
+
+    Raises:
+        GitHubAPIError: APIがエラーを返した場合
+    """
+    report = progress or (lambda text: None)
+    if branch is None:
+        branch = client.default_branch()
+
+    local_shas = {path: git_blob_sha(content) for path, content in files.items()}
+    referenced = _referenced_files(files, directory)
+    uploaded_blobs = set()  # 作り直しの際に同じ blob を再度アップロードしない
+
+    for attempt in range(MAX_PUSH_ATTEMPTS):
+        report("リモートの状態を確認中...")
+        head_sha, tree_sha = client.head_commit(branch)
+        remote_shas = client.tree_blobs(tree_sha, directory)
+
+        changed = sorted(path for path, sha in local_shas.items() if remote_shas.get(path) != sha)
+        deleted = sorted(
+            path for path in remote_shas
+            if path not in local_shas and path not in referenced and path.startswith(PRUNED_DIRECTORIES)
+        )
+        unchanged = len(local_shas) - len(changed)
+        if not changed and not deleted:
+            return PushResult(None, [], [], unchanged)
+
+        entries = []
+        for index, path in enumerate(changed, start=1):
+            sha = local_shas[path]
+            if sha not in uploaded_blobs:
+                report(f"アップロード中 ({index}/{len(changed)}): {os.path.basename(path)}")
+                if client.create_blob(files[path]) != sha:
+                    raise GitHubAPIError("POST", "git/blobs", 201, f"{path} の blob SHA が一致しません")
+                uploaded_blobs.add(sha)
+            entries.append({"path": path, "mode": FILE_MODE, "type": "blob", "sha": sha})
+        for path in deleted:
+            entries.append({"path": path, "mode": FILE_MODE, "type": "blob", "sha": None})
+
+        report("コミットを作成中...")
+        new_tree = client.create_tree(tree_sha, entries)
+        commit_sha = client.create_commit(message, new_tree, head_sha)
+        try:
+            client.update_ref(branch, commit_sha)
+        except GitHubAPIError as e:
+            # 他のプッシュが先に反映された場合は、最新のコミットを親にして作り直す
+            if e.status_code == 422 and attempt + 1 < MAX_PUSH_ATTEMPTS:
+                continue
+            raise
+        return PushResult(commit_sha, changed, deleted, unchanged)
+
+
+class PullResult:
+    """プルの結果"""
+
+    def __init__(self, updated, unchanged, missing):
+        self.updated = updated      # 取得したファイルのパス
+        self.unchanged = unchanged  # ローカルと同じ内容だったファイルのパス
+        self.missing = missing      # リモートに存在しなかったファイルのパス
+
+
+def remote_blobs(client, branch=None, directory="data"):
+    """ブランチの先頭のコミットの directory 以下のファイルを {パス: blob SHA} で返す"""
+    if branch is None:
+        branch = client.default_branch()
+    _, tree_sha = client.head_commit(branch)
+    return client.tree_blobs(tree_sha, directory)
+
+
+def pull_files(client, base_dir, paths, blobs, progress=None, fetch=None):
+    """paths のうちリモートと内容が異なるファイルだけを base_dir 以下に取得
+
+    Args:
+        client: GitHubDataClient
+        base_dir: 保存先の基準ディレクトリ（リポジトリのルートに相当）
+        paths: 取得するファイルのリポジトリ内のパス
+        blobs: リモートのファイル {パス: blob SHA}（remote_blobs の結果）
+        progress: 進捗を表示する関数（引数はメッセージ）
+        fetch: ファイルを独自の方法で取得する関数（引数はパス。True を返せば取得済みとして扱う）
+
+    Returns:
+        PullResult
+
+    Raises:
+        GitHubAPIError: APIがエラーを返した場合
+    """
+    report = progress or (lambda text: None)
+    updated, unchanged, missing = [], [], []
+    for path in paths:
+        sha = blobs.get(path)
+        if sha is None:
+            missing.append(path)
+            continue
+        local_path = os.path.join(base_dir, path.replace("/", os.sep))
+        if local_blob_sha(local_path) == sha:
+            unchanged.append(path)
+            continue
+
+        report(f"取得中: {os.path.basename(path)}")
+        if fetch is None or not fetch(path):
+            client.download_blob(sha, local_path)
+        updated.append(path)
+    return PullResult(updated, unchanged, missing)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+プロファイルのIDの振り直し。
+
+新しいIDはすべてのプロファイルについて先に計算してから一度に書き換えるため、
+書き換えの途中でIDが重複することはなく、並べ替えも不要（プロファイル数に比例する時間で終わる）。
+どちらの関数も変更したIDの対応 {変更前のID: 変更後のID} を返すので、
+IDを参照している他のデータ（変更履歴など）を合わせて更新できる。
+"""
+
+
+def format_id(number):
+    """IDの数値を3桁のゼロ埋め文字列にする（1000以上はそのまま）"""
+    return str(number).zfill(3)
+
+
+def _apply(assignments):
+    """[(プロファイル, 新しいID), ...] を適用し、変更したIDの対応を返す"""
+    mapping = {}
+    for profile, new_id in assignments:
+        old_id = profile.get("id", "")
+        if old_id == new_id:
+            continue
+        # 同じIDのプロファイルが複数あった場合は最初の対応を残す
+        mapping.setdefault(old_id, new_id)
+        profile["id"] = new_id
+    return mapping
+
+
+def renumber_sequential(profiles, start=1):
+    """プロファイルの並び順にIDを start から連番で振り直す
+
+    Returns:
+        dict: {変更前のID: 変更後のID}（IDが変わったプロファイルのみ）
+    """
+    return _apply([(profile, format_id(number)) for number, profile in enumerate(profiles, start=start)])
+
+
+def shift_ids_from(profiles, start_id, exclude=None):
+    """start_id 以降の数値のIDを全て+1する（start_id を空けるため）
+
+    Args:
+        profiles: プロファイルのリスト
+        start_id: ずらし始めるID（例: "002"）
+        exclude: ずらさないプロファイル（start_id に変更するプロファイルなど）
+
+    Returns:
+        dict: {変更前のID: 変更後のID}（start_id が数値でない場合は空）
+    """
+    try:
+        start_num = int(start_id)
+    except (TypeError, ValueError):
+        return {}
+
+    assignments = []
+    for profile in profiles:
+        if profile is exclude:
+            continue
+        try:
+            number = int(profile.get("id", ""))
+        except (TypeError, ValueError):
+            continue
+        if number >= start_num:
+            assignments.append((profile, format_id(number + 1)))
+    return _apply(assignments)
@@ -3,28 +3,19 @@
 profiles.json 内で avatarshopname / profileshopname が空のものを一覧表示するスクリプト。
 """
 
-import json
 import os
 
+from profile_io import load_json
+from profile_validation import MISSING, validate_profiles
+
 
 def list_missing(json_path: str) -> int:
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(json_path)
 
     profiles = data.get("profiles", [])
-    missing = []
-
-    for p in profiles:
-        avatar_missing = not p.get("avatarshopname")
-        download_url = p.get("downloadLocation", "") or ""
-        is_booth = "booth.pm" in download_url
-        # Boothでない配布URLの場合は profileshopname の欠落は無視
-        profile_missing = (not p.get("profileshopname")) and is_booth
-        if avatar_missing or profile_missing:
-            missing.append({
-                "avatarNameUrl": p.get("avatarNameUrl"),
-                "downloadLocation": p.get("downloadLocation"),
-            })
+    # Boothでない配布URLの場合は profileshopname の欠落は無視（profile_validation の条件付き必須）
+    report = validate_profiles(profiles, fields=("avatarshopname", "profileshopname"), kinds=(MISSING,))
+    missing = [profiles[result["index"]] for result in report["profiles"]]
 
     if not missing:
         print("すべてのショップ名が埋まっています。")
@@ -32,7 +23,7 @@ def list_missing(json_path: str) -> int:
 
     print(f"不足しているプロファイル数: {len(missing)}")
     for m in missing:
-        print(f"avatarUrl={m['avatarNameUrl']}  download={m['downloadLocation']}")
+        print(f"avatarUrl={m.get('avatarNameUrl')}  download={m.get('downloadLocation')}")
     return len(missing)
 
 
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+profiles.json のメンテナンス用コマンド。
+
+fix_pricing.py・fix_date_format.py などの処理を「パス」として指定した順につなげ、
+profiles.json を1回だけ読み込んで、プロファイルごとに全パスを1回の走査で実行する。
+変更内容はプロファイルのID単位のパッチ（profile_patch.py）にまとめ、パッチが空でなければ最後に1回だけ
+書き出し（profile_io.dump_json で一時ファイルに書いてから置き換える）、エディタの保存と同様に
+ソートインデックスと差分フィードも更新する。最後に各パスの変更件数と処理時間を表示する。
+
+パッチはファイルに書き出して、確認してから適用したり、複数の実行結果をまとめて適用したりできる。
+
+使い方:
+    python scripts/mochifitter.py fix-pricing fix-dates list-missing
+    python scripts/mochifitter.py --dry-run fill-price   # 書き出さずに確認
+    python scripts/mochifitter.py --dry-run --patch-out price.patch.json fill-price   # パッチだけ書き出す
+    python scripts/mochifitter.py --apply-patch price.patch.json shop.patch.json      # パッチをまとめて適用
+    python scripts/mochifitter.py --list                 # パスの一覧
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+from build_index import write_index
+from delta_feed import publish_delta
+from profile_io import dump_json, load_json, loads
+from profile_model import from_dicts, to_dicts
+from profile_patch import apply_patch, diff_profile, merge_patches
+from profile_validation import REQUIRED_FIELDS, field_label, missing_required_fields
+
+
+def _fix_pricing():
+    from fix_pricing import fix_profile_pricing
+    return fix_profile_pricing, None
+
+
+def _fix_dates():
+    from fix_date_format import fix_profile_dates
+    return fix_profile_dates, None
+
+
+def _add_shopname():
+    from add_shopname_field import add_profile_shopname_fields
+    return add_profile_shopname_fields, None
+
+
+def _fill_price():
+    from fill_price_missing import fill_profile_price, print_not_found
+    return fill_profile_price, print_not_found
+
+
+def _fill_shopname():
+    from fill_shopname import fill_profile_shopnames, print_not_found
+    return fill_profile_shopnames, print_not_found
+
+
+def _list_missing():
+    def list_missing(profile):
+        missing = missing_required_fields(profile)
+        if not missing:
+            return []
+        return [f"{profile.get('id')}: {', '.join(field_label(name) for name in missing)}"]
+    return list_missing, None
+
+
+def _list_shopname():
+    def list_shopname(profile):
+        missing = [name for name in missing_required_fields(profile) if name in ("avatarshopname", "profileshopname")]
+        if not missing:
+            return []
+        return [f"avatarUrl={profile.get('avatarNameUrl')}  download={profile.get('downloadLocation')}"]
+    return list_shopname, None
+
+
+# パス名 → (説明, プロファイルを変更するか, (処理関数, 終了時の関数) を返す関数)
+# 処理関数はプロファイルを1件受け取り、変更・検出した内容のメッセージのリストを返す。
+# 終了時の関数（なければ None）は全プロファイルの処理後に呼ぶ（404だったURLの表示など）。
+# Booth にアクセスするパスの依存ライブラリ（requests など）は、そのパスを使うときだけ読み込む
+PASSES = {
+    "fix-pricing": ("価格区分に合わせて価格を修正（fix_pricing.py）", True, _fix_pricing),
+    "fix-dates": ("登録日・更新日を yyyy-mm-dd に変換（fix_date_format.py）", True, _fix_dates),
+    "add-shopname": ("ショップ名の項目がなければ追加（add_shopname_field.py、Boothにアクセス）", True, _add_shopname),
+    "fill-price": ("空欄のアバター価格を埋める（fill_price_missing.py、Boothにアクセス）", True, _fill_price),
+    "fill-shopname": ("空欄のショップ名を埋める（fill_shopname.py、Boothにアクセス）", True, _fill_shopname),
+    "list-missing": (f"必須項目（{len(REQUIRED_FIELDS)}項目）が未入力のプロファイルを表示（list_missing_required.py）", False, _list_missing),
+    "list-shopname": ("ショップ名が未入力のプロファイルを表示（list_missing_shopname.py）", False, _list_shopname),
+}
+
+
+def load_passes(names):
+    """パスを読み込み、[(パス名, 処理関数, 終了時の関数), ...] を返す"""
+    return [(name, *PASSES[name][2]()) for name in names]
+
+
+def run_passes(profiles, passes, verbose=True, patch=None):
+    """プロファイルごとに load_passes() で読み込んだパスを順に実行する（全プロファイルを1回だけ走査）
+
+    Args:
+        patch: リストを渡すと、プロファイルの変更をパッチの操作（profile_patch.py）として追加する
+
+    Returns:
+        list: [(パス名, メッセージのリスト, 処理時間（秒）), ...]（passes の順）
+    """
+    names = [name for name, _, _ in passes]
+    messages = {name: [] for name in names}
+    elapsed = dict.fromkeys(names, 0.0)
+    track = patch is not None and any(PASSES[name][1] for name in names)
+
+    for profile in profiles:
+        before = dict(profile) if track else None
+        for name, visit, _ in passes:
+            started = time.perf_counter()
+            found = visit(profile)
+            elapsed[name] += time.perf_counter() - started
+            if found:
+                messages[name].extend(found)
+                if verbose:
+                    for message in found:
+                        print(f"[{name}] {message}")
+        if track:
+            patch.extend(diff_profile(before, profile))
+
+    return [(name, messages[name], elapsed[name]) for name in names]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="profiles.json を1回だけ読み込み、指定したパスを順に実行します",
+        epilog="パス: " + ", ".join(PASSES),
+    )
+    parser.add_argument("passes", nargs="*", metavar="PASS", help="実行するパス（指定した順に実行）")
+    parser.add_argument("--list", action="store_true", help="パスの一覧を表示")
+    parser.add_argument("--dry-run", action="store_true", help="変更を書き出さない")
+    parser.add_argument("--quiet", "-q", action="store_true", help="変更内容を1件ずつ表示しない")
+    parser.add_argument("--json-path", help="profiles.json のパス（省略時は data/profiles.json）")
+    parser.add_argument("--patch-out", metavar="FILE", help="変更内容のパッチを書き出す（--dry-run と合わせると profiles.json は変更しない）")
+    parser.add_argument("--apply-patch", nargs="+", default=[], metavar="FILE",
+                        help="パスの実行前にパッチを適用（複数指定するとまとめて適用）")
+    args = parser.parse_args(argv)
+
+    if args.list or not (args.passes or args.apply_patch):
+        for name, (description, modifies, _) in PASSES.items():
+            print(f"{name:15} {description}{'' if modifies else '（表示のみ）'}")
+        return 0
+
+    unknown = [name for name in args.passes if name not in PASSES]
+    if unknown:
+        parser.error(f"不明なパスです: {', '.join(unknown)}")
+
+    json_path = args.json_path
+    if json_path is None:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        json_path = os.path.join(os.path.dirname(script_dir), "data", "profiles.json")
+    if not os.path.exists(json_path):
+        print(f"profiles.json が見つかりません: {json_path}")
+        return 1
+
+    started = time.perf_counter()
+    with open(json_path, "rb") as f:
+        text = f.read()
+    data = loads(text)
+    profiles = data["profiles"] = from_dicts(data.get("profiles", []))
+    load_time = time.perf_counter() - started
+
+    applied = []
+    applied_count = 0
+    if args.apply_patch:
+        try:
+            applied = merge_patches(*(load_json(path) for path in args.apply_patch))
+            applied_count = apply_patch(profiles, applied)
+        except (OSError, ValueError) as e:
+            print(f"パッチを適用できません: {e}")
+            return 1
+        print(f"{len(args.apply_patch)}個のパッチから{applied_count}項目を変更しました")
+
+    patch = []
+    passes = load_passes(args.passes)
+    results = run_passes(profiles, passes, verbose=not args.quiet, patch=patch)
+    changed = applied_count + sum(len(messages) for name, messages, _ in results if PASSES[name][1])
+    patch = merge_patches(applied, patch)
+
+    if args.patch_out:
+        dump_json(args.patch_out, patch)
+
+    write_time = 0.0
+    if patch and not args.dry_run:
+        started = time.perf_counter()
+        data["lastUpdated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S JST")
+        data["profiles"] = to_dicts(profiles)
+        dump_json(json_path, data)
+        # エディタの保存と同様に、Webページ用のソートインデックスと差分フィードを更新
+        data_dir = os.path.dirname(json_path)
+        write_index(data, data_dir)
+        publish_delta(loads(text), data, data_dir)
+        write_time = time.perf_counter() - started
+
+    print()
+    print(f"{len(profiles)}件のプロファイルを処理しました")
+    print(f"  {'読み込み':15} {load_time * 1000:9.1f} ms")
+    for name, messages, elapsed in results:
+        label = "件の変更" if PASSES[name][1] else "件を検出"
+        print(f"  {name:15} {elapsed * 1000:9.1f} ms  {len(messages)}{label}")
+    if patch and not args.dry_run:
+        print(f"  {'書き出し':15} {write_time * 1000:9.1f} ms")
+        print(f"{changed}件の変更を {json_path} に書き出しました")
+    elif patch:
+        print(f"{changed}件の変更があります（--dry-run のため書き出していません）")
+    else:
+        print("変更はありませんでした（profiles.json は書き出していません）")
+    if args.patch_out:
+        print(f"パッチ（{len(patch)}件の操作）を {args.patch_out} に書き出しました")
+
+    for _, _, finish in passes:
+        if finish is not None:
+            finish()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,24 +1,78 @@
 """
 profiles.json編集用GUIツール
 tkinterを使用してprofiles.jsonの編集を簡単に行えるツール
+
+起動を速くするため、画像処理（PIL）・スクレイピング（requests, BeautifulSoup）・
+カレンダー（tkcalendar）は初めて使うときに読み込む。
 """
 
+import time
+
+_STARTUP_STARTED = time.perf_counter()  # 起動時間の計測用
+
 import json
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from tkcalendar import Calendar
 from datetime import datetime
 import os
 import sys
-from PIL import Image, ImageTk
 import io
 import urllib.request
 import subprocess
-import base64
-import requests
 import csv
 import re
-from bs4 import BeautifulSoup
+import threading
+
+from build_index import INDEX_FILENAME, write_index
+from bulk_edit import BULK_BOOL_FIELDS, BULK_TEXT_FIELDS, FALSE_LABEL, TRUE_LABEL, BulkEdit
+from csv_import import plan_csv_import
+from delta_feed import (
+    MANIFEST_FILENAME,
+    apply_delta,
+    feed_files,
+    load_manifest,
+    plan_delta_chain,
+    profiles_digest,
+    prune_feed_files,
+    publish_delta,
+)
+from github_sync import (
+    DEFAULT_API_URL,
+    GitHubDataClient,
+    local_blob_sha,
+    pull_files,
+    push_files,
+    read_local_files,
+    remote_blobs,
+)
+from id_renumber import renumber_sequential, shift_ids_from
+from profile_io import dump_json, load_json
+from profile_validation import (
+    MISSING,
+    VALIDATORS,
+    affected_fields,
+    field_label,
+    missing_required_fields,
+    validate_profile,
+)
+from scrape_prefetch import ScrapePrefetcher
+from search_index import ProfileSearchIndex
+from url_lists import URLListStore
+
+# 検索入力が止まってから一覧を更新するまでの待ち時間（ミリ秒）
+SEARCH_DEBOUNCE_MS = 150
+
+# 後回しにしたパネルを、画面が表示されなかった場合でも構築するまでの待ち時間（ミリ秒）
+DEFERRED_PANEL_TIMEOUT_MS = 1000
+
+# URL調査のブロックリスト・アバターリストの変更をテキストファイルに書き出す間隔（ミリ秒）
+URL_LIST_COMPACT_INTERVAL_MS = 60 * 1000
+
+# URL調査で先読みしてスクレイピングしておくURLの数（調査中のURLを除く）
+INVESTIGATION_PREFETCH_COUNT = 3
+
+# 元に戻せる一括編集の数
+MAX_BULK_EDIT_UNDO = 20
 
 
 def get_app_dir():
@@ -92,15 +146,86 @@ class ProfileEditor:
         # URL調査用
         self.current_investigation_url = ""
         self.current_investigation_id = ""
-        self.block_urls_path = os.path.join(self.app_dir, "data", "Block_URLs.txt")
+        self.url_lists = None  # ブロックリスト・アバターリスト（初めて使うときに読み込む）
+        self.prefetcher = None  # URL一覧の先読み（初めて使うときに作成）
+        # 変更ログはGitHubに送らないよう data の外に置く
+        self.url_lists_log_path = os.path.join(self.app_dir, ".url_lists.log")
+
+        # IDの変更履歴（エディタを閉じても残るよう追記する。GitHubには送らないため data の外に置く）
+        self.id_log_path = os.path.join(self.app_dir, "id_changes.log")
+        self.pending_id_changes = []  # 次のプッシュのコミットメッセージに記録するIDの変更
 
         # 検索用
         self.search_var = None  # setup_uiで作成
+        self._search_after_id = None  # 検索入力のデバウンス用
+        self._tree_rows = {}  # ツリーの行（iid → 表示値）。非表示の行は削除せず detach して再利用する
+        self._tree_profiles = {}  # ツリーの行（iid → プロファイル）
+        self._sorted_profiles = None  # ソート済みプロファイルのキャッシュ（refresh_treeで作り直す）
+        self.search_index = ProfileSearchIndex()  # 正規化済みの検索用文字列とn-gramインデックス
+
+        # GitHub APIの条件付きリクエスト用（URL → (ETag, JSON)）
+        self.github_etags = {}
+
+        # 一括編集（元に戻す用に適用した順に保持）
+        self.bulk_edit_history = []
+
+        # 入力チェックの結果（項目名 → (種類, メッセージ)）。入力された項目だけ検証し直す
+        self.validation_issues = {}
 
+        # 起動時間の計測（項目名 → 起動からの秒数）
+        self._startup_marks = {"モジュール読み込み": time.perf_counter() - _STARTUP_STARTED}
+        self._deferred_panels = []  # 最初の表示の後に構築するパネル（構築関数, 親フレーム）
+
+        # profiles.json の読み込み・解析はUIの構築と並行して行う
+        self.load_data_in_background()
         self.setup_ui()
-        self.load_data()
         # 初期状態ではフィールドを無効化
         self.disable_form_fields()
+        self.mark_startup("画面構築")
+
+        # 画面が表示されたら「操作可能」として記録し、後回しにしたパネルを構築
+        def on_visible(event):
+            self.root.unbind("<Visibility>")
+            self.root.after_idle(lambda: self.mark_startup("操作可能"))
+            self.root.after_idle(self.build_deferred_panels)
+        self.root.bind("<Visibility>", on_visible)
+        self.root.after(DEFERRED_PANEL_TIMEOUT_MS, self.build_deferred_panels)
+
+        # 終了時にブロックリスト・アバターリストの変更を書き出す
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        """ウィンドウを閉じる"""
+        self.compact_url_lists()
+        if self.prefetcher is not None:
+            self.prefetcher.shutdown()
+        self.root.destroy()
+
+    def mark_startup(self, name):
+        """起動時間を記録し、操作可能になるまでとデータ表示までの時間が揃ったら startup.log に追記
+
+        実行ファイル（--windowed）ではコンソールがないため、config.json と同じフォルダのファイルに残す。
+        """
+        if self._startup_marks is None:
+            return
+        self._startup_marks[name] = time.perf_counter() - _STARTUP_STARTED
+        if "操作可能" in self._startup_marks and "データ表示" in self._startup_marks:
+            report = " / ".join(f"{key} {seconds:.2f}秒" for key, seconds in self._startup_marks.items())
+            self._startup_marks = None
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            try:
+                with open(os.path.join(self.app_dir, "startup.log"), "a", encoding="utf-8") as f:
+                    f.write(f"[{timestamp}] 起動時間: {report}\n")
+            except OSError:
+                pass
+            if sys.stdout is not None:
+                print(f"起動時間: {report}")
+
+    def build_deferred_panels(self):
+        """起動時に後回しにしたパネルを構築（一度だけ）"""
+        panels, self._deferred_panels = self._deferred_panels, []
+        for setup, panel in panels:
+            setup(panel)
 
     def setup_ui(self):
         """UIのセットアップ"""
@@ -124,7 +249,7 @@ class ProfileEditor:
 
         ttk.Label(search_frame, text="検索:").pack(side=tk.LEFT, padx=(0, 5))
         self.search_var = tk.StringVar()
-        self.search_var.trace_add("write", lambda *args: self.filter_profiles())
+        self.search_var.trace_add("write", lambda *args: self.schedule_filter())
         search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=30)
         search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
@@ -136,9 +261,12 @@ class ProfileEditor:
         id_reassign_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 5))
 
         ttk.Button(id_reassign_frame, text="ID振り直し", command=self.reassign_ids).pack(side=tk.LEFT, padx=2)
+        ttk.Button(id_reassign_frame, text="一括編集", command=self.open_bulk_edit_dialog).pack(side=tk.LEFT, padx=2)
+        ttk.Button(id_reassign_frame, text="一括編集を元に戻す", command=self.undo_bulk_edit).pack(side=tk.LEFT, padx=2)
 
-        # ツリービュー
-        self.tree = ttk.Treeview(list_frame, columns=("id", "avatar", "author", "profileAuthor"), show="headings", height=20)
+        # ツリービュー（Ctrl/Shift+クリックで複数選択して一括編集できる）
+        self.tree = ttk.Treeview(list_frame, columns=("id", "avatar", "author", "profileAuthor"), show="headings",
+                                 height=20, selectmode="extended")
         self.tree.heading("id", text="ID", command=lambda: self.sort_tree("id"))
         self.tree.heading("avatar", text="アバター名", command=lambda: self.sort_tree("avatar"))
         self.tree.heading("author", text="アバター作者", command=lambda: self.sort_tree("author"))
@@ -159,6 +287,7 @@ class ProfileEditor:
         list_frame.rowconfigure(2, weight=1)
 
         self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<Control-z>", lambda e: self.undo_bulk_edit())
 
         # 中央上部: ツールバー
         toolbar = ttk.Frame(main_frame)
@@ -431,7 +560,8 @@ class ProfileEditor:
         url_investigation_panel = ttk.LabelFrame(right_container, text="URL調査", padding="10")
         url_investigation_panel.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
 
-        self.setup_url_investigation_panel(url_investigation_panel)
+        # 起動時には使わないため、最初の表示の後に構築する
+        self._deferred_panels.append((self.setup_url_investigation_panel, url_investigation_panel))
 
     def add_status_to_frame(self, frame, field_name, always_gray=False):
         """フレームにステータスインジケーターを追加"""
@@ -487,162 +617,190 @@ class ProfileEditor:
         for field_name in self.status_labels.keys():
             self.update_status_color(field_name)
 
-    def update_validation_status(self):
-        """入力状況を更新"""
-        # チェック対象フィールド（必須項目）
-        required_fields = {
-            "id": "ID",
-            "avatarName": "アバター名",
-            "avatarNameUrl": "アバターURL",
-            "profileVersion": "プロファイルバージョン",
-            "avatarAuthor": "アバター作者",
-            "avatarAuthorUrl": "アバター作者URL",
-            "avatarshopname": "アバターショップ名",
-            "profileAuthor": "プロファイル作者",
-            "profileAuthorUrl": "プロファイル作者URL",
-            "profileshopname": "プロファイルショップ名",
-            "downloadMethod": "配布方法",
-            "downloadLocation": "配布場所URL",
-            "imageUrl": "画像URL",
-            "pricing": "価格区分",
-            "price": "プロファイル価格",
-            "avatarPrice": "アバター価格",
-        }
-
-        # downloadLocation/profileshopname は Booth URL のときのみ必須
-        download_url = self.fields.get("downloadLocation").get_value() if self.fields.get("downloadLocation") else ""
-        is_booth_download = "booth.pm" in download_url if download_url else False
-
-        missing_fields = []
-
-        for field_name, display_name in required_fields.items():
-            widget = self.fields.get(field_name)
-            if not widget:
-                continue
-
-            # Booth でない配布URLの場合は profileshopname をスキップ必須判定
-            if field_name == "profileshopname" and not is_booth_download:
-                continue
-            # Booth でない配布URLの場合は downloadLocation もスキップ必須判定
-            if field_name == "downloadLocation" and not is_booth_download:
-                continue
-
-            has_value = False
-
-            if isinstance(widget, tk.Text):
-                has_value = bool(widget.get("1.0", tk.END).strip())
-            elif isinstance(widget, PlaceholderEntry):
-                has_value = bool(widget.get_value())
-            elif isinstance(widget, ttk.Entry):
-                # 無効化されている場合はスキップ
-                if str(widget.cget("state")) == "disabled":
-                    continue
-                has_value = bool(widget.get().strip())
+    def get_form_value(self, field_name):
+        """フォームの項目の値（無効化されている項目は None）"""
+        widget = self.fields.get(field_name)
+        if isinstance(widget, tk.BooleanVar):
+            return widget.get()
+        if isinstance(widget, tk.Text):
+            return widget.get("1.0", tk.END).strip()
+        if isinstance(widget, (ttk.Entry, PlaceholderEntry)):
+            if str(widget.cget("state")) == "disabled":
+                return None
+            return widget.get_value() if isinstance(widget, PlaceholderEntry) else widget.get()
+        return None
 
-            if not has_value:
-                missing_fields.append(f"× {display_name}")
+    def update_validation_status(self, field_name=None):
+        """入力状況を更新
 
-        # 表示更新
-        if missing_fields:
-            self.validation_label.config(text="\n".join(missing_fields), fg="red")
+        field_name を指定した場合は、その項目（と条件が変わる項目）だけ検証し直す。
+        """
+        if field_name is None:
+            fields = [name for name in VALIDATORS if name in self.fields]
+            self.validation_issues = {}
+        else:
+            fields = [name for name in affected_fields(field_name) if name in self.fields]
+            for name in fields:
+                self.validation_issues.pop(name, None)
+
+        # 無効化されている項目は検証しない
+        values = {name: self.get_form_value(name) for name in (*fields, "downloadLocation")}
+        checked = [name for name in fields if values[name] is not None]
+        self.validation_issues.update(validate_profile(values, checked))
+
+        # 表示更新（項目の表示順）
+        lines = []
+        for name in VALIDATORS:
+            if name in self.validation_issues:
+                kind, message = self.validation_issues[name]
+                lines.append(f"× {field_label(name)}" if kind == MISSING else f"△ {field_label(name)}: {message}")
+        if lines:
+            self.validation_label.config(text="\n".join(lines), fg="red")
         else:
             self.validation_label.config(text="✓ 全て入力済み", fg="green")
 
     def bind_field_changes(self):
         """全フィールドの変更を検知するバインドを設定"""
-        def mark_modified(event=None):
+        def mark_modified(field_name):
             self.form_modified = True
-            # 入力状況を更新
-            self.update_validation_status()
+            # 入力された項目の入力状況を更新
+            self.update_validation_status(field_name)
 
         # Entryフィールドにバインド
         for field_name, widget in self.fields.items():
-            if isinstance(widget, ttk.Entry) or isinstance(widget, PlaceholderEntry):
-                widget.bind("<KeyRelease>", mark_modified)
-            elif isinstance(widget, tk.Text):
-                widget.bind("<KeyRelease>", mark_modified)
+            if isinstance(widget, (ttk.Entry, PlaceholderEntry, tk.Text)):
+                widget.bind("<KeyRelease>", lambda event, name=field_name: mark_modified(name))
             elif isinstance(widget, tk.BooleanVar):
                 # チェックボックスは trace で監視
                 widget.trace_add("write", lambda *args: setattr(self, "form_modified", True))
 
+    def read_profiles_file(self):
+        """profiles.json を読み込んで解析（UIに触れないため別スレッドからも呼べる）"""
+        return load_json(self.json_path)
+
     def load_data(self):
         """JSONファイルを読み込み"""
         try:
-            with open(self.json_path, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
-            self.refresh_tree()
-        except FileNotFoundError:
+            data = self.read_profiles_file()
+        except (OSError, ValueError) as e:
+            self.on_data_loaded(None, e)
+        else:
+            self.on_data_loaded(data, None)
+
+    def load_data_in_background(self):
+        """JSONファイルを別スレッドで読み込み、読み込み後に一覧へ反映（起動時用）"""
+        result = {}
+
+        def worker():
+            try:
+                result["data"] = self.read_profiles_file()
+            except (OSError, ValueError) as e:
+                result["error"] = e
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+
+        def wait_for_result():
+            if thread.is_alive():
+                self.root.after(20, wait_for_result)
+                return
+            self.on_data_loaded(result.get("data"), result.get("error"))
+
+        self.root.after(20, wait_for_result)
+
+    def on_data_loaded(self, data, error):
+        """読み込んだデータを一覧に反映（読み込みに失敗した場合は空のデータにする）"""
+        if isinstance(error, FileNotFoundError):
             messagebox.showerror("エラー", f"ファイルが見つかりません: {self.json_path}")
-            self.data = {"lastUpdated": "", "profiles": []}
-        except json.JSONDecodeError as e:
-            messagebox.showerror("エラー", f"JSONの解析に失敗しました: {e}")
-            self.data = {"lastUpdated": "", "profiles": []}
+        elif isinstance(error, json.JSONDecodeError):
+            messagebox.showerror("エラー", f"JSONの解析に失敗しました: {error}")
+        elif error is not None:
+            messagebox.showerror("エラー", f"ファイルの読み込みに失敗しました: {error}")
+        self.data = data if error is None else {"lastUpdated": "", "profiles": []}
+        self.bulk_edit_history = []  # 読み込み前のプロファイルに対する一括編集は元に戻せない
+
+        self.search_index.rebuild(self.data["profiles"])
+        self.refresh_tree()
+        self.mark_startup("データ表示")
 
     def refresh_tree(self):
-        """ツリービューを更新"""
-        if hasattr(self, 'search_var') and self.search_var:
-            # 検索機能が有効な場合はfilter_profilesを使用
-            self.filter_profiles()
-        else:
-            # 初期化中は従来通り
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-
-            if self.data and "profiles" in self.data:
-                # ソート列に応じてソート
-                sorted_profiles = self.get_sorted_profiles()
-                for profile in sorted_profiles:
-                    self.tree.insert("", tk.END, values=(
-                        profile.get("id", ""),
-                        profile.get("avatarName", ""),
-                        profile.get("avatarAuthor", ""),
-                        profile.get("profileAuthor", "")
-                    ))
+        """ツリービューを更新（データを変更した後に呼ぶ。ソート順を計算し直す）"""
+        self._sorted_profiles = None
+        self.filter_profiles()
+
+    def schedule_filter(self):
+        """検索入力が止まってからフィルタリング（1文字ごとに一覧を更新しない）"""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.filter_profiles)
+
+    def _tree_values(self, profile):
+        """ツリーの1行分の表示値"""
+        return (
+            profile.get("id", ""),
+            profile.get("avatarName", ""),
+            profile.get("avatarAuthor", ""),
+            profile.get("profileAuthor", "")
+        )
 
     def filter_profiles(self):
-        """検索キーワードに基づいてプロファイル一覧をフィルタリング"""
-        search_text = self.search_var.get().lower().strip()
+        """検索キーワードに基づいてプロファイル一覧をフィルタリング
 
-        # ツリービューをクリア
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        行はプロファイルIDをiidとして保持し、前回の表示との差分だけを反映する。
+        値が変わった行だけを書き換え、表示する行とその並び順は set_children で一度に入れ替える
+        （表示しない行は detach され、次に表示するときに再利用される）。
+        """
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+            self._search_after_id = None
 
         if not self.data or "profiles" not in self.data:
             return
 
-        # ソート済みプロファイルを取得
-        sorted_profiles = self.get_sorted_profiles()
+        # 検索インデックスで一致するプロファイルを取得（大文字小文字・全角半角・カタカナひらがなを区別しない）
+        self.search_index.sync(self.data["profiles"])
+        matches = self.search_index.search(self.search_var.get() if self.search_var else "")
+
+        # ソート済みプロファイルを取得（データが変わるまで再ソートしない）
+        if self._sorted_profiles is None:
+            self._sorted_profiles = self.get_sorted_profiles()
+
+        visible = []
+        used = {""}  # "" はツリーのルートのため使わない
+        profiles_by_iid = {}
+        for profile in self._sorted_profiles:
+            iid = str(profile.get("id", ""))
+            # IDが重複・空の場合も行を区別する
+            if iid in used:
+                suffix = 2
+                while f"{iid}#{suffix}" in used:
+                    suffix += 1
+                iid = f"{iid}#{suffix}"
+            used.add(iid)
+            profiles_by_iid[iid] = profile
+
+            values = self._tree_values(profile)
+            if iid not in self._tree_rows:
+                self.tree.insert("", tk.END, iid=iid, values=values)
+                self._tree_rows[iid] = values
+            elif self._tree_rows[iid] != values:
+                self.tree.item(iid, values=values)
+                self._tree_rows[iid] = values
 
-        # 検索フィルタ適用
-        for profile in sorted_profiles:
             # 検索テキストが空なら全て表示
-            if not search_text:
-                self.tree.insert("", tk.END, values=(
-                    profile.get("id", ""),
-                    profile.get("avatarName", ""),
-                    profile.get("avatarAuthor", ""),
-                    profile.get("profileAuthor", "")
-                ))
-                continue
+            if matches is None or id(profile) in matches:
+                visible.append(iid)
 
-            # 各フィールドを検索
-            id_match = search_text in profile.get("id", "").lower()
-            name_match = search_text in profile.get("avatarName", "").lower()
-            author_match = search_text in profile.get("avatarAuthor", "").lower()
-            profile_author_match = search_text in profile.get("profileAuthor", "").lower()
-            note_match = search_text in profile.get("notes", "").lower()
-            body_base_match = search_text in profile.get("bodyBase", "").lower()
-            avatar_url_match = search_text in profile.get("avatarNameUrl", "").lower()
-            download_url_match = search_text in profile.get("downloadLocation", "").lower()
-
-            # いずれかにマッチすれば表示
-            if id_match or name_match or author_match or profile_author_match or note_match or body_base_match or avatar_url_match or download_url_match:
-                self.tree.insert("", tk.END, values=(
-                    profile.get("id", ""),
-                    profile.get("avatarName", ""),
-                    profile.get("avatarAuthor", ""),
-                    profile.get("profileAuthor", "")
-                ))
+        # 削除・ID変更で対応するプロファイルがなくなった行を削除
+        stale = [iid for iid in self._tree_rows if iid not in used]
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                del self._tree_rows[iid]
+
+        self._tree_profiles = profiles_by_iid
+        if tuple(visible) != self.tree.get_children():
+            self.tree.set_children("", *visible)
 
     def clear_search(self):
         """検索をクリアして全件表示"""
@@ -690,6 +848,9 @@ class ProfileEditor:
         print(f"selection: {selection}")  # デバッグ用
         if not selection:
             return
+        # 複数選択中（一括編集用）はフォームの表示を変えない
+        if len(selection) > 1:
+            return
 
         item = self.tree.item(selection[0])
         values = item["values"]
@@ -743,16 +904,10 @@ class ProfileEditor:
         if not target:
             return False
 
-        # ツリーの選択を更新
-        for item_id in self.tree.get_children():
-            values = self.tree.item(item_id)["values"]
-            if not values:
-                continue
-            vid = str(values[0]).zfill(3) if isinstance(values[0], int) else str(values[0])
-            if vid == profile_id:
-                self.tree.selection_set(item_id)
-                self.tree.see(item_id)
-                break
+        # ツリーの選択を更新（行のiidはプロファイルID、検索で非表示の行は選択しない）
+        if target.get("id") in self.tree.get_children():
+            self.tree.selection_set(target["id"])
+            self.tree.see(target["id"])
 
         self.current_selection = target
         self.load_profile_to_form(target)
@@ -888,6 +1043,8 @@ class ProfileEditor:
             return
 
         try:
+            from PIL import Image, ImageTk  # 初めてプレビューするときに読み込む
+
             # URLから画像をダウンロード
             with urllib.request.urlopen(image_url) as response:
                 image_data = response.read()
@@ -913,6 +1070,8 @@ class ProfileEditor:
 
     def open_calendar(self, field_name):
         """カレンダーダイアログを開く"""
+        from tkcalendar import Calendar  # 初めて使うときに読み込む
+
         cal_window = tk.Toplevel(self.root)
         cal_window.title("日付を選択")
         cal_window.geometry("300x350")
@@ -1014,9 +1173,159 @@ class ProfileEditor:
             elif isinstance(widget, ttk.Entry):
                 self.current_selection[field_name] = widget.get()
 
+        self.search_index.update(self.current_selection)
         self.refresh_tree()
         self.form_modified = False  # 適用後は未編集状態に
 
+    def get_selected_profiles(self):
+        """ツリーで選択中（表示中の行のみ）のプロファイルのリスト"""
+        visible = set(self.tree.get_children())
+        return [self._tree_profiles[iid] for iid in self.tree.selection()
+                if iid in visible and iid in self._tree_profiles]
+
+    def open_bulk_edit_dialog(self):
+        """選択中のプロファイルに値の設定・置換をまとめて適用するダイアログを開く"""
+        profiles = self.get_selected_profiles()
+        if not profiles:
+            messagebox.showwarning("警告", "一括編集するプロファイルを選択してください\n（Ctrl/Shift+クリックで複数選択できます）")
+            return
+        if self.form_modified and self.current_selection:
+            if not messagebox.askyesno("確認", "未保存の変更があります。破棄しますか?"):
+                return
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("一括編集")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        ttk.Label(dialog, text=f"選択中のプロファイル: {len(profiles)}件").pack(anchor=tk.W, padx=10, pady=(10, 5))
+
+        field_names = {label: name for label, name in BULK_TEXT_FIELDS + BULK_BOOL_FIELDS}
+        bool_labels = {label for label, _ in BULK_BOOL_FIELDS}
+
+        # 値の設定（行を追加して複数の項目に設定できる）
+        assign_frame = ttk.LabelFrame(dialog, text="値を設定", padding="10")
+        assign_frame.pack(fill=tk.X, padx=10, pady=5)
+        assign_rows_frame = ttk.Frame(assign_frame)
+        assign_rows_frame.pack(fill=tk.X)
+        assign_rows_frame.columnconfigure(1, weight=1)
+        assign_rows = []  # [(項目のCombobox, 値のCombobox), ...]
+
+        def on_field_selected(field_box, value_box):
+            # チェックボックスの項目は「はい/いいえ」から選ぶ
+            if field_box.get() in bool_labels:
+                value_box.config(values=(TRUE_LABEL, FALSE_LABEL), state="readonly")
+                value_box.set(TRUE_LABEL)
+            else:
+                value_box.config(values=(), state="normal")
+                if value_box.get() in (TRUE_LABEL, FALSE_LABEL):
+                    value_box.set("")
+
+        def add_assign_row():
+            row = len(assign_rows)
+            field_box = ttk.Combobox(assign_rows_frame, values=list(field_names), state="readonly", width=22)
+            field_box.grid(row=row, column=0, sticky=tk.W, padx=(0, 5), pady=2)
+            value_box = ttk.Combobox(assign_rows_frame, width=40)
+            value_box.grid(row=row, column=1, sticky=(tk.W, tk.E), pady=2)
+            field_box.bind("<<ComboboxSelected>>", lambda e: on_field_selected(field_box, value_box))
+            assign_rows.append((field_box, value_box))
+
+        add_assign_row()
+        ttk.Button(assign_frame, text="項目を追加", command=add_assign_row).pack(anchor=tk.W, pady=(5, 0))
+
+        # 置換
+        all_text_fields_label = "（すべての文字列の項目）"
+        replace_frame = ttk.LabelFrame(dialog, text="置換", padding="10")
+        replace_frame.pack(fill=tk.X, padx=10, pady=5)
+        replace_frame.columnconfigure(1, weight=1)
+
+        ttk.Label(replace_frame, text="項目").grid(row=0, column=0, sticky=tk.W, pady=2)
+        replace_field_box = ttk.Combobox(replace_frame, state="readonly", width=22,
+                                         values=[all_text_fields_label] + [label for label, _ in BULK_TEXT_FIELDS])
+        replace_field_box.set(all_text_fields_label)
+        replace_field_box.grid(row=0, column=1, sticky=tk.W, padx=(5, 0), pady=2)
+        ttk.Label(replace_frame, text="検索").grid(row=1, column=0, sticky=tk.W, pady=2)
+        find_entry = ttk.Entry(replace_frame, width=40)
+        find_entry.grid(row=1, column=1, sticky=(tk.W, tk.E), padx=(5, 0), pady=2)
+        ttk.Label(replace_frame, text="置換後").grid(row=2, column=0, sticky=tk.W, pady=2)
+        replace_entry = ttk.Entry(replace_frame, width=40)
+        replace_entry.grid(row=2, column=1, sticky=(tk.W, tk.E), padx=(5, 0), pady=2)
+
+        ttk.Label(dialog, text="※値が変わったプロファイルの更新日は現在の日時になります",
+                  font=("", 8), foreground="gray").pack(anchor=tk.W, padx=10)
+
+        def apply():
+            assignments = {}
+            for field_box, value_box in assign_rows:
+                if field_box.get():
+                    assignments[field_names[field_box.get()]] = value_box.get()
+
+            replacements = []
+            if find_entry.get():
+                label = replace_field_box.get()
+                field = None if label == all_text_fields_label else field_names[label]
+                replacements.append((field, find_entry.get(), replace_entry.get()))
+
+            try:
+                bulk_edit = BulkEdit(assignments, replacements)
+            except ValueError as e:
+                messagebox.showerror("エラー", str(e), parent=dialog)
+                return
+            if bulk_edit.is_empty():
+                messagebox.showwarning("警告", "設定する項目か置換する文字列を入力してください", parent=dialog)
+                return
+
+            dialog.destroy()
+            self.apply_bulk_edit(bulk_edit, profiles)
+
+        button_frame = ttk.Frame(dialog)
+        button_frame.pack(pady=10)
+        ttk.Button(button_frame, text="適用", command=apply).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="キャンセル", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+
+    def apply_bulk_edit(self, bulk_edit, profiles):
+        """一括編集を適用し、一覧を一度だけ更新"""
+        changed = bulk_edit.apply(profiles)
+        if not changed:
+            messagebox.showinfo("一括編集", "値が変わるプロファイルはありませんでした")
+            return
+
+        self.bulk_edit_history.append(bulk_edit)
+        del self.bulk_edit_history[:-MAX_BULK_EDIT_UNDO]
+        self.on_profiles_changed(changed)
+
+        message = f"{len(changed)}件のプロファイルを更新しました。"
+        incomplete = [str(profile.get("id", "")) for profile in changed if missing_required_fields(profile)]
+        if incomplete:
+            shown = ", ".join(incomplete[:20]) + (" ..." if len(incomplete) > 20 else "")
+            message += f"\n\n入力が不足しているプロファイル: {len(incomplete)}件\n{shown}"
+        message += "\n\n変更を保存するには「保存」ボタンをクリックしてください。"
+        messagebox.showinfo("一括編集", message)
+
+    def undo_bulk_edit(self):
+        """直前の一括編集を元に戻す"""
+        if not self.bulk_edit_history:
+            messagebox.showinfo("一括編集", "元に戻せる一括編集はありません")
+            return
+        if self.form_modified and self.current_selection:
+            if not messagebox.askyesno("確認", "未保存の変更があります。破棄しますか?"):
+                return
+
+        restored = self.bulk_edit_history.pop().undo()
+        self.on_profiles_changed(restored)
+        messagebox.showinfo("一括編集", f"{len(restored)}件のプロファイルを一括編集の前の状態に戻しました")
+
+    def on_profiles_changed(self, profiles):
+        """複数のプロファイルを書き換えた後に、検索インデックス・一覧・フォームを更新"""
+        for profile in profiles:
+            self.search_index.update(profile)
+        self.refresh_tree()
+
+        # 編集中のプロファイルが含まれていればフォームを読み込み直す
+        if any(profile is self.current_selection for profile in profiles):
+            self.load_profile_to_form(self.current_selection)
+            self.form_modified = False
+
     def find_next_available_id(self):
         """空いている最も若いIDを見つける"""
         existing_ids = set()
@@ -1110,7 +1419,10 @@ class ProfileEditor:
         self.form_modified = False
 
     def import_csv(self):
-        """CSVファイルからプロファイルをインポート"""
+        """CSVファイルからプロファイルをインポート
+
+        CSVを読み込んで追加・更新・エラーの一覧を表示し（ドライラン）、確認後にまとめて適用する。
+        """
         # CSVファイルを選択
         csv_path = filedialog.askopenfilename(
             title="CSVファイルを選択",
@@ -1121,98 +1433,49 @@ class ProfileEditor:
             return
 
         try:
-            imported_count = 0
-            updated_count = 0
-            error_count = 0
-            error_messages = []
-
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-
-                for row_num, row in enumerate(reader, start=2):  # ヘッダーが1行目なので2から
-                    try:
-                        # IDの処理
-                        csv_id = row.get('id', '').strip()
-
-                        if csv_id:
-                            # IDが指定されている場合、既存レコードを検索
-                            existing_profile = None
-                            for profile in self.data["profiles"]:
-                                if profile.get("id") == csv_id:
-                                    existing_profile = profile
-                                    break
-
-                            if existing_profile:
-                                # 既存レコードを更新
-                                profile_data = existing_profile
-                                updated_count += 1
-                                # 更新日のみ今日の日付と時刻に
-                                profile_data["updatedDate"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            else:
-                                # 指定されたIDで新規追加
-                                profile_data = {"id": csv_id}
-                                self.data["profiles"].append(profile_data)
-                                imported_count += 1
-                                # 新規の場合は登録日・更新日を今日に
-                                now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                                profile_data["registeredDate"] = now
-                                profile_data["updatedDate"] = now
-                        else:
-                            # IDが空の場合、自動採番で新規追加
-                            new_id = self.find_next_available_id()
-                            profile_data = {"id": new_id}
-                            self.data["profiles"].append(profile_data)
-                            imported_count += 1
-                            # 新規の場合は登録日・更新日を今日に
-                            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            profile_data["registeredDate"] = now
-                            profile_data["updatedDate"] = now
-
-                        # 各フィールドを設定
-                        for field_name in ["avatarName", "avatarNameUrl", "profileVersion",
-                                          "avatarAuthor", "avatarAuthorUrl", "bodyBase", "profileAuthor",
-                                          "profileAuthorUrl", "downloadMethod", "downloadLocation",
-                                          "imageUrl", "pricing", "price", "notes"]:
-                            if field_name in row:
-                                profile_data[field_name] = row[field_name].strip()
-
-                        # 日付フィールド（CSVに値があればそれを使用、なければ既存値を維持）
-                        if not csv_id or not existing_profile:
-                            # 新規追加の場合は上で設定済み
-                            pass
-                        else:
-                            # 更新の場合、CSVに日付があればそれを使用
-                            if "registeredDate" in row and row["registeredDate"].strip():
-                                profile_data["registeredDate"] = row["registeredDate"].strip()
-                            if "updatedDate" in row and row["updatedDate"].strip():
-                                profile_data["updatedDate"] = row["updatedDate"].strip()
-
-                        # Boolean型フィールド
-                        for field_name in ["official", "forwardSupport", "reverseSupport"]:
-                            if field_name in row:
-                                value = row[field_name].strip().lower()
-                                profile_data[field_name] = value in ["true", "1", "yes", "TRUE", "True"]
-
-                    except Exception as e:
-                        error_count += 1
-                        error_messages.append(f"行{row_num}: {str(e)[:50]}")
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+                plan = plan_csv_import(self.data["profiles"], f, now)
+        except Exception as e:
+            messagebox.showerror("エラー", f"CSVファイルの読み込みに失敗しました:\n{str(e)}")
+            return
 
-            # インポート完了メッセージ
-            self.refresh_tree()
+        self.show_import_preview(plan)
 
-            message = f"インポート完了\n\n"
-            message += f"新規追加: {imported_count}件\n"
-            message += f"更新: {updated_count}件\n"
-            if error_count > 0:
-                message += f"エラー: {error_count}件\n\n"
-                message += "エラー詳細:\n" + "\n".join(error_messages[:5])
-                if len(error_messages) > 5:
-                    message += f"\n... 他 {len(error_messages) - 5}件"
+    def show_import_preview(self, plan):
+        """CSVインポートの内容を表示し、確認後に適用する"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("CSVインポートの確認")
+        dialog.geometry("700x500")
+        dialog.transient(self.root)
+        dialog.grab_set()
 
-            messagebox.showinfo("インポート完了", message)
+        summary = (f"新規追加: {len(plan.added)}件　更新: {len(plan.updated)}件　"
+                   f"変更なし: {plan.unchanged}件　エラー: {len(plan.errors)}件")
+        ttk.Label(dialog, text=summary).pack(anchor=tk.W, padx=10, pady=(10, 5))
+        if plan.errors:
+            ttk.Label(dialog, text="※エラーの行はインポートされません", font=("", 8),
+                      foreground="gray").pack(anchor=tk.W, padx=10)
 
-        except Exception as e:
-            messagebox.showerror("エラー", f"CSVファイルの読み込みに失敗しました:\n{str(e)}")
+        from tkinter import scrolledtext
+        details = scrolledtext.ScrolledText(dialog, wrap=tk.NONE, height=20)
+        details.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        details.insert("1.0", "\n".join(plan.summary_lines()))
+        details.config(state="disabled")
+
+        def apply():
+            dialog.destroy()
+            self.on_profiles_changed(plan.apply(self.data["profiles"]))
+            messagebox.showinfo("インポート完了",
+                                f"インポート完了\n\n新規追加: {len(plan.added)}件\n更新: {len(plan.updated)}件")
+
+        button_frame = ttk.Frame(dialog)
+        button_frame.pack(pady=10)
+        import_button = ttk.Button(button_frame, text="インポート", command=apply)
+        import_button.pack(side=tk.LEFT, padx=5)
+        if not plan.has_changes():
+            import_button.config(state="disabled")
+        ttk.Button(button_frame, text="キャンセル", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
 
     def fetch_from_url(self):
         """URLから情報を取得してフォームに自動入力"""
@@ -1229,15 +1492,12 @@ class ProfileEditor:
             return
 
         try:
-            # URL調整を実行
-            adjusted_url = self.adjust_booth_url(url)
+            # URL調整とスクレイピングを実行（URL調査で先読み済みならその結果を使う）
+            adjusted_url, data = self.scrape_booth_with_prefetch(url)
             
             # 調整後のURLをフィールドに反映
             if adjusted_url != url:
                 self.fields["avatarNameUrl"].set_value(adjusted_url)
-            
-            # スクレイピング実行（調整後のURLで）
-            data = self.scrape_booth(adjusted_url)
 
             if data:
                 # フォームに自動入力
@@ -1300,15 +1560,12 @@ class ProfileEditor:
             return
 
         try:
-            # URL調整を実行
-            adjusted_url = self.adjust_booth_url(url)
+            # URL調整とスクレイピングを実行（URL調査で先読み済みならその結果を使う）
+            adjusted_url, data = self.scrape_booth_with_prefetch(url)
             
             # 調整後のURLをフィールドに反映
             if adjusted_url != url:
                 self.fields["downloadLocation"].set_value(adjusted_url)
-            
-            # スクレイピング実行（調整後のURLで）
-            data = self.scrape_booth(adjusted_url)
 
             if data:
                 # プロファイル作者情報を自動入力
@@ -1328,6 +1585,35 @@ class ProfileEditor:
         except Exception as e:
             messagebox.showerror("エラー", f"取得中にエラーが発生しました:\n{str(e)}")
 
+    def scrape_booth_url(self, url):
+        """URLを調整してスクレイピング（UIに触れないため先読みのスレッドからも呼べる）
+
+        Returns:
+            tuple: (調整後のURL, scrape_booth の結果)
+        """
+        adjusted_url = self.adjust_booth_url(url)
+        return adjusted_url, self.scrape_booth(adjusted_url)
+
+    def scrape_booth_with_prefetch(self, url):
+        """先読み済みの結果があれば使い、なければその場でスクレイピング"""
+        if self.prefetcher is not None:
+            result = self.prefetcher.get(url)
+            if result is not None:
+                return result
+        return self.scrape_booth_url(url)
+
+    def prefetch_investigation_urls(self):
+        """調査中のURLとURL一覧の先頭から数件を別スレッドで先読み"""
+        lines = self.url_list_text.get("1.0", tk.END).strip().split("\n")
+        candidates = [self.current_investigation_url] + [line.strip() for line in lines[:INVESTIGATION_PREFETCH_COUNT]]
+        # IDの行（3桁の数字）やBooth以外のURLは対象外
+        urls = [url for url in candidates if "booth.pm" in url]
+        if not urls:
+            return
+        if self.prefetcher is None:
+            self.prefetcher = ScrapePrefetcher(self.scrape_booth_url)
+        self.prefetcher.prefetch(urls)
+
     def adjust_booth_url(self, url):
         """
         BoothのURLを正規化（ショップ名付き形式に変換）
@@ -1349,6 +1635,9 @@ class ProfileEditor:
         
         item_id = match.group(1)
         
+        import requests
+        from bs4 import BeautifulSoup
+
         try:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -1373,6 +1662,9 @@ class ProfileEditor:
 
     def scrape_booth(self, url):
         """BoothページからHTMLをパース"""
+        import requests  # スクレイピングは初めて使うときに読み込む
+        from bs4 import BeautifulSoup
+
         try:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -1650,46 +1942,60 @@ class ProfileEditor:
             if result is None:  # キャンセル
                 pass  # そのまま編集を続ける
             elif result:  # はい - 自動調整
-                self.adjust_ids_from(new_id)
-                self.current_selection["id"] = new_id
+                mapping = self.adjust_ids_from(new_id)
+                self.search_index.rebuild(self.data["profiles"])
                 self.refresh_tree()
-                messagebox.showinfo("完了", f"ID {new_id} 以降のIDをずらしました")
+                messagebox.showinfo("完了", f"ID {new_id} 以降のIDをずらしました\n\n{self.format_id_mapping(mapping)}")
             else:  # いいえ - 元に戻す
                 self.fields["id"].delete(0, tk.END)
                 self.fields["id"].insert(0, old_id)
 
     def adjust_ids_from(self, start_id):
-        """指定されたID以降のIDを全て+1する
+        """指定されたID以降のIDを全て+1し、選択中のプロファイルのIDを start_id にする
 
         Args:
             start_id: 調整開始ID（例: "002"）
-        """
-        try:
-            start_num = int(start_id)
-        except ValueError:
-            return
 
-        # start_id以降のプロファイルを取得
-        profiles_to_adjust = []
-        for profile in self.data["profiles"]:
-            try:
-                profile_num = int(profile.get("id", "0"))
-                if profile_num >= start_num:
-                    profiles_to_adjust.append(profile)
-            except ValueError:
-                continue
-
-        # IDの大きい順にソート（後ろから処理して重複を避ける）
-        profiles_to_adjust.sort(key=lambda p: int(p.get("id", "0")), reverse=True)
+        Returns:
+            dict: {変更前のID: 変更後のID}（選択中のプロファイルの変更を含む）
+        """
+        mapping = shift_ids_from(self.data["profiles"], start_id, exclude=self.current_selection)
+        if self.current_selection is not None:
+            old_id = self.current_selection.get("id", "")
+            if old_id != start_id:
+                mapping.setdefault(old_id, start_id)
+                self.current_selection["id"] = start_id
+        self.log_id_mapping(mapping, f"ID {start_id} 以降をずらす")
+        return mapping
+
+    def log_id_mapping(self, mapping, reason):
+        """IDの変更を id_changes.log に追記し、次のプッシュのコミットメッセージ用に保持
 
-        # IDを+1
-        for profile in profiles_to_adjust:
-            old_id = profile.get("id", "")
-            try:
-                new_id = str(int(old_id) + 1).zfill(3)
-                profile["id"] = new_id
-            except ValueError:
-                continue
+        Args:
+            mapping: {変更前のID: 変更後のID}
+            reason: 変更の操作（ログに記録する）
+        """
+        if not mapping:
+            return
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        lines = [f"{old_id} -> {new_id}" for old_id, new_id in mapping.items()]
+        for line in lines:
+            print(f"[ID] {line}")
+        self.pending_id_changes.extend(lines)
+        try:
+            with open(self.id_log_path, "a", encoding="utf-8") as f:
+                f.write(f"[{timestamp}] {reason}（{len(lines)}件）\n")
+                f.writelines(f"  {line}\n" for line in lines)
+        except OSError as e:
+            print(f"IDの変更履歴を書き込めませんでした: {e}")
+
+    def format_id_mapping(self, mapping, limit=10):
+        """IDの変更をダイアログ用の文字列にする（limit 件まで）"""
+        lines = [f"{old_id} → {new_id}" for old_id, new_id in list(mapping.items())[:limit]]
+        if len(mapping) > limit:
+            lines.append(f"…ほか{len(mapping) - limit}件")
+        lines.append(f"（変更履歴: {os.path.basename(self.id_log_path)}）")
+        return "\n".join(lines)
 
     def reassign_ids(self):
         """現在のツリービュー順序に基づいてIDを001から順に振り直す"""
@@ -1703,60 +2009,35 @@ class ProfileEditor:
         if not result:
             return
 
-        tree_items = self.tree.get_children()
+        # 表示中の行の順に並べ、検索で非表示の行はその後ろに一覧の順で続ける
+        visible = [self._tree_profiles[iid] for iid in self.tree.get_children()]
 
-        if not tree_items:
+        if not visible:
             messagebox.showwarning("警告", "振り直すレコードがありません")
             return
 
-        id_changes = []
-
-        # 新しいIDを001から順に割り当て
-        for index, tree_item in enumerate(tree_items, start=1):
-            new_id = str(index).zfill(3)
-
-            item_values = self.tree.item(tree_item)["values"]
-            old_id = str(item_values[0]).zfill(3) if isinstance(item_values[0], int) else item_values[0]
-
-            # データ内のIDを更新
-            for profile in self.data["profiles"]:
-                if profile.get("id") == old_id:
-                    profile["id"] = new_id
-                    id_changes.append(f"{old_id} -> {new_id}")
-                    break
-
-            # ツリービューを更新
-            self.tree.item(tree_item, values=(
-                new_id,
-                item_values[1],
-                item_values[2],
-                item_values[3]
-            ))
-
-        # データの順序を更新
-        tree_items = self.tree.get_children()
-        new_profiles_order = []
-
-        for tree_item in tree_items:
-            item_values = self.tree.item(tree_item)["values"]
-            profile_id = str(item_values[0]).zfill(3) if isinstance(item_values[0], int) else item_values[0]
-
-            for profile in self.data["profiles"]:
-                if profile.get("id") == profile_id:
-                    new_profiles_order.append(profile)
-                    break
-
-        self.data["profiles"] = new_profiles_order
+        visible_ids = {id(profile) for profile in visible}
+        ordered = visible + [profile for profile in self.get_sorted_profiles() if id(profile) not in visible_ids]
+        mapping = renumber_sequential(ordered)
+        self.data["profiles"] = ordered
+        self.log_id_mapping(mapping, "表示順でIDを振り直し")
 
         # 選択中プロファイルのIDフィールドを更新
         if self.current_selection:
             self.fields["id"].delete(0, tk.END)
             self.fields["id"].insert(0, self.current_selection.get("id", ""))
 
+        # 行のiid（振り直し前のID）と表示値を振り直し後のIDに合わせる
+        self.search_index.rebuild(self.data["profiles"])
+        self.tree.delete(*self._tree_rows)
+        self._tree_rows = {}
+        self.refresh_tree()
+
         messagebox.showinfo(
             "完了",
             f"IDの振り直しが完了しました。\n"
-            f"{len(id_changes)}件のレコードを更新しました。\n\n"
+            f"{len(mapping)}件のレコードを更新しました。\n\n"
+            f"{self.format_id_mapping(mapping)}\n\n"
             f"変更を保存するには「保存」ボタンをクリックしてください。"
         )
 
@@ -1798,7 +2079,7 @@ class ProfileEditor:
             return None
 
     def auto_git_push_api(self):
-        """GitHub API経由でdata以下のすべてのファイルを更新（Git CLI不要）"""
+        """GitHub API経由でdata以下の変更されたファイルを1つのコミットでプッシュ（Git CLI不要）"""
         # 設定を読み込み
         config = self.load_config()
         if not config:
@@ -1819,6 +2100,10 @@ class ProfileEditor:
 
         progress_window.update()
 
+        def show_progress(text):
+            status_label.config(text=text)
+            progress_window.update()
+
         try:
             github_token = config["github_token"]
 
@@ -1827,96 +2112,42 @@ class ProfileEditor:
             # "https://github.com/owner/repo.git" から "owner/repo" を抽出
             repo_path = repo_url.replace("https://github.com/", "").replace(".git", "")
 
-            headers = {
-                "Authorization": f"token {github_token}",
-                "Accept": "application/vnd.github.v3+json"
-            }
-
-            # dataディレクトリ内のすべてのファイルを取得
-            data_dir = os.path.join(self.app_dir, "data")
-            data_files = []
-            for root, dirs, files in os.walk(data_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    # dataディレクトリからの相対パスを取得
-                    rel_path = os.path.relpath(file_path, self.app_dir)
-                    data_files.append((rel_path, file_path))
-
-            if not data_files:
+            # ブロックリスト・アバターリストの変更を書き出し、ソートインデックスを profiles.json から作り直してから
+            # （保存せずにプッシュした場合に古いインデックスを送らないため）、dataディレクトリ内のすべてのファイルを取得
+            self.compact_url_lists()
+            if os.path.exists(self.json_path):
+                write_index(load_json(self.json_path), os.path.dirname(self.json_path))
+            files = read_local_files(self.app_dir, "data")
+            if not files:
                 progress_window.destroy()
                 messagebox.showwarning("警告", "dataディレクトリにファイルが見つかりません")
                 return False
 
-            # 各ファイルを更新
-            updated_count = 0
-            failed_files = []
-
-            for rel_path, file_path in data_files:
-                try:
-                    status_label.config(text=f"処理中: {os.path.basename(file_path)}")
-                    progress_window.update()
-
-                    # ファイルの内容を読み込み
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-
-                    # GitHub APIのエンドポイント
-                    api_url = f"https://api.github.com/repos/{repo_path}/contents/{rel_path.replace(os.sep, '/')}"
-
-                    # 現在のファイル情報を取得（SHAが必要）
-                    response = requests.get(api_url, headers=headers)
-                    if response.status_code == 200:
-                        current_file = response.json()
-                        sha = current_file["sha"]
-                    elif response.status_code == 404:
-                        # ファイルが存在しない場合は新規作成
-                        sha = None
-                    else:
-                        failed_files.append(f"{rel_path}: {response.status_code}")
-                        continue
-
-                    # ファイルを更新
-                    content_base64 = base64.b64encode(content.encode('utf-8')).decode('utf-8')
-
-                    data = {
-                        "message": f"Update {os.path.basename(rel_path)} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                        "content": content_base64
-                    }
-
-                    if sha:
-                        data["sha"] = sha
-
-                    response = requests.put(api_url, headers=headers, json=data)
-
-                    if response.status_code in [200, 201]:
-                        updated_count += 1
-                    else:
-                        failed_files.append(f"{rel_path}: {response.status_code} - {response.text[:100]}")
-
-                except Exception as e:
-                    failed_files.append(f"{rel_path}: {str(e)[:100]}")
+            # 内容が変わったファイルだけをアップロードし、1つのコミットにまとめる
+            client = GitHubDataClient(repo_path, github_token,
+                                      api_url=config.get("github_api_url", DEFAULT_API_URL))
+            message = f"Update data - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            if self.pending_id_changes:
+                # 前回のプッシュ以降のIDの変更をコミットに記録（IDで参照している外部のリンク等を追えるように）
+                message += "\n\nID changes:\n" + "\n".join(self.pending_id_changes)
+            result = push_files(client, files, message, branch=config.get("github_branch"),
+                                directory="data", progress=show_progress)
 
             progress_window.destroy()
+            if result.commit_sha is not None:
+                self.pending_id_changes = []
 
             # 結果を表示
-            if updated_count == len(data_files):
-                messagebox.showinfo("完了", 
-                    f"GitHubへのプッシュが完了しました。\n{updated_count}個のファイルを更新しました。\nWebサイトは数分後に更新されます。")
-                return True
-            elif updated_count > 0:
-                error_msg = f"{updated_count}個のファイルを更新しましたが、{len(failed_files)}個のファイルでエラーが発生しました:\n\n"
-                error_msg += "\n".join(failed_files[:5])
-                if len(failed_files) > 5:
-                    error_msg += f"\n... 他 {len(failed_files) - 5}件"
-                messagebox.showwarning("一部エラー", error_msg)
+            if result.commit_sha is None:
+                messagebox.showinfo("完了", "GitHubのデータは最新です。\n変更されたファイルはありませんでした。")
                 return True
-            else:
-                error_msg = "すべてのファイルの更新に失敗しました:\n\n"
-                error_msg += "\n".join(failed_files[:5])
-                if len(failed_files) > 5:
-                    error_msg += f"\n... 他 {len(failed_files) - 5}件"
-                messagebox.showerror("エラー", error_msg)
-                return False
+
+            message = f"GitHubへのプッシュが完了しました。\n{len(result.uploaded)}個のファイルを更新しました。"
+            if result.deleted:
+                message += f"\n{len(result.deleted)}個の古いファイルを削除しました。"
+            message += "\nWebサイトは数分後に更新されます。"
+            messagebox.showinfo("完了", message)
+            return True
 
         except Exception as e:
             progress_window.destroy()
@@ -1924,7 +2155,11 @@ class ProfileEditor:
             return False
 
     def pull_from_github(self):
-        """GitHub APIからdata以下のファイルを取得（Git CLI不要）"""
+        """GitHub APIからdata以下のファイルを取得（Git CLI不要）
+
+        ローカルと内容が同じファイルは取得しない。変更されたファイルは blob を
+        一時ファイルにストリーミングしてから置き換える（1MBを超えるファイルも取得できる）。
+        """
         # 確認ダイアログ
         result = messagebox.askyesno("確認",
             "GitHubから最新データを取得します。\n"
@@ -1953,6 +2188,10 @@ class ProfileEditor:
 
         progress_window.update()
 
+        def show_progress(text):
+            status_label.config(text=text)
+            progress_window.update()
+
         try:
             github_token = config["github_token"]
 
@@ -1960,74 +2199,129 @@ class ProfileEditor:
             repo_url = config.get("github_repo_url", "https://github.com/eringiriri/mochifitter_list.git")
             repo_path = repo_url.replace("https://github.com/", "").replace(".git", "")
 
-            headers = {
-                "Authorization": f"token {github_token}",
-                "Accept": "application/vnd.github.v3+json"
-            }
-
             # 取得対象ファイル
             target_files = [
                 "data/profiles.json",
+                f"data/{MANIFEST_FILENAME}",
+                f"data/{INDEX_FILENAME}",
                 "data/Block_URLs.txt",
                 "data/Avatar_URLs.txt"
             ]
 
-            updated_count = 0
-            failed_files = []
+            # ETag はエディタの起動中は使い回す（変わっていなければ参照・ツリーを再取得しない）
+            client = GitHubDataClient(repo_path, github_token,
+                                      api_url=config.get("github_api_url", DEFAULT_API_URL),
+                                      etags=self.github_etags)
+            # 未書き出しのブロックリスト・アバターリストの変更を書き出しておく（再読み込みで変更ログが消えるため）
+            self.compact_url_lists()
 
-            for rel_path in target_files:
-                try:
-                    status_label.config(text=f"取得中: {os.path.basename(rel_path)}")
-                    progress_window.update()
-
-                    # GitHub APIでファイル内容を取得
-                    api_url = f"https://api.github.com/repos/{repo_path}/contents/{rel_path}"
-                    response = requests.get(api_url, headers=headers)
-
-                    if response.status_code == 200:
-                        file_data = response.json()
-                        # base64デコード
-                        content = base64.b64decode(file_data["content"]).decode('utf-8')
-
-                        # ローカルファイルに保存
-                        local_path = os.path.join(self.app_dir, rel_path.replace("/", os.sep))
+            show_progress("リモートの状態を確認中...")
+            blobs = remote_blobs(client, branch=config.get("github_branch"), directory="data")
 
-                        # ディレクトリが存在しない場合は作成
-                        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            # profiles.json は差分フィードで追いつける場合は差分のみ取得
+            def fetch(rel_path):
+                return rel_path == "data/profiles.json" and self.pull_profiles_via_deltas(client, blobs)
 
-                        with open(local_path, 'w', encoding='utf-8') as f:
-                            f.write(content)
+            result = pull_files(client, self.app_dir, target_files, blobs, progress=show_progress, fetch=fetch)
 
-                        updated_count += 1
-                    elif response.status_code == 404:
-                        # ファイルが存在しない場合はスキップ
-                        pass
-                    else:
-                        failed_files.append(f"{rel_path}: {response.status_code}")
-
-                except Exception as e:
-                    failed_files.append(f"{rel_path}: {str(e)[:50]}")
+            # バージョンポインタが参照している差分ファイルも取得し、参照されていないものは削除する
+            # （全件取得した場合も、ローカルを差分フィードと同じ状態にして次回の保存で連鎖を継続するため）
+            data_dir = os.path.dirname(self.json_path)
+            manifest = load_manifest(data_dir)
+            feed_paths = [f"data/{rel_path}" for rel_path in feed_files(manifest)]
+            feed_result = pull_files(client, self.app_dir, feed_paths, blobs, progress=show_progress)
+            if manifest is not None:
+                prune_feed_files(data_dir, manifest)
 
             progress_window.destroy()
 
             # 結果を表示
-            if updated_count > 0:
-                # データを再読み込み
-                self.load_data()
+            if result.updated or feed_result.updated:
+                # 取得したファイルに応じてデータを再読み込み
+                if "data/profiles.json" in result.updated:
+                    self.load_data()
+                if self.url_lists is not None and {"data/Block_URLs.txt", "data/Avatar_URLs.txt"} & set(result.updated):
+                    self.url_lists.reload()
                 messagebox.showinfo("完了",
-                    f"GitHubから{updated_count}個のファイルを取得しました。")
+                    f"GitHubから{len(result.updated) + len(feed_result.updated)}個のファイルを取得しました。")
+            elif result.unchanged:
+                messagebox.showinfo("完了", "ローカルのデータは最新です。")
             else:
                 messagebox.showwarning("警告", "取得できたファイルがありませんでした。")
 
-            if failed_files:
-                error_msg = "一部のファイルの取得に失敗しました:\n\n"
-                error_msg += "\n".join(failed_files)
-                messagebox.showwarning("警告", error_msg)
-
         except Exception as e:
             progress_window.destroy()
             messagebox.showerror("エラー", f"Pull処理でエラーが発生しました:\n{str(e)}")
 
+    def fetch_github_file(self, client, blobs, rel_path):
+        """GitHubのファイル内容を取得（存在しない場合はNone）
+
+        Args:
+            client: GitHubDataClient
+            blobs: リモートのファイル {パス: blob SHA}
+            rel_path: リポジトリ内のパス
+        """
+        sha = blobs.get(rel_path)
+        if sha is None:
+            return None
+        return client.read_blob(sha).decode('utf-8')
+
+    def pull_profiles_via_deltas(self, client, blobs):
+        """差分フィードを使ってローカルのprofiles.jsonを最新版に更新
+
+        Returns:
+            bool: 差分で最新版にできた場合True、全件取得が必要な場合False
+                  （差分がない場合も、ローカルのファイルがリモートと異なるため False）
+        """
+        try:
+            data = load_json(self.json_path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        manifest_text = self.fetch_github_file(client, blobs, f"data/{MANIFEST_FILENAME}")
+        if manifest_text is None:
+            return False
+        manifest = json.loads(manifest_text)
+
+        chain = plan_delta_chain(manifest, data.get("lastUpdated", ""))
+        if chain is None:
+            return False
+
+        deltas = []
+        for entry in chain:
+            delta_text = self.fetch_github_file(client, blobs, f"data/{entry['file']}")
+            if delta_text is None:
+                return False
+            delta = json.loads(delta_text)
+            # ローカルで編集された版に差分を適用しないよう、適用元の内容を確認
+            if delta.get("baseDigest") != profiles_digest(data.get("profiles", [])):
+                return False
+            try:
+                data = apply_delta(data, delta)
+            except ValueError:
+                return False
+            deltas.append((entry["file"], delta_text))
+
+        if profiles_digest(data.get("profiles", [])) != manifest.get("digest"):
+            return False
+
+        # 内容が最新でもファイルの内容（改行や項目の並びなど）がリモートと異なるため呼ばれているので、全件取得する
+        if not deltas:
+            return False
+
+        dump_json(self.json_path, data)
+
+        # 取得した差分もローカルに保存（次回の保存で差分の連鎖を継続するため）
+        data_dir = os.path.dirname(self.json_path)
+        for rel_file, delta_text in deltas:
+            local_path = os.path.join(data_dir, rel_file.replace("/", os.sep))
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            with open(local_path, 'w', encoding='utf-8') as f:
+                f.write(delta_text)
+
+        # 差分を適用した結果がリモートのファイルとバイト単位で一致しなければ全件取得する
+        return local_blob_sha(self.json_path) == blobs.get("data/profiles.json")
+
     def save_data(self):
         """データをJSONファイルに保存"""
         try:
@@ -2038,8 +2332,18 @@ class ProfileEditor:
             # プロファイルをID順にソート
             self.data["profiles"] = sorted(self.data["profiles"], key=lambda p: self._id_sort_key(p.get("id", "")))
 
-            with open(self.json_path, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
+            # 差分フィード用に直前に保存された版を読み込み
+            try:
+                previous_data = load_json(self.json_path)
+            except (FileNotFoundError, json.JSONDecodeError):
+                previous_data = None
+
+            dump_json(self.json_path, self.data)
+
+            # Webページ用のソートインデックスと差分フィードを更新
+            data_dir = os.path.dirname(self.json_path)
+            write_index(self.data, data_dir)
+            publish_delta(previous_data, self.data, data_dir)
 
             # 保存後に確認ダイアログを表示
             result = messagebox.askyesno("確認",
@@ -2149,6 +2453,9 @@ class ProfileEditor:
             self.url_list_text.insert("1.0", '\n'.join(remaining_urls))
         # remaining_urlsが空でも現在調査中のURLは保持される
 
+        # 確認している間に、調査中のURLと次のURLを先読みしておく
+        self.prefetch_investigation_urls()
+
     def investigation_register_url(self):
         """現在のURLで新規レコードを作成（URL調査パネル）"""
         if not self.current_investigation_url:
@@ -2172,70 +2479,66 @@ class ProfileEditor:
         self.fields["downloadLocation"].set_value(self.current_investigation_url)
         self.fetch_from_download_url()
 
-    def investigation_block_url(self):
-        """現在のURLをブロックリストに追加して次へ（URL調査パネル）"""
-        if not self.current_investigation_url:
+    def get_url_lists(self):
+        """ブロックリスト・アバターリストを取得（初回は読み込み、定期的な書き出しを開始）"""
+        if self.url_lists is None:
+            self.url_lists = URLListStore(os.path.join(self.app_dir, "data"), self.url_lists_log_path)
+            self.root.after(URL_LIST_COMPACT_INTERVAL_MS, self.schedule_url_list_compaction)
+        return self.url_lists
+
+    def schedule_url_list_compaction(self):
+        """ブロックリスト・アバターリストの変更を定期的にテキストファイルに書き出す"""
+        self.compact_url_lists()
+        self.root.after(URL_LIST_COMPACT_INTERVAL_MS, self.schedule_url_list_compaction)
+
+    def compact_url_lists(self):
+        """ブロックリスト・アバターリストの変更をテキストファイルに書き出す（変更がなければ何もしない）"""
+        if self.url_lists is None or not self.url_lists.pending:
             return
+        try:
+            self.url_lists.compact()
+        except OSError as e:
+            # 変更ログは残るため、次回の書き出しで再試行される
+            print(f"URLリストの書き出しに失敗しました: {e}")
 
-        # Avatar_URLs.txt にURLがあれば削除
-        avatar_urls_path = os.path.join(self.app_dir, "data", "Avatar_URLs.txt")
-        if os.path.exists(avatar_urls_path):
-            with open(avatar_urls_path, 'r', encoding='utf-8') as f:
-                avatar_urls = f.readlines()
-
-            # 現在のURLを除外
-            avatar_urls = [url for url in avatar_urls if url.strip() != self.current_investigation_url]
+    def investigation_block_url(self):
+        """現在のURLをブロックリストに追加して次へ（URL調査パネル）
 
-            # Avatar_URLs.txt を更新
-            with open(avatar_urls_path, 'w', encoding='utf-8') as f:
-                f.writelines(avatar_urls)
+        同じ商品がアバターリストにあれば移動する。変更は変更ログに追記し、
+        Block_URLs.txt / Avatar_URLs.txt には定期的にまとめて書き出す。
+        """
+        if not self.current_investigation_url:
+            return
 
-        # Block_URLs.txt に追加
-        with open(self.block_urls_path, 'a', encoding='utf-8') as f:
-            f.write(self.current_investigation_url + '\n')
+        self.get_url_lists().add("block", self.current_investigation_url)
 
         # 次のURLへ
         self.investigation_next_url()
 
     def investigation_save_avatar_url(self):
-        """現在のURLをAvatar_URLs.txtに保存して次へ（URL調査パネル）"""
+        """現在のURLをアバターリストに保存して次へ（URL調査パネル）
+
+        同じ商品がブロックリストにあれば移動する。
+        """
         if not self.current_investigation_url:
             return
 
-        # Block_URLs.txt にURLがあれば削除
-        if os.path.exists(self.block_urls_path):
-            with open(self.block_urls_path, 'r', encoding='utf-8') as f:
-                block_urls = f.readlines()
-
-            # 現在のURLを除外
-            block_urls = [url for url in block_urls if url.strip() != self.current_investigation_url]
-
-            # Block_URLs.txt を更新
-            with open(self.block_urls_path, 'w', encoding='utf-8') as f:
-                f.writelines(block_urls)
-
-        # Avatar_URLs.txt のパスを定義
-        avatar_urls_path = os.path.join(self.app_dir, "data", "Avatar_URLs.txt")
-
-        # Avatar_URLs.txt に追加
-        with open(avatar_urls_path, 'a', encoding='utf-8') as f:
-            f.write(self.current_investigation_url + '\n')
+        self.get_url_lists().add("avatar", self.current_investigation_url)
 
         # 次のURLへ
         self.investigation_next_url()
 
     def investigation_load_avatar_urls(self):
         """Avatar_URLs.txtの内容をURL一覧に読み込む（URL調査パネル）"""
-        avatar_urls_path = os.path.join(self.app_dir, "data", "Avatar_URLs.txt")
+        url_lists = self.get_url_lists()
 
         # ファイルが存在しない場合は何もしない
-        if not os.path.exists(avatar_urls_path):
+        if not url_lists.urls("avatar") and not os.path.exists(url_lists.path("avatar")):
             messagebox.showwarning("警告", "Avatar_URLs.txt が見つかりません")
             return
 
-        # ファイルを読み込み
-        with open(avatar_urls_path, 'r', encoding='utf-8') as f:
-            avatar_urls = f.read().strip()
+        # 書き出していない変更も含めて読み込み
+        avatar_urls = "\n".join(url_lists.urls("avatar"))
 
         if not avatar_urls:
             messagebox.showinfo("情報", "Avatar_URLs.txt は空です")
@@ -18,6 +18,8 @@ import base64
 import requests
 import csv
 
+from profile_validation import MISSING, VALIDATORS, field_label, validate_profile
+
 
 def get_app_dir():
     """アプリケーションのベースディレクトリを取得"""
@@ -400,50 +402,26 @@ class ProfileEditor:
                 widget.trace_add("write", lambda *args: setattr(self, "form_modified", True))
 
     def update_validation_status(self):
-        """入力状況を更新"""
-        # チェック対象フィールド（必須項目）
-        required_fields = {
-            "id": "ID",
-            "avatarName": "アバター名",
-            "avatarNameUrl": "アバターURL",
-            "profileVersion": "プロファイルバージョン",
-            "avatarAuthor": "アバター作者",
-            "avatarAuthorUrl": "アバター作者URL",
-            "profileAuthor": "プロファイル作者",
-            "profileAuthorUrl": "プロファイル作者URL",
-            "downloadMethod": "配布方法",
-            "downloadLocation": "配布場所URL",
-            "imageUrl": "画像URL",
-            "pricing": "価格区分",
-            "price": "プロファイル価格",
-            "avatarPrice": "アバター価格",
-        }
-
-        missing_fields = []
-
-        for field_name, display_name in required_fields.items():
-            widget = self.fields.get(field_name)
-            if not widget:
-                continue
-
-            has_value = False
-
+        """入力状況を更新（チェック内容は profile_validation と共通）"""
+        values = {}
+        for field_name, widget in self.fields.items():
             if isinstance(widget, tk.Text):
-                has_value = bool(widget.get("1.0", tk.END).strip())
-            elif isinstance(widget, PlaceholderEntry):
-                has_value = bool(widget.get_value())
+                values[field_name] = widget.get("1.0", tk.END).strip()
             elif isinstance(widget, ttk.Entry):
                 # 無効化されている場合はスキップ
                 if str(widget.cget("state")) == "disabled":
                     continue
-                has_value = bool(widget.get().strip())
+                values[field_name] = widget.get_value() if isinstance(widget, PlaceholderEntry) else widget.get()
 
-            if not has_value:
-                missing_fields.append(f"× {display_name}")
+        issues = validate_profile(values, [name for name in VALIDATORS if name in values])
+        lines = [
+            f"× {field_label(name)}" if kind == MISSING else f"△ {field_label(name)}: {message}"
+            for name, (kind, message) in issues.items()
+        ]
 
         # 表示更新
-        if missing_fields:
-            self.validation_label.config(text="\n".join(missing_fields), fg="red")
+        if lines:
+            self.validation_label.config(text="\n".join(lines), fg="red")
         else:
             self.validation_label.config(text="✓ 全て入力済み", fg="green")
 
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+profiles.json の読み込み・書き出し。
+
+orjson・msgspec がインストールされていればそれを使い、なければ標準ライブラリの json を使う。
+書き出しは json.dump(data, f, ensure_ascii=False, indent=2) とバイト単位で同じ内容になる
+（git の差分が出ないように）。
+
+- 読み込み: orjson → msgspec → json の順に、インストールされているものを使う
+- 書き出し: orjson → json（msgspec はインデント付きの出力が json と一致しないため使わない）
+
+orjson の出力が json と異なる場合（指数表記の浮動小数点数、64ビットを超える整数、
+文字列以外のキーなど）は json で書き出し直す。NaN・Infinity は扱わない（JSONの値ではないため）。
+環境変数 PROFILE_JSON_BACKEND（orjson / msgspec / json）で使うライブラリを指定できる。
+"""
+
+import json
+import os
+import re
+import tempfile
+
+try:
+    import orjson  # 任意: 高速なJSONの読み書きに使用（pip install orjson）
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec  # 任意: 高速なJSONの読み込みに使用（pip install msgspec）
+except ImportError:
+    msgspec = None
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+# orjson は 1e+16 を 1e16、1e-07 を 1e-7、1e-05 を 0.00001 と書くため、指数表記か 0.0000… の数値があれば
+# json で書き出し直す。インデント付きの出力では数値の直後は「,」か改行（文字列中に改行はない）なので、
+# 文字列の中の "9e-4" などには一致しない（orjson の指数表記は小文字の e のみ。0.0000 は先に文字列として探す方が速い）
+_EXPONENT_RE = re.compile(rb"e[-+]?\d+(?=,?\n|\Z)")
+_SMALL_DECIMAL_RE = re.compile(rb"\b0\.0000\d*(?=,?\n|\Z)")
+
+
+def _differs_from_json(data):
+    """orjson の出力 data が json の出力と異なる数値を含むか"""
+    if _EXPONENT_RE.search(data):
+        return True
+    return b"0.0000" in data and _SMALL_DECIMAL_RE.search(data) is not None
+
+
+def available_backends():
+    """インストールされているライブラリ名のリスト（優先順）"""
+    installed = {"orjson": orjson is not None, "msgspec": msgspec is not None, "json": True}
+    return [name for name in BACKENDS if installed[name]]
+
+
+def _select_backend(name=None):
+    name = name or os.environ.get("PROFILE_JSON_BACKEND") or available_backends()[0]
+    if name not in available_backends():
+        raise ValueError(f"JSONライブラリ {name} は使用できません（使用可能: {', '.join(available_backends())}）")
+    return name
+
+
+def loads(data, backend=None):
+    """JSON（bytes または str）を解析"""
+    backend = _select_backend(backend)
+    if backend == "orjson":
+        return orjson.loads(data)
+    if backend == "msgspec":
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            # 呼び出し側は json.JSONDecodeError を捕捉するため、同じ例外にする（orjson は元からそのサブクラス）
+            raise json.JSONDecodeError(str(e), data if isinstance(data, str) else "", 0) from e
+    return json.loads(data)
+
+
+def dumps(obj, backend=None):
+    """json.dumps(obj, ensure_ascii=False, indent=2) と同じ内容の UTF-8 の bytes を返す"""
+    backend = _select_backend(backend)
+    if backend == "orjson":
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            data = None
+        if data is not None and not _differs_from_json(data):
+            return data
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def load_json(path, backend=None):
+    """JSONファイルを読み込み"""
+    with open(path, "rb") as f:
+        return loads(f.read(), backend)
+
+
+def dump_json(path, obj, backend=None):
+    """JSONファイルを書き出し（テキストモードの json.dump と同じく、改行はOSの改行コード）
+
+    一時ファイルに書き出してから置き換えるため、途中で失敗しても元のファイルは壊れない。
+    """
+    data = dumps(obj, backend)
+    if os.linesep != "\n":
+        data = data.replace(b"\n", os.linesep.encode("ascii"))
+
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".json-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # 一時ファイルは所有者のみ読み書きできる権限で作られるため、元のファイル（なければ通常のファイル）の権限に合わせる
+        if os.path.exists(path):
+            mode = os.stat(path).st_mode & 0o777
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+プロファイルのモデル（Profile）。
+
+profiles.json のプロファイル（dict）を __slots__ のオブジェクトとして保持し、1件あたりのメモリを減らす。
+- 価格区分・配布方法・作者名など値の種類が少ない項目は sys.intern で同じ文字列オブジェクトを共有する
+- アバターURL・配布場所URLの Booth の商品IDは読み込み時に一度だけ整数にしておく（avatar_item_id / download_item_id）
+- 項目の有無・順序・値の型は元のJSONのまま保持し、to_dict() で同じ dict に戻せる
+
+dict と同じように profile.get("pricing")・profile["price"] = "0"・"notes" in profile で読み書きでき、
+項目は属性（profile.pricing）としても読める。JSONに書き出すときは to_dicts() で dict に戻す。
+"""
+
+import sys
+from collections.abc import MutableMapping
+
+from build_index import extract_booth_item_id
+
+# 項目（profiles.json での標準の順序）
+FIELDS = (
+    "id", "registeredDate", "updatedDate",
+    "avatarName", "avatarNameUrl", "profileVersion",
+    "avatarAuthor", "avatarshopname", "avatarAuthorUrl", "bodyBase",
+    "profileAuthor", "profileshopname", "profileAuthorUrl",
+    "official", "downloadMethod", "downloadLocation", "imageUrl",
+    "pricing", "price", "avatarPrice",
+    "onSale", "saleStartDate", "saleEndDate", "salePrice",
+    "forwardSupport", "reverseSupport", "notes",
+)
+
+# 値を sys.intern で共有する項目（同じ値が多くのプロファイルで繰り返される項目）
+INTERNED_FIELDS = frozenset((
+    "registeredDate", "updatedDate", "profileVersion",
+    "avatarAuthor", "avatarshopname", "avatarAuthorUrl", "bodyBase",
+    "profileAuthor", "profileshopname", "profileAuthorUrl",
+    "downloadMethod", "pricing", "price", "avatarPrice",
+    "saleStartDate", "saleEndDate", "salePrice", "notes",
+))
+
+# Booth の商品IDを保持するURLの項目 → 属性名
+ITEM_ID_FIELDS = {
+    "avatarNameUrl": "avatar_item_id",
+    "downloadLocation": "download_item_id",
+}
+
+_FIELD_SET = frozenset(FIELDS)
+
+# 項目の並び → 保持する並び（標準の順序なら None）。同じ並びのプロファイルで同じタプルを共有する
+_ORDERS = {}
+
+
+def _order_of(keys):
+    order = _ORDERS.get(keys)
+    if order is None and keys not in _ORDERS:
+        canonical = keys == tuple(name for name in FIELDS if name in keys)
+        order = None if canonical else keys
+        _ORDERS[keys] = order
+    return order
+
+
+class Profile(MutableMapping):
+    """プロファイル1件
+
+    Args:
+        values: 項目名 → 値（profiles.json のプロファイルの dict）
+    """
+
+    __slots__ = FIELDS + ("_order", "_extra", "avatar_item_id", "download_item_id")
+
+    def __init__(self, values=None):
+        values = values or {}
+        self._order = _order_of(tuple(values))
+        self._extra = None
+        set_field, intern = object.__setattr__, sys.intern
+        for name, value in values.items():
+            if name in _FIELD_SET:
+                set_field(self, name, intern(value) if name in INTERNED_FIELDS and type(value) is str else value)
+            else:
+                # 標準の項目以外はそのまま保持（_order にも含まれる）
+                if self._extra is None:
+                    self._extra = {}
+                self._extra[name] = value
+        self.avatar_item_id = extract_booth_item_id(values.get("avatarNameUrl"))
+        self.download_item_id = extract_booth_item_id(values.get("downloadLocation"))
+
+    def __getitem__(self, name):
+        if name in _FIELD_SET:
+            try:
+                return getattr(self, name)
+            except AttributeError:
+                raise KeyError(name) from None
+        if self._extra is not None and name in self._extra:
+            return self._extra[name]
+        raise KeyError(name)
+
+    def get(self, name, default=None):
+        if name in _FIELD_SET:
+            return getattr(self, name, default)
+        if self._extra is not None:
+            return self._extra.get(name, default)
+        return default
+
+    def __contains__(self, name):
+        if name in _FIELD_SET:
+            return hasattr(self, name)
+        return self._extra is not None and name in self._extra
+
+    def __setitem__(self, name, value):
+        if name not in self:
+            # dict と同じく、新しい項目は末尾に追加
+            self._order = _order_of((*self, name))
+        if name in _FIELD_SET:
+            if name in INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            object.__setattr__(self, name, value)
+            if name in ITEM_ID_FIELDS:
+                object.__setattr__(self, ITEM_ID_FIELDS[name], extract_booth_item_id(value))
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[name] = value
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        self._order = _order_of(tuple(key for key in self if key != name))
+        if name in _FIELD_SET:
+            object.__delattr__(self, name)
+            if name in ITEM_ID_FIELDS:
+                object.__setattr__(self, ITEM_ID_FIELDS[name], None)
+        else:
+            del self._extra[name]
+
+    def __iter__(self):
+        if self._order is not None:
+            return iter(self._order)
+        return (name for name in FIELDS if hasattr(self, name))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"Profile({self.to_dict()!r})"
+
+    def to_dict(self):
+        """profiles.json に書き出す dict（読み込んだときと同じ項目の順序）"""
+        return {name: self[name] for name in self}
+
+
+def from_dicts(profiles):
+    """プロファイルの dict のリストを Profile のリストにする"""
+    return [Profile(profile) for profile in profiles]
+
+
+def to_dicts(profiles):
+    """Profile（または dict）のリストを、JSONに書き出せる dict のリストにする"""
+    return [profile.to_dict() if isinstance(profile, Profile) else profile for profile in profiles]
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+プロファイルの変更を表すパッチ（RFC 6902 JSON Patch の形式で、プロファイルのID単位）。
+
+メンテナンススクリプトの変更内容をパッチとして書き出しておけば、確認してから後で適用したり、
+複数の実行結果をまとめてから適用したりできる。
+
+パッチは操作のリストで、各操作は RFC 6902 の操作に対象のプロファイルのID（"id"）を加えたもの。
+"path" はプロファイル内の JSON Pointer（例: "/price"）。変更・削除の前には "test" 操作で
+変更前の値を記録するため、適用時にその後の変更と食い違えばエラーになる。
+
+    [
+      {"op": "test", "id": "012", "path": "/price", "value": "0"},
+      {"op": "replace", "id": "012", "path": "/price", "value": "-"},
+      {"op": "add", "id": "034", "path": "/avatarshopname", "value": "ショップ名"}
+    ]
+
+to_json_patch() で profiles.json 全体に対する通常の RFC 6902 のパッチ（"/profiles/<位置>/price"）にも変換できる。
+"""
+
+OPS = ("test", "add", "replace", "remove")
+
+# 項目がないことを表す値
+_MISSING = object()
+
+
+def _pointer(field):
+    """項目名 → JSON Pointer（RFC 6901 のエスケープ）"""
+    return "/" + field.replace("~", "~0").replace("/", "~1")
+
+
+def _field(pointer):
+    """JSON Pointer → 項目名（プロファイル直下の項目のみ）"""
+    if not pointer.startswith("/") or "/" in pointer[1:]:
+        raise ValueError(f"プロファイル直下の項目を指すパスではありません: {pointer}")
+    return pointer[1:].replace("~1", "/").replace("~0", "~")
+
+
+def diff_profile(before, after, profile_id=None):
+    """プロファイルの変更前と変更後（dict または Profile）からパッチの操作のリストを作る
+
+    Args:
+        before: 変更前のプロファイル
+        after: 変更後のプロファイル
+        profile_id: パッチで使うID（省略時は変更前のID）
+
+    Returns:
+        list: パッチの操作（変更がなければ空）
+    """
+    if profile_id is None:
+        profile_id = before.get("id")
+    ops = []
+    for field in after:
+        value = after[field]
+        if field not in before:
+            ops.append({"op": "add", "id": profile_id, "path": _pointer(field), "value": value})
+        elif before[field] != value:
+            path = _pointer(field)
+            ops.append({"op": "test", "id": profile_id, "path": path, "value": before[field]})
+            ops.append({"op": "replace", "id": profile_id, "path": path, "value": value})
+    for field in before:
+        if field not in after:
+            path = _pointer(field)
+            ops.append({"op": "test", "id": profile_id, "path": path, "value": before[field]})
+            ops.append({"op": "remove", "id": profile_id, "path": path})
+    return ops
+
+
+def _changes(patch, changes=None):
+    """パッチを {(ID, 項目名): (変更前の値, 変更後の値)} にまとめる（値がなければ _MISSING）
+
+    同じ項目の変更が続く場合はつなげ、食い違う場合（別々の実行で同じ項目を異なる値に変更した場合など）は ValueError。
+    """
+    changes = {} if changes is None else changes
+    expected = {}
+    for op in patch:
+        kind = op.get("op")
+        if kind not in OPS or "id" not in op or "path" not in op:
+            raise ValueError(f"パッチの操作が正しくありません: {op}")
+        key = (op["id"], _field(op["path"]))
+        if kind == "test":
+            expected[key] = op["value"]
+            continue
+
+        old = expected.pop(key, _MISSING)
+        if kind != "add" and old is _MISSING:
+            raise ValueError(f"変更前の値（test）がない {kind} です: {op}")
+        new = _MISSING if kind == "remove" else op["value"]
+
+        if key in changes:
+            first_old, last_new = changes[key]
+            # 前の変更の結果に対する変更ならつなげる
+            if old is _MISSING and last_new is _MISSING or old is not _MISSING and old == last_new:
+                old = first_old
+            elif new == last_new:
+                # 同じ変更を別々に行った場合
+                continue
+            else:
+                raise ValueError(f"[{key[0]}] {key[1]} の変更が食い違っています")
+        changes[key] = (old, new)
+
+    # 変更前と同じ状態に戻った項目は除く
+    for key in [key for key, (old, new) in changes.items() if old is new or old == new]:
+        del changes[key]
+    return changes
+
+
+def _build(changes):
+    ops = []
+    for (profile_id, field), (old, new) in changes.items():
+        path = _pointer(field)
+        if old is _MISSING:
+            ops.append({"op": "add", "id": profile_id, "path": path, "value": new})
+            continue
+        ops.append({"op": "test", "id": profile_id, "path": path, "value": old})
+        if new is _MISSING:
+            ops.append({"op": "remove", "id": profile_id, "path": path})
+        else:
+            ops.append({"op": "replace", "id": profile_id, "path": path, "value": new})
+    return ops
+
+
+def merge_patches(*patches):
+    """複数のパッチを1つにまとめる（同じ項目の変更は古い順につなげる）
+
+    Raises:
+        ValueError: 同じ項目を食い違う値に変更するパッチがある場合
+    """
+    changes = {}
+    for patch in patches:
+        _changes(patch, changes)
+    return _build(changes)
+
+
+def _profiles_by_id(profiles, ids):
+    by_id = {}
+    for profile in profiles:
+        profile_id = profile.get("id")
+        if profile_id in ids:
+            if profile_id in by_id:
+                raise ValueError(f"IDが重複しているためパッチを適用できません: {profile_id}")
+            by_id[profile_id] = profile
+    missing = ids - by_id.keys()
+    if missing:
+        raise ValueError(f"パッチの対象のプロファイルがありません: {', '.join(sorted(map(str, missing)))}")
+    return by_id
+
+
+def apply_patch(profiles, patch):
+    """プロファイルのリスト（dict または Profile）にパッチを適用する
+
+    全ての操作を確認してから適用するため、エラーの場合はどのプロファイルも変更しない。
+
+    Returns:
+        int: 変更した項目の数
+
+    Raises:
+        ValueError: 対象のプロファイルがない・変更前の値が一致しない場合
+    """
+    changes = _changes(patch)
+    by_id = _profiles_by_id(profiles, {profile_id for profile_id, _ in changes})
+
+    for (profile_id, field), (old, new) in changes.items():
+        current = by_id[profile_id].get(field, _MISSING)
+        if old is _MISSING:
+            if current is not _MISSING and current != new:
+                raise ValueError(f"[{profile_id}] {field} は既にあります")
+        elif current is _MISSING or current != old:
+            raise ValueError(f"[{profile_id}] {field} の値がパッチの作成時から変わっています")
+
+    for (profile_id, field), (_, new) in changes.items():
+        profile = by_id[profile_id]
+        if new is _MISSING:
+            del profile[field]
+        else:
+            profile[field] = new
+    return len(changes)
+
+
+def to_json_patch(profiles, patch):
+    """profiles.json 全体に対する RFC 6902 のパッチ（"/profiles/<位置>/<項目>"）に変換する
+
+    Args:
+        profiles: パッチを適用するプロファイルのリスト（位置の解決に使う）
+    """
+    changes = _changes(patch)
+    ids = {profile_id for profile_id, _ in changes}
+    by_id = _profiles_by_id(profiles, ids)
+    positions = {id(profile): index for index, profile in enumerate(profiles)}
+
+    ops = []
+    for op in _build(changes):
+        path = f"/profiles/{positions[id(by_id[op['id']])]}{op['path']}"
+        ops.append({key: path if key == "path" else value for key, value in op.items() if key != "id"})
+    return ops
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+profiles.json の検索・絞り込み・並び替えを行うモジュール（scripts/server.py の /api/profiles 用）。
+
+js/profile-engine.js と同じ条件で、検索結果を1ページ分だけ返す。
+読み込み時に以下のインデックスを一度だけ作成し、リクエストごとの処理はビット演算と順列の走査で行う。
+- ファセット（公式/非公式・対応方向・価格）ごとの該当プロファイルのビットセット（int）
+- 検索用に小文字化したアバター名・作者名
+- 並び替えの選択肢ごとのインデックス順列（build_index.py と同じ）
+
+ProfileQueryService は profiles.json の更新日時・サイズを確認し、変わっていれば
+新しいインデックスを作成してから差し替える（作成中のリクエストは古いインデックスで処理）。
+"""
+
+import os
+from threading import Lock
+
+from build_index import SORT_OPTIONS, build_sort_orders
+from profile_io import load_json
+from profile_model import from_dicts
+
+# ファセットの定義（js/profile-engine.js の FACETS と同じ）
+# 同じグループ内はOR、グループ間はANDで結合する
+FACETS = {
+    "official": ("official", lambda p: bool(p.get("official"))),
+    "unofficial": ("official", lambda p: not p.get("official")),
+    "forward": ("direction", lambda p: bool(p.get("forwardSupport"))),
+    "reverse": ("direction", lambda p: bool(p.get("reverseSupport"))),
+    "bidirectional": ("direction", lambda p: bool(p.get("forwardSupport") and p.get("reverseSupport"))),
+    "free": ("price", lambda p: p.get("pricing") == "無料"),
+    "paid": ("price", lambda p: p.get("pricing") == "有料"),
+    "bundled": ("price", lambda p: p.get("pricing") == "アバター同梱"),
+}
+FACET_GROUPS = ("official", "direction", "price")
+
+DEFAULT_SORT = "id-desc"
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+# 検索対象のフィールド
+SEARCH_FIELDS = ("avatarName", "avatarAuthor", "profileAuthor")
+
+
+def _popcount(bits):
+    return bin(bits).count("1")
+
+
+class ProfileQueryIndex:
+    """1つの版の profiles.json に対するインデックス（作成後は変更しない）"""
+
+    def __init__(self, data):
+        self.last_updated = data.get("lastUpdated", "")
+        # サーバーが起動している間保持するため、メモリの少ない Profile にしておく
+        self.profiles = from_dicts(data.get("profiles", []))
+        self.all_bits = (1 << len(self.profiles)) - 1
+
+        self.facet_bits = {}
+        for name, (_, test) in FACETS.items():
+            bits = 0
+            for index, profile in enumerate(self.profiles):
+                if test(profile):
+                    bits |= 1 << index
+            self.facet_bits[name] = bits
+
+        # フィールドをまたいで一致しないよう区切り文字で連結
+        self.haystacks = [
+            "\0".join(str(p.get(field) or "").lower() for field in SEARCH_FIELDS)
+            for p in self.profiles
+        ]
+        self.sort_orders = build_sort_orders(self.profiles)
+
+    def search_bits(self, term):
+        """テキスト検索に一致するプロファイルのビットセット"""
+        if not term:
+            return self.all_bits
+        term = term.lower()
+        bits = 0
+        for index, haystack in enumerate(self.haystacks):
+            if term in haystack:
+                bits |= 1 << index
+        return bits
+
+    def query(self, q="", facets=(), sort=DEFAULT_SORT, offset=0, limit=DEFAULT_LIMIT):
+        """検索・絞り込み・並び替えを行い、1ページ分の結果を返す
+
+        Args:
+            q: 検索文字列（アバター名・アバター作者・プロファイル作者の部分一致、大文字小文字を区別しない）
+            facets: 選択されたファセット名（空なら絞り込まない）
+            sort: 並び替えの選択肢（build_index.SORT_OPTIONS）
+            offset: 先頭から読み飛ばす件数
+            limit: 返す件数の上限
+
+        Returns:
+            dict: {lastUpdated, total, offset, limit, facets: {ファセット名: 件数}, profiles: [...]}
+
+        Raises:
+            ValueError: 不明なファセット・並び替えが指定された場合
+        """
+        unknown = [name for name in facets if name not in FACETS]
+        if unknown:
+            raise ValueError(f"不明なファセットです: {', '.join(unknown)}")
+        if sort not in self.sort_orders:
+            raise ValueError(f"不明な並び替えです: {sort}")
+
+        # グループごとに選択されたファセットをORで結合
+        group_bits = {}
+        for name in facets:
+            group = FACETS[name][0]
+            group_bits[group] = group_bits.get(group, 0) | self.facet_bits[name]
+
+        # テキスト検索の結果とグループ間をANDで結合
+        search = self.search_bits(q)
+        mask = search
+        for bits in group_bits.values():
+            mask &= bits
+
+        # ファセットごとの件数（検索結果と他のグループの選択条件を満たすもの）
+        counts = {}
+        for name, (group, _) in FACETS.items():
+            bits = self.facet_bits[name] & search
+            for other, selected in group_bits.items():
+                if other != group:
+                    bits &= selected
+            counts[name] = _popcount(bits)
+
+        # 並び替え順列から該当するものだけを取り出し、指定されたページ分を返す
+        page = []
+        skipped = 0
+        for index in self.sort_orders[sort]:
+            if len(page) >= limit:
+                break
+            if (mask >> index) & 1:
+                if skipped < offset:
+                    skipped += 1
+                else:
+                    page.append(self.profiles[index].to_dict())
+
+        return {
+            "lastUpdated": self.last_updated,
+            "total": _popcount(mask),
+            "offset": offset,
+            "limit": limit,
+            "facets": counts,
+            "profiles": page,
+        }
+
+
+class ProfileQueryService:
+    """profiles.json の更新を検知してインデックスを作り直すサービス（スレッドセーフ）"""
+
+    def __init__(self, json_path):
+        self.json_path = json_path
+        self._index = None
+        self._version = None
+        self._lock = Lock()
+
+    def current(self):
+        """最新の profiles.json に対するインデックスを返す
+
+        Raises:
+            OSError: profiles.json を読み込めない場合
+            ValueError: profiles.json が壊れている場合（JSONDecodeError）
+        """
+        stat = os.stat(self.json_path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        if self._index is not None and self._version == version:
+            return self._index
+
+        with self._lock:
+            # 他のスレッドが作り直していれば、それを使う
+            if self._index is not None and self._version == version:
+                return self._index
+            data = load_json(self.json_path)
+            index = ProfileQueryIndex(data)
+            # 作成が終わってから差し替える
+            self._index, self._version = index, version
+            return index
+
+
+def parse_query_params(params):
+    """URLのクエリパラメータ（urllib.parse.parse_qs の結果）を query() の引数に変換
+
+    パラメータ:
+        q: 検索文字列
+        official / direction / price: ファセット名（カンマ区切り・複数指定可）
+        sort: 並び替えの選択肢（既定: id-desc）
+        offset / limit: ページング（limit は最大 MAX_LIMIT）
+
+    Raises:
+        ValueError: 値が不正な場合
+    """
+    def first(name, default=""):
+        values = params.get(name)
+        return values[0] if values else default
+
+    facets = []
+    for group in FACET_GROUPS:
+        for value in params.get(group, []):
+            for name in value.split(","):
+                name = name.strip()
+                if not name:
+                    continue
+                if name not in FACETS or FACETS[name][0] != group:
+                    raise ValueError(f"{group} に指定できないファセットです: {name}")
+                if name not in facets:
+                    facets.append(name)
+
+    sort = first("sort", DEFAULT_SORT)
+    if sort not in SORT_OPTIONS:
+        raise ValueError(f"不明な並び替えです: {sort}")
+
+    try:
+        offset = int(first("offset", "0"))
+        limit = int(first("limit", str(DEFAULT_LIMIT)))
+    except ValueError:
+        raise ValueError("offset と limit は整数で指定してください") from None
+    if offset < 0 or limit < 1:
+        raise ValueError("offset は0以上、limit は1以上で指定してください")
+
+    return {
+        "q": first("q").strip(),
+        "facets": facets,
+        "sort": sort,
+        "offset": offset,
+        "limit": min(limit, MAX_LIMIT),
+    }
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+プロファイルの入力チェック（エディタ・チェック用スクリプト共通）。
+
+必須項目・配布場所URLが Booth の場合のみ必須の項目・URL/日付/価格の形式を
+ルールとして宣言し、読み込み時に項目ごとの検証関数にまとめておく。
+
+- validate_field(): 1項目だけ検証する（エディタで入力された項目の再検証用）
+- validate_profiles(): 全プロファイルを1回の走査で検証し、機械可読なレポートを返す
+
+コマンドラインから実行すると data/profiles.json を検証して結果を表示する（--json でレポートをJSONで出力）。
+"""
+
+import json
+import os
+import re
+import sys
+
+from profile_io import load_json
+
+# 必須項目（項目名: 表示名）
+REQUIRED_FIELDS = {
+    "id": "ID",
+    "avatarName": "アバター名",
+    "avatarNameUrl": "アバターURL",
+    "profileVersion": "プロファイルバージョン",
+    "avatarAuthor": "アバター作者",
+    "avatarAuthorUrl": "アバター作者URL",
+    "avatarshopname": "アバターショップ名",
+    "profileAuthor": "プロファイル作者",
+    "profileAuthorUrl": "プロファイル作者URL",
+    "profileshopname": "プロファイルショップ名",
+    "downloadMethod": "配布方法",
+    "downloadLocation": "配布場所URL",
+    "imageUrl": "画像URL",
+    "pricing": "価格区分",
+    "price": "プロファイル価格",
+    "avatarPrice": "アバター価格",
+}
+
+# 配布場所URLが Booth の場合のみ必須の項目
+BOOTH_ONLY_REQUIRED_FIELDS = ("downloadLocation", "profileshopname")
+
+# 形式をチェックする項目（入力されている場合のみ）
+URL_FIELDS = ("avatarNameUrl", "avatarAuthorUrl", "profileAuthorUrl", "downloadLocation", "imageUrl")
+DATE_FIELDS = ("registeredDate", "updatedDate", "saleStartDate", "saleEndDate")
+PRICE_FIELDS = ("price", "avatarPrice", "salePrice")
+
+# 必須項目以外の表示名
+OPTIONAL_FIELD_LABELS = {
+    "registeredDate": "登録日",
+    "updatedDate": "更新日",
+    "saleStartDate": "セール開始日",
+    "saleEndDate": "セール終了日",
+    "salePrice": "セール価格",
+}
+
+URL_RE = re.compile(r"https?://\S+")
+DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}( \d{2}:\d{2}:\d{2})?")
+# 数字（"200/200" のような / 区切りを含む）か、数字で始まらない文字列（"-"・"不明" など）
+PRICE_RE = re.compile(r"\d+(/\d+)*|[^\d\s](.*\S)?", re.DOTALL)
+
+# 問題の種類
+MISSING = "missing"
+FORMAT = "format"
+
+_FORMAT_RULES = (
+    (URL_FIELDS, URL_RE, "URLの形式ではありません（https:// で始め、空白を含めない）"),
+    (DATE_FIELDS, DATE_RE, "YYYY-MM-DD または YYYY-MM-DD HH:MM:SS で入力してください"),
+    (PRICE_FIELDS, PRICE_RE, "数字（前後の空白・カンマ・単位なし）で入力してください"),
+)
+
+
+def field_label(field_name):
+    """項目の表示名"""
+    return REQUIRED_FIELDS.get(field_name) or OPTIONAL_FIELD_LABELS.get(field_name, field_name)
+
+
+def is_booth_download(profile):
+    """配布場所URLが Booth か（Booth のみ必須の項目を判定する条件）"""
+    return "booth.pm" in str(profile.get("downloadLocation") or "")
+
+
+def _is_empty(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _compile_field(field_name):
+    """項目の検証関数 validator(value, is_booth) → (種類, メッセージ) または None を作成"""
+    required = field_name in REQUIRED_FIELDS
+    booth_only = field_name in BOOTH_ONLY_REQUIRED_FIELDS
+    pattern = message = None
+    for fields, rule_pattern, rule_message in _FORMAT_RULES:
+        if field_name in fields:
+            pattern, message = rule_pattern.fullmatch, rule_message
+
+    def validator(value, is_booth):
+        if _is_empty(value):
+            if required and (is_booth or not booth_only):
+                return (MISSING, "未入力です")
+            return None
+        if pattern is not None and isinstance(value, str) and not pattern(value):
+            return (FORMAT, message)
+        return None
+
+    return validator
+
+
+# 項目名 → 検証関数（表示順）
+VALIDATORS = {
+    field_name: _compile_field(field_name)
+    for field_name in dict.fromkeys((*REQUIRED_FIELDS, *DATE_FIELDS, *PRICE_FIELDS))
+}
+
+
+def affected_fields(field_name):
+    """項目が変更されたときに検証し直す項目（配布場所URLは Booth のみ必須の項目の条件になる）"""
+    affected = [field_name] if field_name in VALIDATORS else []
+    if field_name == "downloadLocation":
+        affected.extend(name for name in BOOTH_ONLY_REQUIRED_FIELDS if name != field_name)
+    return affected
+
+
+def validate_field(profile, field_name):
+    """1項目を検証し、問題があれば (種類, メッセージ)、なければ None を返す"""
+    validator = VALIDATORS.get(field_name)
+    if validator is None:
+        return None
+    return validator(profile.get(field_name), is_booth_download(profile))
+
+
+def validate_profile(profile, fields=None):
+    """プロファイルを検証し、{項目名: (種類, メッセージ)} を返す（問題のある項目のみ）"""
+    is_booth = is_booth_download(profile)
+    issues = {}
+    for field_name in (fields or VALIDATORS):
+        issue = VALIDATORS[field_name](profile.get(field_name), is_booth)
+        if issue:
+            issues[field_name] = issue
+    return issues
+
+
+def missing_required_fields(profile):
+    """プロファイルで未入力の必須項目名のリスト"""
+    is_booth = is_booth_download(profile)
+    return [
+        field_name for field_name in REQUIRED_FIELDS
+        if (is_booth or field_name not in BOOTH_ONLY_REQUIRED_FIELDS) and _is_empty(profile.get(field_name))
+    ]
+
+
+def validate_profiles(profiles, fields=None, kinds=None):
+    """全プロファイルを1回の走査で検証し、レポートを返す（JSONにそのまま書き出せる）
+
+    Args:
+        profiles: プロファイルのリスト
+        fields: 検証する項目名（省略時はすべて）
+        kinds: 報告する問題の種類（MISSING / FORMAT、省略時はすべて）
+
+    Returns:
+        dict: {
+            "total": 検証したプロファイル数,
+            "invalid": 問題のあるプロファイル数,
+            "counts": {種類: {項目名: 件数}},
+            "profiles": [{"index": 位置, "id": ID, "issues": [{"field", "kind", "message"}, ...]}, ...],
+        }
+    """
+    validators = [(name, VALIDATORS[name]) for name in (fields or VALIDATORS)]
+    counts = {}
+    results = []
+    for index, profile in enumerate(profiles):
+        is_booth = is_booth_download(profile)
+        issues = []
+        for field_name, validator in validators:
+            issue = validator(profile.get(field_name), is_booth)
+            if issue is None or (kinds and issue[0] not in kinds):
+                continue
+            kind, message = issue
+            issues.append({"field": field_name, "kind": kind, "message": message})
+            by_field = counts.setdefault(kind, {})
+            by_field[field_name] = by_field.get(field_name, 0) + 1
+        if issues:
+            results.append({"index": index, "id": profile.get("id"), "issues": issues})
+
+    return {
+        "total": len(profiles),
+        "invalid": len(results),
+        "counts": counts,
+        "profiles": results,
+    }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    json_path = os.path.join(os.path.dirname(script_dir), "data", "profiles.json")
+    if not os.path.exists(json_path):
+        print(f"profiles.json が見つかりません: {json_path}")
+        return 1
+
+    data = load_json(json_path)
+    report = validate_profiles(data.get("profiles", []))
+
+    if "--json" in argv:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return 0
+
+    for result in report["profiles"]:
+        details = ", ".join(f"{field_label(issue['field'])}: {issue['message']}" for issue in result["issues"])
+        print(f"{result['id']}\t{details}")
+    print(f"{report['total']}件中 {report['invalid']}件に問題があります")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+HTTPリクエストの集計モジュール（scripts/server.py の /metrics 用）。
+
+パス・メソッド・ステータスごとのリクエスト数、応答時間のヒストグラム、送信バイト数を集計し、
+Prometheus のテキスト形式で出力する。ローカルで配信モードやキャッシュ設定を
+負荷試験で比較するためのもの。
+"""
+
+import json
+import time
+from datetime import datetime, timezone
+from threading import Lock
+
+METRIC_PREFIX = "mochifitter_http"
+
+# 応答時間のヒストグラムの区切り（秒）
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# 存在しないパスへのリクエストと、その他のエラー（未対応のメソッド・不正なリクエストなど）はまとめて集計する
+# （スキャナーなどのリクエストでパスの種類が際限なく増えないように）。
+# error_paths に指定したパス（APIなど）のエラーはパスごとに集計する
+NOT_FOUND_PATH = "(not found)"
+ERROR_PATH = "(error)"
+
+# メソッドのラベルとして使う値（それ以外は OTHER_METHOD にまとめる）
+KNOWN_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"))
+OTHER_METHOD = "OTHER"
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+class RequestMetrics:
+    """リクエストの集計（スレッドセーフ）"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, error_paths=()):
+        self.buckets = tuple(sorted(buckets))
+        self.error_paths = frozenset(error_paths)
+        self.started_at = time.time()
+        self._requests = {}    # (パス, メソッド, ステータス) → 件数
+        self._bytes = {}       # パス → 送信バイト数
+        self._durations = {}   # パス → [区切りごとの件数..., 合計時間, 件数]
+        self._in_flight = 0
+        self._lock = Lock()
+
+    def request_started(self):
+        """処理中のリクエスト数を増やす"""
+        with self._lock:
+            self._in_flight += 1
+
+    def record(self, method, path, status, duration, bytes_sent):
+        """処理が終わったリクエストを記録（status 0 は応答を送らずに終わったリクエスト）"""
+        if method not in KNOWN_METHODS:
+            method = OTHER_METHOD
+        if status == 404:
+            path = NOT_FOUND_PATH
+        elif (status >= 400 or status == 0) and path not in self.error_paths:
+            path = ERROR_PATH
+        with self._lock:
+            self._in_flight = max(self._in_flight - 1, 0)
+            key = (path, method, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            self._bytes[path] = self._bytes.get(path, 0) + bytes_sent
+
+            histogram = self._durations.get(path)
+            if histogram is None:
+                histogram = self._durations[path] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    histogram[index] += 1
+            histogram[-2] += duration
+            histogram[-1] += 1
+
+    def render(self):
+        """Prometheus のテキスト形式で出力"""
+        with self._lock:
+            requests = sorted(self._requests.items())
+            sent = sorted(self._bytes.items())
+            durations = sorted((path, list(values)) for path, values in self._durations.items())
+            in_flight = self._in_flight
+
+        lines = [
+            f"# HELP {METRIC_PREFIX}_requests_total パス・メソッド・ステータスごとのリクエスト数",
+            f"# TYPE {METRIC_PREFIX}_requests_total counter",
+        ]
+        for (path, method, status), count in requests:
+            lines.append(f"{METRIC_PREFIX}_requests_total{_labels(path=path, method=method, status=status)} {count}")
+
+        lines += [
+            f"# HELP {METRIC_PREFIX}_response_bytes_total パスごとの送信バイト数（本文）",
+            f"# TYPE {METRIC_PREFIX}_response_bytes_total counter",
+        ]
+        for path, total in sent:
+            lines.append(f"{METRIC_PREFIX}_response_bytes_total{_labels(path=path)} {total}")
+
+        lines += [
+            f"# HELP {METRIC_PREFIX}_request_duration_seconds パスごとの応答時間",
+            f"# TYPE {METRIC_PREFIX}_request_duration_seconds histogram",
+        ]
+        for path, histogram in durations:
+            for bound, count in zip(self.buckets, histogram):
+                lines.append(f"{METRIC_PREFIX}_request_duration_seconds_bucket{_labels(path=path, le=bound)} {count}")
+            lines.append(f"{METRIC_PREFIX}_request_duration_seconds_bucket{_labels(path=path, le='+Inf')} {histogram[-1]}")
+            lines.append(f"{METRIC_PREFIX}_request_duration_seconds_sum{_labels(path=path)} {_format_value(histogram[-2])}")
+            lines.append(f"{METRIC_PREFIX}_request_duration_seconds_count{_labels(path=path)} {histogram[-1]}")
+
+        lines += [
+            f"# HELP {METRIC_PREFIX}_requests_in_flight 処理中のリクエスト数",
+            f"# TYPE {METRIC_PREFIX}_requests_in_flight gauge",
+            f"{METRIC_PREFIX}_requests_in_flight {in_flight}",
+            f"# HELP {METRIC_PREFIX}_start_time_seconds サーバーの起動時刻（UNIX時間）",
+            f"# TYPE {METRIC_PREFIX}_start_time_seconds gauge",
+            f"{METRIC_PREFIX}_start_time_seconds {_format_value(self.started_at)}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def format_access_log(client, method, path, status, bytes_sent, duration, user_agent=None, encoding=None):
+    """アクセスログを1行のJSONに変換"""
+    entry = {
+        "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "client": client,
+        "method": method,
+        "path": path,
+        "status": status,
+        "bytes": bytes_sent,
+        "durationMs": round(duration * 1000, 3),
+    }
+    if user_agent:
+        entry["userAgent"] = user_agent
+    if encoding:
+        entry["encoding"] = encoding
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+URL調査パネルのURL一覧を先読みしてスクレイピングしておくモジュール。
+
+調査中のURLを確認している間に、一覧の次の数件を別スレッドで取得・解析しておき、
+登録時には結果をすぐにフォームへ入力できるようにする。
+取得に失敗した結果は保持せず、登録時に改めて取得する。
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = 2
+
+# 保持する結果の数（古いものから捨てる）
+DEFAULT_MAX_ENTRIES = 50
+
+
+class ScrapePrefetcher:
+    """スクレイピング結果の先読み
+
+    Args:
+        scrape: URLを受け取って結果を返す関数（別スレッドで呼ばれるため、UIに触れないこと）
+        workers: 同時に取得するURLの数
+        max_entries: 保持する結果の数
+    """
+
+    def __init__(self, scrape, workers=DEFAULT_WORKERS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.scrape = scrape
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ScrapePrefetcher")
+        self._futures = OrderedDict()  # URL → Future（UIのスレッドからのみ操作する）
+
+    def prefetch(self, urls):
+        """まだ取得していないURLの取得を開始"""
+        for url in urls:
+            if url in self._futures:
+                self._futures.move_to_end(url)
+                continue
+            self._futures[url] = self._executor.submit(self.scrape, url)
+
+        # 古い結果から捨てる（取得中のものは取得が終わるまで残す）
+        for url in list(self._futures):
+            if len(self._futures) <= self.max_entries:
+                break
+            if self._futures[url].done():
+                del self._futures[url]
+
+    def get(self, url):
+        """先読みした結果を返す（先読みしていない・失敗した場合は None）
+
+        取得中の場合は終わるまで待つ（最初から取得するより早い）。
+        """
+        future = self._futures.pop(url, None)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"[prefetch] 先読みに失敗したため取得し直します: {url} ({e})")
+            return None
+
+    def shutdown(self):
+        """取得を中止（取得中のものは終わるのを待たない）"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._futures.clear()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+プロファイルエディタの検索用インデックス。
+
+プロファイルごとに検索対象のフィールドを正規化して連結した文字列（haystack）を保持し、
+その文字の1文字・2文字の組（n-gram）から候補を絞り込んでから部分一致を確認する。
+正規化では以下をそろえるため、表記ゆれがあっても一致する。
+- 大文字・小文字（casefold）
+- 全角・半角（NFKC: "ＡＢＣ" → "abc"、"ｶﾞ" → "ガ"）
+- カタカナ・ひらがな（カタカナをひらがなに変換）
+"""
+
+import unicodedata
+
+# 検索対象のフィールド
+SEARCH_FIELDS = (
+    "id",
+    "avatarName",
+    "avatarAuthor",
+    "profileAuthor",
+    "notes",
+    "bodyBase",
+    "avatarNameUrl",
+    "downloadLocation",
+)
+
+# フィールド間の区切り（正規化後の検索語には含まれないため、フィールドをまたいで一致しない）
+_FIELD_SEPARATOR = "\0"
+
+# カタカナ（ァ〜ヶ、ヽヾ）→ ひらがな
+_KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+_KATAKANA_TO_HIRAGANA.update({0x30FD: 0x309D, 0x30FE: 0x309E})
+
+
+def normalize_text(text):
+    """検索用に文字列を正規化（大文字小文字・全角半角・カタカナひらがなをそろえる）"""
+    text = unicodedata.normalize("NFKC", str(text or "")).casefold()
+    return text.translate(_KATAKANA_TO_HIRAGANA).replace(_FIELD_SEPARATOR, " ")
+
+
+def _grams(text):
+    """文字列に含まれる1文字・2文字の組"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    grams.discard(_FIELD_SEPARATOR)
+    return {gram for gram in grams if _FIELD_SEPARATOR not in gram}
+
+
+class ProfileSearchIndex:
+    """プロファイルの検索インデックス
+
+    プロファイル（dict）は同じオブジェクトを編集するため、オブジェクトの id() で管理する。
+    プロファイルを編集・追加したら update()、削除したら remove() を呼ぶ。
+    """
+
+    def __init__(self, profiles=()):
+        self._entries = {}   # id(profile) → (profile, haystack)
+        self._postings = {}  # n-gram → {id(profile), ...}
+        self.rebuild(profiles)
+
+    def rebuild(self, profiles):
+        """すべてのプロファイルからインデックスを作り直す"""
+        self._entries = {}
+        self._postings = {}
+        for profile in profiles:
+            self.update(profile)
+
+    def update(self, profile):
+        """プロファイルを追加・更新"""
+        key = id(profile)
+        haystack = _FIELD_SEPARATOR.join(normalize_text(profile.get(field, "")) for field in SEARCH_FIELDS)
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] == haystack:
+            return
+        if entry is not None:
+            self._remove_postings(key, entry[1])
+        self._entries[key] = (profile, haystack)
+        for gram in _grams(haystack):
+            self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, profile):
+        """プロファイルを削除"""
+        entry = self._entries.pop(id(profile), None)
+        if entry is not None:
+            self._remove_postings(id(profile), entry[1])
+
+    def sync(self, profiles):
+        """インデックスに含まれるプロファイルを profiles に合わせる（追加・削除のみ確認）"""
+        keys = {id(profile) for profile in profiles}
+        for key in [key for key in self._entries if key not in keys]:
+            self.remove(self._entries[key][0])
+        for profile in profiles:
+            if id(profile) not in self._entries:
+                self.update(profile)
+
+    def _remove_postings(self, key, haystack):
+        for gram in _grams(haystack):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(key)
+                if not posting:
+                    del self._postings[gram]
+
+    def search(self, text):
+        """検索語を含むプロファイルの id() の集合を返す（検索語が空なら None = すべて）"""
+        term = normalize_text(text).strip()
+        if not term:
+            return None
+
+        # 検索語の2文字の組（1文字なら1文字）をすべて含むプロファイルに絞り込む
+        grams = {term[i:i + 2] for i in range(len(term) - 1)} or {term}
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:]) if postings else set()
+
+        # 2文字の組がすべて含まれていても連続しているとは限らないため、部分一致を確認
+        if len(term) <= 2:
+            return candidates
+        return {key for key in candidates if term in self._entries[key][1]}
@@ -4,28 +4,254 @@
 
 静的ファイルを配信する簡易HTTPサーバーを起動します。
 デフォルトでポート8000で起動し、ブラウザを自動で開きます。
+
+--production を指定すると、本番環境に近い設定で配信します。
+- 複数のクライアントを並行して処理（ThreadingHTTPServer）
+- Accept-Encoding に応じて gzip / brotli で圧縮
+  （同じ場所に .br / .gz のファイルがあればそれを配信し、なければその場で圧縮してメモリにキャッシュ）
+- ETag / Last-Modified による条件付きリクエスト（304 Not Modified）
+- ファイルの種類ごとの Cache-Control
+- Rangeリクエスト（206 Partial Content）と、大きなファイルの sendfile による送信
+
+--file-cache を併用すると、小さいファイル（profiles.json を含む）の内容をメモリに保持し、
+ファイルの更新日時・サイズが変わったときだけ読み直します（負荷試験向け）。
+
+どちらのモードでも /api/profiles で検索・絞り込み・並び替え済みの結果を1ページ分返します
+（パラメータは profile_query.parse_query_params を参照）。
+例: /api/profiles?q=mochi&official=official&price=free,paid&sort=updatedDate-desc&offset=0&limit=50
+
+--live-reload を指定すると data/ js/ css/ の変更を監視し、/api/events（Server-Sent Events）で
+変更されたファイルを通知します。ページはデータだけを読み直し（差分フィードを利用）、
+CSSは差し替え、JSの変更時のみページ全体を再読み込みします。
+
+/metrics ではパスごとのリクエスト数・応答時間・送信バイト数を Prometheus のテキスト形式で返します。
+--log-format json を指定すると、アクセスログを1リクエスト1行のJSONで出力します。
 """
 
 import argparse
+import email.utils
+import gzip
 import http.server
+import io
+import json
+import queue
 import socketserver
+import urllib.parse
 import webbrowser
 import sys
 import os
+import re
+import time
+from collections import OrderedDict
 from pathlib import Path
-from threading import Timer
+from threading import Lock, Timer
+
+from file_watcher import FileWatcher
+from profile_query import ProfileQueryService, parse_query_params
+from request_metrics import RequestMetrics, format_access_log
+
+try:
+    import brotli  # 任意: brotli圧縮に使用（pip install brotli）
+except ImportError:
+    brotli = None
+
+# その場で圧縮する対象のContent-Typeと最小サイズ
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml')
+MIN_COMPRESS_SIZE = 1024
+
+# 圧縮結果のキャッシュに保持する件数の上限
+COMPRESSED_CACHE_LIMIT = 256
+
+# メモリに保持するファイルのサイズ上限と、キャッシュ全体の上限（--file-cache）
+HOT_FILE_MAX_SIZE = 2 * 1024 * 1024
+HOT_CACHE_LIMIT = 64 * 1024 * 1024
+
+API_PROFILES_PATH = '/api/profiles'
+API_EVENTS_PATH = '/api/events'
+METRICS_PATH = '/metrics'
+
+# ライブリロードで監視するディレクトリと、接続維持のためのコメントを送る間隔（秒）
+LIVE_RELOAD_DIRECTORIES = ('data', 'js', 'css')
+EVENTS_KEEPALIVE = 15
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
 
 
 class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     """カスタムHTTPリクエストハンドラー"""
     
+    query_service = None        # ProfileQueryService（/api/profiles 用、main で設定）
+    change_broadcaster = None   # ChangeBroadcaster（/api/events 用、--live-reload 指定時）
+    metrics = None              # RequestMetrics（/metrics 用、main で設定）
+    access_log_format = 'text'  # アクセスログの形式（'text' または 'json'）
+    _cache_control = None       # このリクエストのCache-Control（Noneなら既定）
+
+    def handle_one_request(self):
+        """1リクエストを処理し、集計とアクセスログを記録"""
+        self._request_started = None
+        self._response_status = None
+        self._response_length = 0
+        self._response_encoding = None
+        # keep-alive では同じインスタンスが続けてリクエストを処理するため、前のファイルのキャッシュ設定を引き継がない
+        self._cache_control = None
+        try:
+            super().handle_one_request()
+        finally:
+            if self._request_started is not None:
+                self.record_request(time.perf_counter() - self._request_started)
+
+    def parse_request(self):
+        """リクエスト行を受け取った時点から応答時間を計る（keep-aliveの待ち時間は含めない）"""
+        self._request_started = time.perf_counter()
+        if self.metrics is not None:
+            self.metrics.request_started()
+        return super().parse_request()
+
+    def send_response(self, code, message=None):
+        self._response_status = code
+        super().send_response(code, message)
+
+    def send_header(self, keyword, value):
+        name = keyword.lower()
+        if name == 'content-length':
+            self._response_length = int(value)
+        elif name == 'content-encoding':
+            self._response_encoding = value
+        super().send_header(keyword, value)
+
+    def record_request(self, duration):
+        """処理が終わったリクエストを集計し、JSON形式ならアクセスログを出力"""
+        status = self._response_status or 0
+        method = getattr(self, 'command', None) or '-'
+        path = urllib.parse.urlsplit(getattr(self, 'path', '') or '').path or '-'
+        # 本文のないレスポンス（Content-Lengthのないストリームは送信量を数えない）
+        if method == 'HEAD' or status in (204, 304) or status < 200:
+            bytes_sent = 0
+        else:
+            bytes_sent = self._response_length
+
+        if self.metrics is not None:
+            self.metrics.record(method, path, status, duration, bytes_sent)
+        if self.access_log_format == 'json':
+            sys.stdout.write(format_access_log(
+                self.client_address[0], method, path, status, bytes_sent, duration,
+                user_agent=self.headers.get('User-Agent') if getattr(self, 'headers', None) else None,
+                encoding=self._response_encoding,
+            ) + "\n")
+            sys.stdout.flush()
+
+    def log_request(self, code='-', size='-'):
+        """テキスト形式のアクセスログ（JSON形式の場合は record_request で出力）"""
+        if self.access_log_format != 'json':
+            super().log_request(code, size)
+
+    def do_GET(self):
+        """/api/ 以下はAPIとして処理し、それ以外は静的ファイルを配信"""
+        path = urllib.parse.urlsplit(self.path).path
+        if path == API_PROFILES_PATH:
+            self.handle_profiles_api()
+            return
+        if path == API_EVENTS_PATH:
+            self.handle_events()
+            return
+        if path == METRICS_PATH:
+            self.handle_metrics()
+            return
+        super().do_GET()
+
+    def handle_metrics(self):
+        """リクエストの集計を Prometheus のテキスト形式で返す"""
+        if self.metrics is None:
+            self.send_json(404, {'error': '集計は無効です'})
+            return
+        body = self.metrics.render().encode('utf-8')
+        self._cache_control = 'no-store'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle_events(self):
+        """ファイルの変更をServer-Sent Eventsで通知（接続が切れるまで続ける）"""
+        if self.change_broadcaster is None:
+            self.send_json(404, {'error': 'ライブリロードは無効です（--live-reload で有効になります）'})
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        events = self.change_broadcaster.subscribe()
+        try:
+            self.wfile.write(b'retry: 2000\n\n')
+            while True:
+                try:
+                    paths = events.get(timeout=EVENTS_KEEPALIVE)
+                except queue.Empty:
+                    self.wfile.write(b': keep-alive\n\n')
+                    continue
+                data = json.dumps({'paths': paths}, ensure_ascii=False)
+                self.wfile.write(f'event: change\ndata: {data}\n\n'.encode('utf-8'))
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            pass
+        finally:
+            self.change_broadcaster.unsubscribe(events)
+
+    def handle_profiles_api(self):
+        """プロファイルの検索API"""
+        if self.query_service is None:
+            self.send_json(404, {'error': 'APIは無効です'})
+            return
+        try:
+            params = parse_query_params(urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query))
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+            return
+        try:
+            index = self.query_service.current()
+        except (OSError, ValueError) as e:
+            self.log_error('profiles.json を読み込めません: %s', e)
+            self.send_json(503, {'error': 'プロファイルデータを読み込めません'})
+            return
+        self.send_json(200, index.query(**params))
+
+    def send_json(self, status, payload):
+        """JSONを送信（改行・空白なし。APIの結果はキャッシュさせない）"""
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        encoding, body = self.encode_body(body, 'application/json')
+        self._cache_control = 'no-store'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+            self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error(self, code, message=None, explain=None):
+        """エラーのレスポンスはキャッシュさせない"""
+        self._cache_control = 'no-store'
+        super().send_error(code, message, explain)
+
+    def encode_body(self, body, content_type):
+        """レスポンス本文の圧縮（開発用では圧縮しない）"""
+        return None, body
+
     def end_headers(self):
-        """CORSヘッダーを追加"""
+        """CORSヘッダーとキャッシュ設定を追加"""
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
+        self.send_header('Cache-Control', self.cache_control())
         super().end_headers()
 
+    def cache_control(self):
+        """Cache-Controlの値（開発用のため常にキャッシュさせない）"""
+        return 'no-store, no-cache, must-revalidate'
+
     def log_message(self, format, *args):
         """ログメッセージをカスタマイズ"""
         sys.stdout.write("%s - [%s] %s\n" %
@@ -34,6 +260,351 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
                          format % args))
 
 
+def parse_accept_encoding(header):
+    """Accept-Encodingヘッダーを {エンコーディング: q値} に変換"""
+    accepted = {}
+    for part in (header or '').split(','):
+        name, _, params = part.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def cache_policy(rel_path, content_type):
+    """ファイルの種類ごとのCache-Controlを返す"""
+    # HTMLとデータは更新をすぐ反映させるため、毎回ETagで確認させる
+    if content_type.startswith('text/html') or rel_path.startswith('data/'):
+        return 'no-cache'
+    # ファイル名にバージョンを含まないため、CSS/JSは短めにキャッシュ
+    if content_type in ('text/css', 'text/javascript', 'application/javascript'):
+        return 'public, max-age=3600'
+    if content_type.startswith(('image/', 'font/')):
+        return 'public, max-age=604800'
+    return 'no-cache'
+
+
+class ChangeBroadcaster:
+    """ファイルの変更を /api/events の接続ごとのキューに配る"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = Lock()
+
+    def subscribe(self):
+        events = queue.Queue()
+        with self._lock:
+            self._subscribers.add(events)
+        return events
+
+    def unsubscribe(self, events):
+        with self._lock:
+            self._subscribers.discard(events)
+
+    def publish(self, paths):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for events in subscribers:
+            events.put(paths)
+
+
+class CompressedCache:
+    """その場で圧縮した結果のキャッシュ（ファイルの更新日時とサイズが変わったら作り直す）"""
+
+    def __init__(self, limit=COMPRESSED_CACHE_LIMIT):
+        self.limit = limit
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, path, encoding, stat):
+        """圧縮済みのデータを取得（未作成・古い場合は圧縮して保存）"""
+        key = (path, encoding)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        if encoding == 'br':
+            body = brotli.compress(data, quality=5)
+        else:
+            body = gzip.compress(data, compresslevel=6, mtime=0)
+
+        with self._lock:
+            self._entries[key] = (version, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.limit:
+                self._entries.popitem(last=False)
+        return body
+
+
+class FileCache:
+    """小さいファイルの内容をメモリに保持するキャッシュ（ファイルの更新日時とサイズが変わったら読み直す）"""
+
+    def __init__(self, max_file_size=HOT_FILE_MAX_SIZE, limit=HOT_CACHE_LIMIT):
+        self.max_file_size = max_file_size
+        self.limit = limit
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+
+    def get(self, path):
+        """ファイルの内容を取得（大きいファイル・読めないファイルは None）"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if stat.st_size > self.max_file_size:
+            return None
+
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == version:
+                self._entries.move_to_end(path)
+                return entry[1]
+
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old:
+                self._size -= len(old[1])
+            self._entries[path] = (version, data)
+            self._size += len(data)
+            while self._size > self.limit and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+        return data
+
+
+def parse_range(header, length):
+    """Rangeヘッダー（単一範囲のみ対応）を解析
+
+    Returns:
+        tuple | None | str: (開始, 終了) の位置（終了を含む）、対象外なら None、範囲外なら 'unsatisfiable'
+    """
+    match = _RANGE_RE.match((header or '').strip())
+    if not match:
+        # 複数範囲や不正な形式は無視して全体を返す
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # 末尾からのバイト数指定（bytes=-500）
+        suffix = int(last)
+        if suffix == 0:
+            return 'unsatisfiable'
+        return max(length - suffix, 0), length - 1
+    start = int(first)
+    end = min(int(last), length - 1) if last else length - 1
+    if start >= length or start > end:
+        return 'unsatisfiable'
+    return start, end
+
+
+class ProductionHTTPRequestHandler(CustomHTTPRequestHandler):
+    """本番環境に近い設定のHTTPリクエストハンドラー（圧縮・条件付きリクエスト・キャッシュ設定）"""
+
+    protocol_version = 'HTTP/1.1'
+    compressed_cache = CompressedCache()
+    file_cache = None       # FileCache（--file-cache 指定時）
+    _send_count = None      # sendfileで送るバイト数（Noneなら末尾まで）
+
+    def cache_control(self):
+        """ファイルは種類ごとの設定、API・集計・エラーは no-store、それ以外（リダイレクト等）は no-cache"""
+        return self._cache_control or 'no-cache'
+
+    def available_encodings(self):
+        """対応している圧縮形式（優先順）"""
+        return ('br', 'gzip') if brotli else ('gzip',)
+
+    def send_head(self):
+        """ファイルの送信準備（ヘッダー送信後、本文のファイルオブジェクトを返す）"""
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            # 末尾のスラッシュへのリダイレクトやディレクトリ一覧は標準の処理に任せる
+            if not urllib.parse.urlsplit(self.path).path.endswith('/'):
+                return super().send_head()
+            for index in ('index.html', 'index.htm'):
+                index_path = os.path.join(path, index)
+                if os.path.isfile(index_path):
+                    path = index_path
+                    break
+            else:
+                return super().send_head()
+        if not os.path.isfile(path):
+            return super().send_head()
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.send_error(404, 'File not found')
+            return None
+
+        content_type = self.guess_type(path)
+        rel_path = os.path.relpath(path, self.directory).replace(os.sep, '/')
+        self._cache_control = cache_policy(rel_path, content_type)
+
+        encoding, body_path, body = self.negotiate_encoding(path, content_type, stat)
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{"-" + encoding if encoding else ""}"'
+
+        if self.is_not_modified(etag, stat):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return None
+
+        if body is None and self.file_cache is not None:
+            body = self.file_cache.get(body_path)
+
+        f = None
+        if body is None:
+            try:
+                f = open(body_path, 'rb')
+            except OSError:
+                self.send_error(404, 'File not found')
+                return None
+            total = os.fstat(f.fileno()).st_size
+        else:
+            total = len(body)
+
+        # Rangeリクエスト（If-Rangeが現在の版と一致しない場合は全体を返す）
+        byte_range = None
+        if 'Range' in self.headers and self.is_range_current(etag, stat):
+            byte_range = parse_range(self.headers['Range'], total)
+        if byte_range == 'unsatisfiable':
+            if f:
+                f.close()
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{total}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return None
+
+        start, end = byte_range or (0, total - 1)
+        length = end - start + 1 if total else 0
+        if f is None:
+            f = io.BytesIO(body[start:end + 1] if byte_range else body)
+        else:
+            f.seek(start)
+            self._send_count = length
+
+        self.send_response(206 if byte_range else 200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(length))
+        self.send_header('Accept-Ranges', 'bytes')
+        if byte_range:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{total}')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', self.date_time_string(int(stat.st_mtime)))
+        self.end_headers()
+        return f
+
+    def encode_body(self, body, content_type):
+        """クライアントが受け付ける形式で圧縮"""
+        if len(body) < MIN_COMPRESS_SIZE or not content_type.startswith(COMPRESSIBLE_TYPES):
+            return None, body
+        accepted = parse_accept_encoding(self.headers.get('Accept-Encoding'))
+        wildcard = accepted.get('*', 0.0)
+        for encoding in self.available_encodings():
+            if accepted.get(encoding, wildcard) > 0:
+                if encoding == 'br':
+                    return encoding, brotli.compress(body, quality=5)
+                return encoding, gzip.compress(body, compresslevel=6, mtime=0)
+        return None, body
+
+    def copyfile(self, source, outputfile):
+        """本文を送信（ファイルは sendfile で、メモリ上のデータはそのまま書き込む）"""
+        if isinstance(source, io.BytesIO):
+            outputfile.write(source.getbuffer())
+            return
+        if self._send_count == 0:
+            return
+        # socket.sendfile は os.sendfile が使える環境ではカーネル内でコピーし、使えない場合は通常の送信になる
+        self.connection.sendfile(source, offset=source.tell(), count=self._send_count)
+
+    def is_range_current(self, etag, stat):
+        """If-Range が指定されている場合、現在の版と一致するか"""
+        if_range = self.headers.get('If-Range')
+        if not if_range:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith(('"', 'W/')):
+            return if_range == etag
+        try:
+            since = email.utils.parsedate_to_datetime(if_range)
+        except (TypeError, ValueError):
+            return False
+        return since is not None and int(stat.st_mtime) == int(since.timestamp())
+
+    def negotiate_encoding(self, path, content_type, stat):
+        """クライアントが受け付ける圧縮形式を選ぶ
+
+        Returns:
+            tuple: (エンコーディング or None, 配信するファイルのパス, メモリ上の本文 or None)
+        """
+        accepted = parse_accept_encoding(self.headers.get('Accept-Encoding'))
+        wildcard = accepted.get('*', 0.0)
+        candidates = [enc for enc in ('br', 'gzip') if accepted.get(enc, wildcard) > 0]
+
+        # 事前に圧縮されたファイル（元のファイルより新しいもののみ）
+        suffixes = {'br': '.br', 'gzip': '.gz'}
+        for encoding in candidates:
+            sibling = path + suffixes[encoding]
+            try:
+                if os.stat(sibling).st_mtime_ns >= stat.st_mtime_ns:
+                    return encoding, sibling, None
+            except OSError:
+                continue
+
+        # その場で圧縮（圧縮の効果があるテキスト系のファイルのみ）
+        if stat.st_size >= MIN_COMPRESS_SIZE and content_type.startswith(COMPRESSIBLE_TYPES):
+            for encoding in candidates:
+                if encoding in self.available_encodings():
+                    return encoding, path, self.compressed_cache.get(path, encoding, stat)
+
+        return None, path, None
+
+    def is_not_modified(self, etag, stat):
+        """If-None-Match / If-Modified-Since を確認"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or etag in tags or f'W/{etag}' in tags
+
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since is not None:
+                return int(stat.st_mtime) <= since.timestamp()
+        return False
+
+
 def open_browser(url, delay=1.5):
     """指定されたURLをブラウザで開く（遅延付き）"""
     def _open():
@@ -74,6 +645,10 @@ def main():
   python scripts/server.py --port 3000        # ポート3000で起動
   python scripts/server.py --no-browser       # ブラウザを開かずに起動
   python scripts/server.py -p 8080 --no-browser
+  python scripts/server.py --production       # 本番環境に近い設定（並行処理・圧縮・キャッシュ）で起動
+  python scripts/server.py --file-cache       # 上記に加えて小さいファイルをメモリに保持（負荷試験向け）
+  python scripts/server.py --live-reload      # data/ js/ css/ の変更をページに通知して自動で反映
+  python scripts/server.py --production --log-format json   # アクセスログをJSONで出力（負荷試験の集計用）
         """
     )
     
@@ -90,7 +665,38 @@ def main():
         help='ブラウザを自動で開かない'
     )
     
+    parser.add_argument(
+        '--production',
+        action='store_true',
+        help='並行処理・圧縮・キャッシュを有効にした本番環境に近い設定で起動'
+    )
+    
+    parser.add_argument(
+        '--file-cache',
+        action='store_true',
+        help='小さいファイルの内容をメモリに保持する（--production を含む）'
+    )
+    
+    parser.add_argument(
+        '--live-reload',
+        action='store_true',
+        help='data/ js/ css/ の変更を監視し、開いているページに自動で反映する'
+    )
+    
+    parser.add_argument(
+        '--log-format',
+        choices=('text', 'json'),
+        default='text',
+        help='アクセスログの形式 (デフォルト: text)'
+    )
+    
     args = parser.parse_args()
+    # APIのエラー（パラメータの誤り・データの読み込み失敗）はパスごとに集計する
+    CustomHTTPRequestHandler.metrics = RequestMetrics(error_paths=(API_PROFILES_PATH, API_EVENTS_PATH, METRICS_PATH))
+    CustomHTTPRequestHandler.access_log_format = args.log_format
+    if args.file_cache:
+        args.production = True
+        ProductionHTTPRequestHandler.file_cache = FileCache()
     
     # ポート番号の妥当性チェック
     if args.port < 1 or args.port > 65535:
@@ -100,6 +706,14 @@ def main():
     # プロジェクトルートに移動
     project_root = find_project_root()
     os.chdir(project_root)
+    CustomHTTPRequestHandler.query_service = ProfileQueryService(
+        os.path.join(project_root, 'data', 'profiles.json')
+    )
+    watcher = None
+    if args.live_reload:
+        broadcaster = ChangeBroadcaster()
+        CustomHTTPRequestHandler.change_broadcaster = broadcaster
+        watcher = FileWatcher(project_root, LIVE_RELOAD_DIRECTORIES, broadcaster.publish)
     
     # ドキュメントルートを表示
     print(f"\n{'='*60}")
@@ -107,6 +721,15 @@ def main():
     print(f"{'='*60}")
     print(f"ドキュメントルート: {project_root}")
     print(f"ポート番号: {args.port}")
+    if args.production:
+        encodings = 'brotli, gzip' if brotli else 'gzip'
+        print(f"モード: 本番環境相当（並行処理・圧縮: {encodings}・キャッシュ有効）")
+        if args.file_cache:
+            print(f"ファイルキャッシュ: 有効（{HOT_FILE_MAX_SIZE // (1024 * 1024)}MB以下のファイル、合計{HOT_CACHE_LIMIT // (1024 * 1024)}MBまで）")
+    else:
+        print(f"モード: 開発用（キャッシュ無効）")
+    if watcher:
+        print(f"ライブリロード: 有効（{', '.join(LIVE_RELOAD_DIRECTORIES)} を {watcher.method} で監視）")
     print(f"{'='*60}\n")
     
     # サーバーのURLを構築
@@ -114,13 +737,24 @@ def main():
     
     # サーバーを起動
     try:
-        with socketserver.TCPServer(("", args.port), CustomHTTPRequestHandler) as httpd:
+        if args.production:
+            httpd = http.server.ThreadingHTTPServer(("", args.port), ProductionHTTPRequestHandler)
+        elif args.live_reload:
+            # /api/events の接続を保ったまま他のリクエストも処理するため並行処理にする
+            httpd = http.server.ThreadingHTTPServer(("", args.port), CustomHTTPRequestHandler)
+        else:
+            httpd = socketserver.TCPServer(("", args.port), CustomHTTPRequestHandler)
+        with httpd:
+            if watcher:
+                watcher.start()
             print(f"サーバーを起動しました: {server_url}")
             print(f"\nアクセスURL:")
             print(f"  - {server_url}/")
             print(f"  - {server_url}/index.html")
             print(f"  - {server_url}/terms.html")
             print(f"  - {server_url}/lite.html")
+            print(f"  - {server_url}{API_PROFILES_PATH}?q=&sort=id-desc&offset=0&limit=50")
+            print(f"  - {server_url}{METRICS_PATH}")
             print(f"\n終了するには Ctrl+C を押してください\n")
             
             # ブラウザを開く
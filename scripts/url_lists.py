@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+URL調査パネルのブロックリスト（Block_URLs.txt）・アバターリスト（Avatar_URLs.txt）の管理。
+
+リストはメモリ上に Booth の商品IDをキーとして保持し（商品IDのないURLはURLそのもの）、
+同じ商品のURLは1件にまとめる。1つのURLは2つのリストのどちらか一方にだけ含まれる。
+
+追加・移動のたびにテキストファイルを書き直さず、変更を変更ログに1行追記する。
+変更ログが一定の件数になったとき・compact() を呼んだときに、テキストファイルへ
+まとめて書き出して変更ログを空にする（コンパクション）。書き出す前にテキストファイルを
+読み直して変更ログを適用するため、途中で終了した場合や外部でファイルを編集した場合も
+変更は失われない。
+"""
+
+import json
+import os
+
+from diff_checker import extract_item_id_from_url
+
+# リスト名 → ファイル名
+LIST_FILES = {
+    "block": "Block_URLs.txt",
+    "avatar": "Avatar_URLs.txt",
+}
+
+# この件数の変更がたまったらテキストファイルに書き出す
+DEFAULT_COMPACT_THRESHOLD = 50
+
+
+def url_key(url):
+    """重複を判定するキー（Booth の商品ID、なければURL）"""
+    item_id = extract_item_id_from_url(url)
+    return f"booth:{item_id}" if item_id else url
+
+
+class URLListStore:
+    """ブロックリスト・アバターリストの管理
+
+    Args:
+        data_dir: テキストファイルのあるディレクトリ
+        log_path: 変更ログのパス（GitHub に送らないよう data ディレクトリの外に置く）
+        compact_threshold: この件数の変更がたまったら自動で書き出す
+    """
+
+    def __init__(self, data_dir, log_path, compact_threshold=DEFAULT_COMPACT_THRESHOLD):
+        self.data_dir = data_dir
+        self.log_path = log_path
+        self.compact_threshold = compact_threshold
+        self._lists = {}     # リスト名 → {キー: URL}（ファイル内の順）
+        self._comments = {}  # リスト名 → コメント行（"#" で始まる行はそのまま残す）
+        self._pending = 0    # 書き出していない変更の数
+        self._load()
+        # 前回書き出す前に終了していた場合は、ここで書き出しておく
+        if self._pending:
+            self.compact()
+
+    @property
+    def pending(self):
+        """テキストファイルに書き出していない変更の数"""
+        return self._pending
+
+    def path(self, name):
+        """リストのテキストファイルのパス"""
+        return os.path.join(self.data_dir, LIST_FILES[name])
+
+    def _load(self):
+        """テキストファイルを読み込み、変更ログを適用"""
+        for name in LIST_FILES:
+            entries, comments = {}, []
+            try:
+                with open(self.path(name), "r", encoding="utf-8") as f:
+                    for line in f:
+                        url = line.strip()
+                        if not url:
+                            continue
+                        if url.startswith("#"):
+                            comments.append(url)
+                            continue
+                        entries.setdefault(url_key(url), url)
+            except FileNotFoundError:
+                pass
+            self._lists[name] = entries
+            self._comments[name] = comments
+
+        self._pending = 0
+        try:
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # 書き込み途中で終了した行は無視
+                        continue
+                    if entry.get("list") in LIST_FILES and entry.get("url"):
+                        self._add(entry["list"], entry["url"])
+                        self._pending += 1
+        except FileNotFoundError:
+            pass
+
+    def _add(self, name, url):
+        key = url_key(url)
+        for other, entries in self._lists.items():
+            if other != name:
+                entries.pop(key, None)
+        if key in self._lists[name]:
+            return False
+        self._lists[name][key] = url
+        return True
+
+    def contains(self, name, url):
+        """URL（同じ商品のURLを含む）がリストに含まれているか"""
+        return url_key(url.strip()) in self._lists[name]
+
+    def urls(self, name):
+        """リストのURL（ファイル内の順、追加したものは末尾）"""
+        return list(self._lists[name].values())
+
+    def add(self, name, url):
+        """URLをリストに追加し、他のリストからは削除する
+
+        Returns:
+            bool: 追加した場合True（同じ商品のURLが既にリストにあった場合False）
+        """
+        url = url.strip()
+        if not url:
+            return False
+        in_other_list = any(url_key(url) in entries for other, entries in self._lists.items() if other != name)
+        if not self._add(name, url) and not in_other_list:
+            return False
+
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"list": name, "url": url}, ensure_ascii=False) + "\n")
+        self._pending += 1
+        if self._pending >= self.compact_threshold:
+            self.compact()
+        return True
+
+    def compact(self):
+        """変更をテキストファイルに書き出し、変更ログを空にする"""
+        # 外部で編集された場合に備えて読み直してから書き出す
+        self._load()
+        for name in LIST_FILES:
+            lines = self._comments[name] + list(self._lists[name].values())
+            content = "".join(line + "\n" for line in lines)
+            path = self.path(name)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    if f.read() == content:
+                        continue
+            except FileNotFoundError:
+                if not lines:
+                    continue
+            temp_path = path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(temp_path, path)
+
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+        self._pending = 0
+
+    def reload(self):
+        """書き出していない変更を破棄して、テキストファイルを読み直す（GitHubから取得した後など）"""
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+        self._load()
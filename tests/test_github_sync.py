@@ -0,0 +1,237 @@
+"""github_sync のプッシュ・プルのテスト（GitHub には接続せず、メモリ上のリポジトリとAPIの代わりを使う）"""
+
+import json
+import os
+import stat
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from github_sync import GitHubDataClient, git_blob_sha, pull_files, push_files, remote_blobs  # noqa: E402
+
+
+class FakeClient:
+    """push_files が使う GitHubDataClient のメソッドだけを持つメモリ上のリポジトリ"""
+
+    def __init__(self, files):
+        self.blobs = {git_blob_sha(content): content for content in files.values()}
+        self.tree = {path: git_blob_sha(content) for path, content in files.items()}
+        self.head = "commit-0"
+        self.commits = []
+
+    def default_branch(self):
+        return "main"
+
+    def head_commit(self, branch):
+        return self.head, self.head
+
+    def tree_blobs(self, tree_sha, directory):
+        return {path: sha for path, sha in self.tree.items() if path.startswith(directory + "/")}
+
+    def create_blob(self, content):
+        sha = git_blob_sha(content)
+        self.blobs[sha] = content
+        return sha
+
+    def create_tree(self, base_tree, entries):
+        tree = dict(self.tree)
+        for entry in entries:
+            if entry["sha"] is None:
+                tree.pop(entry["path"], None)
+            else:
+                tree[entry["path"]] = entry["sha"]
+        self.pending_tree = tree
+        return f"tree-{len(self.commits) + 1}"
+
+    def create_commit(self, message, tree_sha, parent_sha):
+        self.commits.append(message)
+        return f"commit-{len(self.commits)}"
+
+    def update_ref(self, branch, commit_sha):
+        self.tree = self.pending_tree
+        self.head = commit_sha
+
+
+def _manifest(*files):
+    deltas = [{"from": str(index), "to": str(index + 1), "file": rel_path} for index, rel_path in enumerate(files)]
+    return json.dumps({"version": str(len(files)), "deltas": deltas}).encode("utf-8")
+
+
+def test_push_keeps_delta_files_referenced_by_manifest():
+    # 全件取得した直後: ローカルに差分ファイルはないが、ポインタは参照している
+    remote = {
+        "data/profiles.json": b"{}",
+        "data/profiles_version.json": _manifest("deltas/1.json", "deltas/2.json"),
+        "data/deltas/0.json": b"{}",
+        "data/deltas/1.json": b"{}",
+        "data/deltas/2.json": b"{}",
+    }
+    client = FakeClient(remote)
+    local = {
+        "data/profiles.json": b'{"profiles": []}',
+        "data/profiles_version.json": remote["data/profiles_version.json"],
+    }
+
+    result = push_files(client, local, "Update data")
+
+    assert result.uploaded == ["data/profiles.json"]
+    assert result.deleted == ["data/deltas/0.json"]
+    assert "data/deltas/1.json" in client.tree
+    assert "data/deltas/2.json" in client.tree
+
+
+def test_push_prunes_unreferenced_delta_files():
+    client = FakeClient({
+        "data/profiles_version.json": _manifest("deltas/1.json"),
+        "data/deltas/1.json": b"{}",
+    })
+    local = {"data/profiles_version.json": _manifest()}
+
+    result = push_files(client, local, "Update data")
+
+    assert result.deleted == ["data/deltas/1.json"]
+    assert client.tree == {"data/profiles_version.json": git_blob_sha(_manifest())}
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, content=b"", headers=None):
+        self.status_code = status_code
+        self.payload = payload
+        self.content = content
+        self.headers = headers or {}
+        self.text = "" if payload is None else json.dumps(payload)
+
+    def json(self):
+        return self.payload
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """GitHub の Git Data API の代わりに応答する requests.Session 互換のオブジェクト（ブランチは main のみ）"""
+
+    def __init__(self, files):
+        self.blobs = {git_blob_sha(content): content for content in files.values()}
+        self.entries = [{"path": path.split("/", 1)[1], "type": "blob", "sha": git_blob_sha(content)}
+                        for path, content in files.items()]
+        self.requests = []  # (パス, ステータス)
+
+    def request(self, method, url, headers=None, params=None, stream=False, **kwargs):
+        path = url.split("/repos/owner/repo/", 1)[1]
+        response = self._respond(path, params or {})
+        etag = response.headers.get("ETag")
+        if etag and (headers or {}).get("If-None-Match") == etag:
+            response = FakeResponse(304)
+        self.requests.append((path, response.status_code))
+        return response
+
+    def _respond(self, path, params):
+        if path == "git/ref/heads/main":
+            return FakeResponse(200, {"object": {"sha": "commit-1"}}, headers={"ETag": '"ref-1"'})
+        if path == "git/commits/commit-1":
+            return FakeResponse(200, {"tree": {"sha": "root"}}, headers={"ETag": '"commit-1"'})
+        if path == "git/trees/root":
+            return FakeResponse(200, {"tree": [{"path": "data", "type": "tree", "sha": "data-tree"}]},
+                                headers={"ETag": '"root"'})
+        if path == "git/trees/data-tree" and params.get("recursive") == "1":
+            return FakeResponse(200, {"tree": self.entries, "truncated": False}, headers={"ETag": '"data-tree"'})
+        if path.startswith("git/blobs/") and path[len("git/blobs/"):] in self.blobs:
+            return FakeResponse(200, content=self.blobs[path[len("git/blobs/"):]])
+        return FakeResponse(404, {"message": "Not Found"})
+
+    def blob_requests(self):
+        return [path for path, _ in self.requests if path.startswith("git/blobs/")]
+
+
+def _pull_client(files, etags=None):
+    session = FakeSession(files)
+    client = GitHubDataClient("owner/repo", "token", api_url="https://api.example.test", session=session, etags=etags)
+    return client, session
+
+
+def _write(base_dir, path, content):
+    local_path = os.path.join(base_dir, *path.split("/"))
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+    with open(local_path, "wb") as f:
+        f.write(content)
+    return local_path
+
+
+def test_pull_skips_unchanged_files(tmp_path):
+    client, session = _pull_client({"data/profiles.json": b'{"profiles": []}\n'})
+    _write(tmp_path, "data/profiles.json", b'{"profiles": []}\n')
+
+    blobs = remote_blobs(client, branch="main")
+    result = pull_files(client, str(tmp_path), ["data/profiles.json"], blobs)
+
+    assert result.unchanged == ["data/profiles.json"]
+    assert result.updated == []
+    assert session.blob_requests() == []
+
+
+def test_pull_replaces_changed_file_with_normal_permissions(tmp_path):
+    content = b"x" * 200_000  # DOWNLOAD_CHUNK_SIZE を超える大きさ
+    client, session = _pull_client({"data/profiles.json": content, "data/Block_URLs.txt": b"https://booth.pm/ja/items/1\n"})
+    existing = _write(tmp_path, "data/profiles.json", b"old")
+    os.chmod(existing, 0o640)
+    umask = os.umask(0o022)
+    try:
+        result = pull_files(client, str(tmp_path), ["data/profiles.json", "data/Block_URLs.txt"],
+                            remote_blobs(client, branch="main"))
+    finally:
+        os.umask(umask)
+
+    assert result.updated == ["data/profiles.json", "data/Block_URLs.txt"]
+    assert (tmp_path / "data" / "profiles.json").read_bytes() == content
+    # 既存のファイルは元の権限、新しいファイルは umask に従った通常の権限（一時ファイルの 0600 ではない）
+    assert stat.S_IMODE(os.stat(existing).st_mode) == 0o640
+    assert stat.S_IMODE(os.stat(tmp_path / "data" / "Block_URLs.txt").st_mode) == 0o644
+    assert sorted(os.listdir(tmp_path / "data")) == ["Block_URLs.txt", "profiles.json"]
+
+
+def test_pull_reports_files_missing_on_remote(tmp_path):
+    client, _ = _pull_client({"data/profiles.json": b"{}"})
+
+    result = pull_files(client, str(tmp_path), ["data/profiles.json", "data/Avatar_URLs.txt"],
+                        remote_blobs(client, branch="main"))
+
+    assert result.updated == ["data/profiles.json"]
+    assert result.missing == ["data/Avatar_URLs.txt"]
+    assert not (tmp_path / "data" / "Avatar_URLs.txt").exists()
+
+
+def test_remote_blobs_reuses_cached_response_on_304():
+    etags = {}
+    files = {"data/profiles.json": b"{}", "data/deltas/1.json": b"{}"}
+    client, session = _pull_client(files, etags=etags)
+
+    first = remote_blobs(client, branch="main")
+    assert all(status == 200 for _, status in session.requests)
+
+    session.requests.clear()
+    second = remote_blobs(client, branch="main")
+
+    assert second == first == {path: git_blob_sha(content) for path, content in files.items()}
+    assert [status for _, status in session.requests] == [304, 304, 304, 304]
+
+
+def test_pull_falls_back_to_download_when_fetch_hook_declines(tmp_path):
+    client, session = _pull_client({"data/profiles.json": b'{"profiles": [1]}', "data/Block_URLs.txt": b"a\n"})
+    blobs = remote_blobs(client, branch="main")
+    hooked = []
+
+    def fetch(path):
+        hooked.append(path)
+        return path == "data/Block_URLs.txt"  # profiles.json は独自の取得に失敗した扱い
+
+    result = pull_files(client, str(tmp_path), ["data/profiles.json", "data/Block_URLs.txt"], blobs, fetch=fetch)
+
+    assert hooked == ["data/profiles.json", "data/Block_URLs.txt"]
+    assert result.updated == ["data/profiles.json", "data/Block_URLs.txt"]
+    assert (tmp_path / "data" / "profiles.json").read_bytes() == b'{"profiles": [1]}'
+    assert session.blob_requests() == [f"git/blobs/{blobs['data/profiles.json']}"]